@@ -0,0 +1,113 @@
+//! Throughput of generated register accessors through `PtrIO`, `WidePtrIO`,
+//! and `MockIO`.
+//!
+//! Run with `cargo bench`. Each benchmark reports the mean time per accessor
+//! call over a fixed number of iterations.
+
+use std::hint::black_box;
+use std::time::Instant;
+
+use codegen_bench::turbo_encab::TurboEncab;
+use codegen_bench::wide_regs::Top as WideRegs;
+use peakrdl_rust::io::{MockIO, WidePtrIO};
+
+const ITERATIONS: u32 = 10_000_000;
+
+const TURBO_SIZE: usize = TurboEncab::<()>::SIZE;
+const WIDE_SIZE: usize = WideRegs::<()>::SIZE;
+
+/// Register memory for `PtrIO` benchmarks, aligned for the widest register.
+#[repr(align(16))]
+struct Memory<const N: usize>([u8; N]);
+
+fn bench(name: &str, mut f: impl FnMut(u32)) {
+    // warm up
+    for i in 0..ITERATIONS / 10 {
+        f(black_box(i));
+    }
+    let start = Instant::now();
+    for i in 0..ITERATIONS {
+        f(black_box(i));
+    }
+    let ns = start.elapsed().as_secs_f64() * 1e9 / f64::from(ITERATIONS);
+    println!("{name:<40} {ns:>8.2} ns/iter");
+}
+
+/// Modify the `control` register of each grammeter handle, passed by value
+/// through a non-inlined call like in a driver call chain.
+#[inline(never)]
+fn sync_all<G: Copy>(grammeters: [G; 12], f: impl Fn(G)) {
+    for g in black_box(grammeters) {
+        f(g);
+    }
+}
+
+fn main() {
+    let mut turbo_mem = Box::new(Memory([0_u8; TURBO_SIZE]));
+    let mut wide_mem = Box::new(Memory([0_u8; WIDE_SIZE]));
+    let turbo = unsafe { TurboEncab::from_ptr(turbo_mem.0.as_mut_ptr().cast()) };
+    let wide = unsafe { WideRegs::from_ptr(wide_mem.0.as_mut_ptr().cast()) };
+
+    bench("PtrIO turbo ctrl read", |_| {
+        black_box(turbo.ctrl().read());
+    });
+    bench("PtrIO turbo ctrl write", |i| {
+        turbo.ctrl().write(|r| r.set_reset(i & 1 != 0));
+    });
+    bench("PtrIO turbo ctrl modify", |_| {
+        turbo.ctrl().modify(|r| r.set_reset(!r.reset()));
+    });
+    bench("PtrIO turbo grammeter[i] modify", |i| {
+        turbo.grammeter()[i as usize % 12]
+            .control()
+            .modify(|r| r.set_sync_en(true));
+    });
+    bench("PtrIO turbo grammeter[..] sweep", |_| {
+        sync_all(turbo.grammeter(), |g| {
+            g.control().modify(|r| r.set_sync_en(true))
+        });
+    });
+    bench("PtrIO wide r1 (aw128) read", |_| {
+        black_box(wide.r1().read());
+    });
+    bench("PtrIO wide r4 (aw32) read", |_| {
+        black_box(wide.r4().read());
+    });
+    bench("PtrIO wide r4 (aw32) modify", |i| {
+        wide.r4().modify(|r| r.set_f2(i));
+    });
+
+    let wide = unsafe { WideRegs::from_ptr_with(wide_mem.0.as_mut_ptr().cast(), WidePtrIO) };
+    bench("WidePtrIO wide r4 (aw32) read", |_| {
+        black_box(wide.r4().read());
+    });
+    bench("WidePtrIO wide r4 (aw32) modify", |i| {
+        wide.r4().modify(|r| r.set_f2(i));
+    });
+
+    let turbo_mock: MockIO<TURBO_SIZE> = MockIO::new_zeroed();
+    let wide_mock: MockIO<WIDE_SIZE> = MockIO::new_zeroed();
+    let turbo = unsafe { TurboEncab::from_ptr_with(turbo_mock.base_ptr(), &turbo_mock) };
+    let wide = unsafe { WideRegs::from_ptr_with(wide_mock.base_ptr(), &wide_mock) };
+
+    bench("MockIO turbo ctrl read", |_| {
+        black_box(turbo.ctrl().read());
+    });
+    bench("MockIO turbo ctrl write", |i| {
+        turbo.ctrl().write(|r| r.set_reset(i & 1 != 0));
+    });
+    bench("MockIO turbo ctrl modify", |_| {
+        turbo.ctrl().modify(|r| r.set_reset(!r.reset()));
+    });
+    bench("MockIO turbo grammeter[..] sweep", |_| {
+        sync_all(turbo.grammeter(), |g| {
+            g.control().modify(|r| r.set_sync_en(true))
+        });
+    });
+    bench("MockIO wide r4 (aw32) read", |_| {
+        black_box(wide.r4().read());
+    });
+    bench("MockIO wide r4 (aw32) modify", |i| {
+        wide.r4().modify(|r| r.set_f2(i));
+    });
+}
@@ -0,0 +1,66 @@
+//! Throughput of the generated enum decoders, compared with `match`-based ones.
+//!
+//! Run with `cargo bench --bench enum_decode`. Each benchmark reports the mean
+//! time per decoded value over a buffer of pseudo-random bit patterns.
+
+use std::hint::black_box;
+use std::time::Instant;
+
+use codegen_bench::decode;
+
+const VALUES: usize = 4096;
+const ITERATIONS: u32 = 5_000;
+
+fn bench(name: &str, values: &[u8], f: fn(&[u8]) -> u32) -> u32 {
+    // warm up
+    let sum = f(black_box(values));
+    let start = Instant::now();
+    for _ in 0..ITERATIONS {
+        black_box(f(black_box(values)));
+    }
+    let ns = start.elapsed().as_secs_f64() * 1e9 / f64::from(ITERATIONS) / VALUES as f64;
+    println!("{name:<40} {ns:>8.3} ns/value");
+    sum
+}
+
+/// Pseudo-random values masked to the width of a field
+fn values(mask: u8) -> Vec<u8> {
+    let mut state = 0x2545_f491_u32;
+    (0..VALUES)
+        .map(|_| {
+            state ^= state << 13;
+            state ^= state >> 17;
+            state ^= state << 5;
+            state.to_le_bytes()[0] & mask
+        })
+        .collect()
+}
+
+fn main() {
+    let cases: [(&str, u8, fn(&[u8]) -> u32, fn(&[u8]) -> u32); 3] = [
+        (
+            "opcode (range, full)",
+            0xFF,
+            decode::opcode_generated,
+            decode::opcode_matched,
+        ),
+        (
+            "state (range)",
+            0x3F,
+            decode::state_generated,
+            decode::state_matched,
+        ),
+        (
+            "err_code (table)",
+            0x3F,
+            decode::err_code_generated,
+            decode::err_code_matched,
+        ),
+    ];
+    for (name, mask, generated, matched) in cases {
+        let values = values(mask);
+        let expected = bench(&format!("{name} generated"), &values, generated);
+        let sum = bench(&format!("{name} match"), &values, matched);
+        assert_eq!(sum, expected, "decoders disagree");
+    }
+}
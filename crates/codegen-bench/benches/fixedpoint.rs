@@ -0,0 +1,87 @@
+//! Throughput of fixed-point slice conversions, compared with the scalar path.
+//!
+//! Run with `cargo bench --bench fixedpoint`. Each benchmark reports the mean
+//! time per converted sample over a buffer of telemetry-like samples.
+
+use std::hint::black_box;
+use std::time::Instant;
+
+use peakrdl_rust::fixedpoint::FixedPoint;
+
+/// Signed 16-bit sample with 12 fractional bits
+type Sample = FixedPoint<i16, 4, 12>;
+
+const SAMPLES: usize = 4096;
+const ITERATIONS: u32 = 5_000;
+
+fn bench(name: &str, mut f: impl FnMut()) {
+    // warm up
+    f();
+    let start = Instant::now();
+    for _ in 0..ITERATIONS {
+        f();
+    }
+    let ns = start.elapsed().as_secs_f64() * 1e9 / f64::from(ITERATIONS) / SAMPLES as f64;
+    println!("{name:<40} {ns:>8.3} ns/sample");
+}
+
+fn main() {
+    // a sine wave spanning slightly more than the representable range
+    let floats: Vec<f64> = (0..SAMPLES)
+        .map(|i| 8.5 * (i as f64 * 0.01).sin())
+        .collect();
+    let floats_f32: Vec<f32> = floats.iter().map(|&v| v as f32).collect();
+    let bits: Vec<i16> = floats
+        .iter()
+        .map(|&v| Sample::from_f64(v).to_bits())
+        .collect();
+
+    let mut out_f64 = vec![0.0_f64; SAMPLES];
+    let mut out_f32 = vec![0.0_f32; SAMPLES];
+    let mut out_bits = vec![0_i16; SAMPLES];
+
+    bench("to_f64 scalar", || {
+        for (out, &b) in out_f64.iter_mut().zip(black_box(&bits)) {
+            *out = Sample::from_bits(b).to_f64();
+        }
+        black_box(&out_f64);
+    });
+    bench("to_f64 slice", || {
+        Sample::slice_to_f64(black_box(&bits), &mut out_f64);
+        black_box(&out_f64);
+    });
+    bench("to_f32 scalar", || {
+        for (out, &b) in out_f32.iter_mut().zip(black_box(&bits)) {
+            *out = Sample::from_bits(b).to_f32();
+        }
+        black_box(&out_f32);
+    });
+    bench("to_f32 slice", || {
+        Sample::slice_to_f32(black_box(&bits), &mut out_f32);
+        black_box(&out_f32);
+    });
+    bench("from_f64 scalar", || {
+        for (out, &v) in out_bits.iter_mut().zip(black_box(&floats)) {
+            *out = Sample::from_f64(v).to_bits();
+        }
+        black_box(&out_bits);
+    });
+    let expected = out_bits.clone();
+    bench("from_f64 slice", || {
+        Sample::slice_from_f64(black_box(&floats), &mut out_bits);
+        black_box(&out_bits);
+    });
+    assert_eq!(out_bits, expected, "slice and scalar conversions disagree");
+    bench("from_f32 scalar", || {
+        for (out, &v) in out_bits.iter_mut().zip(black_box(&floats_f32)) {
+            *out = Sample::from_f32(v).to_bits();
+        }
+        black_box(&out_bits);
+    });
+    let expected = out_bits.clone();
+    bench("from_f32 slice", || {
+        Sample::slice_from_f32(black_box(&floats_f32), &mut out_bits);
+        black_box(&out_bits);
+    });
+    assert_eq!(out_bits, expected, "slice and scalar conversions disagree");
+}
@@ -0,0 +1,94 @@
+//! Throughput of concurrent read-modify-writes of registers in a shared block.
+//!
+//! Run with `cargo bench --bench locking`. Each thread repeatedly modifies the
+//! `control` register of its own grammeter (`distinct`), or every thread
+//! modifies the same one (`shared`). The block is locked with a single global
+//! mutex, with `SpinStripes`, or with a table of `std` mutexes implementing
+//! `StripeLock`. Results are the mean wall-clock time per modify over all
+//! threads, so lower is better and perfect scaling halves it when the thread
+//! count doubles (up to the number of cores).
+
+use std::hint::black_box;
+use std::sync::Mutex;
+use std::thread;
+use std::time::Instant;
+
+use codegen_bench::turbo_encab::TurboEncab;
+use peakrdl_rust::lock::{SpinStripes, StripeLock};
+
+const ITERATIONS: u32 = 1_000_000;
+const THREAD_COUNTS: [usize; 4] = [1, 2, 4, 8];
+
+const TURBO_SIZE: usize = TurboEncab::<()>::SIZE;
+
+#[repr(align(16))]
+struct Memory<const N: usize>([u8; N]);
+
+/// Striped locks backed by `std` mutexes, which block instead of spinning
+/// when there are more threads than cores.
+struct MutexStripes<const N: usize>([Mutex<()>; N]);
+
+impl<const N: usize> StripeLock for MutexStripes<N> {
+    fn with_lock<T>(&self, addr: usize, f: impl FnOnce() -> T) -> T {
+        let _guard = self.0[SpinStripes::<N>::stripe(addr)].lock().unwrap();
+        f()
+    }
+}
+
+/// Run `f(thread, i)` `ITERATIONS` times on each of `threads` threads.
+fn bench(name: &str, threads: usize, f: impl Fn(usize, u32) + Sync) {
+    let start = Instant::now();
+    thread::scope(|s| {
+        for t in 0..threads {
+            let f = &f;
+            s.spawn(move || {
+                for i in 0..ITERATIONS {
+                    f(t, black_box(i));
+                }
+            });
+        }
+    });
+    #[allow(clippy::cast_precision_loss)]
+    let ops = (ITERATIONS as usize * threads) as f64;
+    let ns = start.elapsed().as_secs_f64() * 1e9 / ops;
+    println!("{name:<24} {threads:>2} threads {ns:>8.2} ns/modify");
+}
+
+fn main() {
+    let mut turbo_mem = Box::new(Memory([0_u8; TURBO_SIZE]));
+    let turbo = unsafe { TurboEncab::from_ptr(turbo_mem.0.as_mut_ptr().cast()) };
+
+    let global = Mutex::new(());
+    let spin: SpinStripes<64> = SpinStripes::new();
+    let mutexes = MutexStripes::<64>(std::array::from_fn(|_| Mutex::new(())));
+
+    for threads in THREAD_COUNTS {
+        bench("global mutex distinct", threads, |t, i| {
+            let _guard = global.lock().unwrap();
+            turbo.grammeter()[t % 12]
+                .control()
+                .modify(|r| r.set_sync_en(i & 1 != 0));
+        });
+        bench("SpinStripes distinct", threads, |t, i| {
+            turbo.grammeter()[t % 12]
+                .control()
+                .modify_locked(&spin, |r| r.set_sync_en(i & 1 != 0));
+        });
+        bench("MutexStripes distinct", threads, |t, i| {
+            turbo.grammeter()[t % 12]
+                .control()
+                .modify_locked(&mutexes, |r| r.set_sync_en(i & 1 != 0));
+        });
+        bench("global mutex shared", threads, |_, i| {
+            let _guard = global.lock().unwrap();
+            turbo.grammeter()[0]
+                .control()
+                .modify(|r| r.set_sync_en(i & 1 != 0));
+        });
+        bench("SpinStripes shared", threads, |_, i| {
+            turbo.grammeter()[0]
+                .control()
+                .modify_locked(&spin, |r| r.set_sync_en(i & 1 != 0));
+        });
+    }
+}
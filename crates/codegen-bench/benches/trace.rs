@@ -0,0 +1,67 @@
+//! Throughput of recording register accesses with `RecordIO`, and of replaying
+//! the trace with `ReplayIO`.
+//!
+//! Run with `cargo bench --bench trace`. The workload modifies the `control`
+//! register of each grammeter in turn and polls `ctrl` (3 accesses per
+//! iteration) through `MockIO` (the baseline), through `RecordIO<MockIO>`
+//! writing the trace to a `Vec`, and through `ReplayIO` serving the recorded
+//! trace. Results are the mean time per access, and the trace size per access.
+
+use std::cell::RefCell;
+use std::convert::Infallible;
+use std::hint::black_box;
+use std::time::Instant;
+
+use codegen_bench::turbo_encab::TurboEncab;
+use peakrdl_rust::io::{MockIO, RegisterIO};
+use peakrdl_rust::trace::{RecordIO, ReplayIO};
+
+const ITERATIONS: u32 = 1_000_000;
+const ACCESSES_PER_ITERATION: u32 = 3;
+
+const TURBO_SIZE: usize = TurboEncab::<()>::SIZE;
+
+fn workload<IO: RegisterIO<Error = Infallible> + Copy>(turbo: TurboEncab<IO>) {
+    for i in 0..ITERATIONS {
+        let i = black_box(i);
+        turbo.grammeter()[i as usize % 12]
+            .control()
+            .modify(|r| r.set_sync_en(i & 1 != 0));
+        black_box(turbo.ctrl().read());
+    }
+}
+
+/// Time a single run of `f`.
+fn bench(name: &str, f: impl FnOnce()) {
+    let start = Instant::now();
+    f();
+    let accesses = f64::from(ITERATIONS * ACCESSES_PER_ITERATION);
+    let ns = start.elapsed().as_secs_f64() * 1e9 / accesses;
+    println!("{name:<24} {ns:>8.2} ns/access");
+}
+
+fn main() {
+    let mock: MockIO<TURBO_SIZE> = MockIO::new_zeroed();
+    let base = mock.base_ptr();
+
+    // warm up
+    workload(unsafe { TurboEncab::from_ptr_with(base, &mock) });
+    bench("MockIO", || {
+        workload(unsafe { TurboEncab::from_ptr_with(base, &mock) });
+    });
+
+    let record = RecordIO::new(&mock, RefCell::new(Vec::new()));
+    bench("RecordIO<MockIO>", || {
+        workload(unsafe { TurboEncab::from_ptr_with(base, &record) });
+    });
+    let trace = record.finish().into_inner();
+    #[allow(clippy::cast_precision_loss)]
+    let bytes = trace.len() as f64 / f64::from(ITERATIONS * ACCESSES_PER_ITERATION);
+    println!("{:<24} {bytes:>8.2} bytes/access", "trace size");
+
+    let replay = ReplayIO::new(&trace).unwrap();
+    bench("ReplayIO", || {
+        workload(unsafe { TurboEncab::from_ptr_with(base, &replay) });
+    });
+    assert!(replay.is_finished());
+}
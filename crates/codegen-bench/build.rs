@@ -0,0 +1,60 @@
+use std::fmt::Write as _;
+use std::path::PathBuf;
+
+use peakrdl_rust_build::{Generator, Result};
+
+// Declarations of the fixed-point and signedness UDPs
+const UDPS: &str = "../../src/peakrdl_rust/udps/udps.rdl";
+
+fn main() -> Result<()> {
+    Generator::new()
+        .rdl_files([UDPS, "../../tests/rdl_src/turboencabulator.rdl"])
+        .top("turbo_encab")
+        .generate()?;
+    Generator::new()
+        .rdl_files([UDPS, "../../tests/rdl_src/wide_regs.rdl"])
+        .top("top")
+        .rename("wide_regs")
+        .generate()?;
+    Generator::new()
+        .rdl_file("../../tests/rdl_src/enum_decode.rdl")
+        .top("enum_decode")
+        .generate()?;
+    write_match_decoders()
+}
+
+/// Write `match`-based decoders of the enums in `enum_decode.rdl`, to compare
+/// with the generated `from_bits` functions.
+fn write_match_decoders() -> Result<()> {
+    // function name, enum type name, variant name prefix, encoded values
+    let enums: [(&str, &str, &str, Vec<u8>); 3] = [
+        ("opcode", "Opcode", "Op", (0..=255).collect()),
+        ("state", "State", "S", (16..48).collect()),
+        (
+            "err_code",
+            "ErrCode",
+            "E",
+            (1..=40).filter(|v| v % 4 != 0).collect(),
+        ),
+    ];
+    let mut code = String::new();
+    for (func, type_name, prefix, values) in enums {
+        writeln!(
+            code,
+            "pub const fn {func}(bits: u8) -> Result<{type_name}, UnknownVariant<u8>> {{"
+        )
+        .unwrap();
+        writeln!(code, "    match bits {{").unwrap();
+        let exhaustive = values.len() == 256;
+        for value in values {
+            writeln!(code, "        {value} => Ok({type_name}::{prefix}{value}),").unwrap();
+        }
+        if !exhaustive {
+            writeln!(code, "        bits => Err(UnknownVariant::new(bits)),").unwrap();
+        }
+        writeln!(code, "    }}\n}}").unwrap();
+    }
+    let out_dir = PathBuf::from(std::env::var("OUT_DIR").unwrap());
+    std::fs::write(out_dir.join("match_decoders.rs"), code)?;
+    Ok(())
+}
@@ -0,0 +1,254 @@
+//! Benchmarks and codegen checks for generated register accessors.
+//!
+//! The `probes` module contains non-generic, non-inlined functions wrapping
+//! key register accessors. `tests/test_codegen.py` compiles this crate to
+//! LLVM IR and checks the number of volatile loads and stores in each probe.
+//! `benches/accessors.rs` measures the throughput of the same accessors
+//! through `PtrIO`, `WidePtrIO`, and `MockIO`.
+//!
+//! The `decode` module compares the generated enum decoders with equivalent
+//! `match`-based ones, which `benches/enum_decode.rs` measures.
+//!
+//! The code is generated by the build script, which requires
+//! `PEAKRDL_RUST_BINARY` to point to a PeakRDL-rust executable. To use the
+//! exporter from this repository:
+//!
+//! ```sh
+//! PEAKRDL_RUST_BINARY=$PWD/../../scripts/uv_local_peakrdl_rust.sh cargo bench
+//! ```
+#![no_std]
+
+pub mod turbo_encab {
+    include!(concat!(env!("OUT_DIR"), "/turbo_encab/mod.rs"));
+}
+
+pub mod wide_regs {
+    include!(concat!(env!("OUT_DIR"), "/wide_regs/mod.rs"));
+}
+
+pub mod enum_decode {
+    include!(concat!(env!("OUT_DIR"), "/enum_decode/mod.rs"));
+}
+
+/// Decoding loops over the enums of `enum_decode.rdl`, using either the
+/// generated `from_bits` or a `match` on every variant.
+///
+/// The generated decoders of `Opcode` and `State` convert values directly
+/// after a range check, and the one of `ErrCode` uses a lookup table.
+pub mod decode {
+    use peakrdl_rust::encode::UnknownVariant;
+
+    use crate::enum_decode::components::enum_decode::named_types::{
+        err_code::ErrCode, opcode::Opcode, state::State,
+    };
+
+    /// `match`-based decoders written by the build script
+    #[allow(clippy::missing_errors_doc, clippy::too_many_lines)]
+    pub mod matched {
+        use super::{ErrCode, Opcode, State, UnknownVariant};
+
+        include!(concat!(env!("OUT_DIR"), "/match_decoders.rs"));
+    }
+
+    macro_rules! decode_sums {
+        ($($generated:ident, $matched:ident => $enum:ident, $func:ident;)*) => {
+            $(
+                /// Sum of the bit values of the successfully decoded `values`,
+                /// using the generated decoder.
+                #[must_use]
+                #[inline(never)]
+                pub fn $generated(values: &[u8]) -> u32 {
+                    values
+                        .iter()
+                        .filter_map(|&v| $enum::from_bits(v).ok())
+                        .map(|v| u32::from(v.bits()))
+                        .sum()
+                }
+
+                /// Sum of the bit values of the successfully decoded `values`,
+                /// using a `match`.
+                #[must_use]
+                #[inline(never)]
+                pub fn $matched(values: &[u8]) -> u32 {
+                    values
+                        .iter()
+                        .filter_map(|&v| matched::$func(v).ok())
+                        .map(|v| u32::from(v.bits()))
+                        .sum()
+                }
+            )*
+        };
+    }
+
+    decode_sums! {
+        opcode_generated, opcode_matched => Opcode, opcode;
+        state_generated, state_matched => State, state;
+        err_code_generated, err_code_matched => ErrCode, err_code;
+    }
+}
+
+/// Handles with a zero-sized IO type are the size of a pointer, and a
+/// reference to a stateful IO type adds a single pointer.
+const _: () = {
+    use core::mem::size_of;
+    use peakrdl_rust::io::{MockIO, PtrIO, WidePtrIO};
+    use peakrdl_rust::reg::Reg;
+    use turbo_encab::components::turbo_encab::{ctrl::Ctrl, grammeter::Grammeter};
+
+    assert!(size_of::<turbo_encab::TurboEncab>() == size_of::<*mut ()>());
+    assert!(size_of::<turbo_encab::TurboEncab<WidePtrIO>>() == size_of::<*mut ()>());
+    assert!(size_of::<[Grammeter; 12]>() == 12 * size_of::<*mut ()>());
+    assert!(size_of::<Reg<Ctrl>>() == size_of::<*mut ()>());
+    assert!(size_of::<Reg<Ctrl, PtrIO>>() == size_of::<*mut ()>());
+    assert!(size_of::<Reg<Ctrl, &MockIO<4>>>() == 2 * size_of::<*mut ()>());
+};
+
+/// Register accessors compiled with `PtrIO` (or `WidePtrIO`), for codegen
+/// inspection.
+///
+/// The expected number of volatile loads/stores of each probe is listed in
+/// its doc comment.
+pub mod probes {
+    use peakrdl_rust::{io::WidePtrIO, reg::Register};
+
+    use crate::turbo_encab::TurboEncab;
+    use crate::wide_regs::Top as WideRegs;
+
+    /// Single-word register read: 1 load.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `TurboEncab` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_turbo_ctrl_read(base: *mut ()) -> u32 {
+        let top = unsafe { TurboEncab::from_ptr(base) };
+        top.ctrl().read().to_raw()
+    }
+
+    /// Single-word register write: 1 store.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `TurboEncab` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_turbo_ctrl_write(base: *mut ()) {
+        let top = unsafe { TurboEncab::from_ptr(base) };
+        top.ctrl().write(|r| r.set_reset(true));
+    }
+
+    /// Single-word register modify: 1 load, 1 store.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `TurboEncab` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_turbo_ctrl_modify(base: *mut ()) {
+        let top = unsafe { TurboEncab::from_ptr(base) };
+        top.ctrl().modify(|r| r.set_reset(!r.reset()));
+    }
+
+    /// `TurboEncab` instance at a fixed address (checked by
+    /// `tests/test_codegen.py`)
+    const FIXED_TURBO: TurboEncab = unsafe { TurboEncab::from_addr(0x4000_0000) };
+
+    /// Single-word register modify through a `const` instance: 1 load, 1 store,
+    /// both to a constant address.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub extern "C" fn probe_turbo_ctrl_modify_fixed() {
+        FIXED_TURBO.ctrl().modify(|r| r.set_reset(!r.reset()));
+    }
+
+    /// Register in a regfile array, dynamically indexed: 1 load, 1 store.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `TurboEncab` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_turbo_grammeter_modify(base: *mut (), idx: usize) {
+        let top = unsafe { TurboEncab::from_ptr(base) };
+        top.grammeter()[idx % 12]
+            .control()
+            .modify(|r| r.set_sync_en(true));
+    }
+
+    /// 128-bit register with 128-bit accesswidth read: 1 load.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r1_read(base: *mut ()) -> u128 {
+        let top = unsafe { WideRegs::from_ptr(base) };
+        top.r1().read().to_raw()
+    }
+
+    /// 128-bit register with 32-bit accesswidth read: 4 loads.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r4_read(base: *mut ()) -> u128 {
+        let top = unsafe { WideRegs::from_ptr(base) };
+        top.r4().read().to_raw()
+    }
+
+    /// 128-bit register with 32-bit accesswidth write: 4 stores.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r4_write(base: *mut (), val: u32) {
+        let top = unsafe { WideRegs::from_ptr(base) };
+        top.r4().write(|r| r.set_f2(val));
+    }
+
+    /// 128-bit register with 32-bit accesswidth modify: 4 loads, 4 stores.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r4_modify(base: *mut (), val: u32) {
+        let top = unsafe { WideRegs::from_ptr(base) };
+        top.r4().modify(|r| r.set_f2(val));
+    }
+
+    /// 128-bit register with 32-bit accesswidth read through `WidePtrIO`,
+    /// with an aligned base address: 1 load.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block aligned to 16 bytes.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r4_read_wide_io(base: *mut ()) -> u128 {
+        unsafe { core::hint::assert_unchecked(base.cast::<u128>().is_aligned()) };
+        let top = unsafe { WideRegs::from_ptr_with(base, WidePtrIO) };
+        top.r4().read().to_raw()
+    }
+
+    /// 128-bit register with 32-bit accesswidth modify through `WidePtrIO`,
+    /// with an aligned base address: 1 load, 1 store.
+    ///
+    /// # Safety
+    ///
+    /// `base` must point to a `WideRegs` register block aligned to 16 bytes.
+    #[unsafe(no_mangle)]
+    #[inline(never)]
+    pub unsafe extern "C" fn probe_wide_r4_modify_wide_io(base: *mut (), val: u32) {
+        unsafe { core::hint::assert_unchecked(base.cast::<u128>().is_aligned()) };
+        let top = unsafe { WideRegs::from_ptr_with(base, WidePtrIO) };
+        top.r4().modify(|r| r.set_f2(val));
+    }
+}
@@ -0,0 +1,67 @@
+//! Parsing of the Makefile-style depfile written by the generator
+
+use std::path::PathBuf;
+
+/// Parse the dependencies of the (single) target in a depfile.
+///
+/// Dependencies are separated by whitespace, with `\ ` and `\#` escaping
+/// spaces and `#` within a path. Lines ending in `\` are continued on the next.
+/// Any other backslash is kept as-is, so Windows paths don't need escaping.
+pub fn parse(contents: &str) -> Vec<PathBuf> {
+    let contents = contents.replace("\\\r\n", " ").replace("\\\n", " ");
+
+    // The target is terminated by the first colon followed by whitespace, which
+    // skips the colon after a Windows drive letter
+    let Some(start) = contents
+        .char_indices()
+        .zip(contents.chars().skip(1).chain([' ']))
+        .find(|((_, c), next)| *c == ':' && next.is_whitespace())
+        .map(|((i, _), _)| i + 1)
+    else {
+        return Vec::new();
+    };
+
+    let mut dependencies = Vec::new();
+    let mut current = String::new();
+    let mut chars = contents[start..].chars().peekable();
+    while let Some(c) = chars.next() {
+        match c {
+            '\\' if matches!(chars.peek(), Some(' ' | '#')) => {
+                current.extend(chars.next());
+            }
+            c if c.is_whitespace() => {
+                if !current.is_empty() {
+                    dependencies.push(PathBuf::from(std::mem::take(&mut current)));
+                }
+            }
+            c => current.push(c),
+        }
+    }
+    if !current.is_empty() {
+        dependencies.push(PathBuf::from(current));
+    }
+    dependencies
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_parse() {
+        let contents = "/out/top/mod.rs: \\\n  /src/top.rdl \\\n  /my\\ src/regs\\#1.rdl\n";
+        assert_eq!(
+            parse(contents),
+            [
+                PathBuf::from("/src/top.rdl"),
+                PathBuf::from("/my src/regs#1.rdl")
+            ]
+        );
+    }
+
+    #[test]
+    fn test_parse_windows() {
+        let contents = "C:\\out\\top\\mod.rs: \\\r\n  C:\\src\\top.rdl\r\n";
+        assert_eq!(parse(contents), [PathBuf::from("C:\\src\\top.rdl")]);
+    }
+}
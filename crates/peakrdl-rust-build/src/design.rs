@@ -0,0 +1,185 @@
+//! Top-level designs generated together by a single generator invocation
+
+use std::collections::HashMap;
+use std::fmt::Write as _;
+
+use crate::{AccessMode, Endian};
+
+/// A top-level addrmap to generate, along with options that override the
+/// ones set on the [`Generator`](crate::Generator).
+///
+/// Adding several designs with [`Generator::design`](crate::Generator::design)
+/// generates all of them in one invocation of the generator, so the input
+/// files are only compiled once.
+#[derive(Clone, Debug)]
+pub struct Design {
+    top: String,
+    rename: Option<String>,
+    parameters: HashMap<String, String>,
+    byte_endian: Option<Endian>,
+    word_endian: Option<Endian>,
+    access_mode: Option<AccessMode>,
+    read_only: Option<bool>,
+}
+
+impl Design {
+    /// Generate the top-level addrmap named `top`.
+    #[must_use]
+    pub fn new(top: impl Into<String>) -> Self {
+        Self {
+            top: top.into(),
+            rename: None,
+            parameters: HashMap::new(),
+            byte_endian: None,
+            word_endian: None,
+            access_mode: None,
+            read_only: None,
+        }
+    }
+
+    /// Override the top-component's instantiated name. By default, the instantiated name is the same as
+    /// the top component's type name
+    #[must_use]
+    pub fn rename(mut self, name: impl Into<String>) -> Self {
+        self.rename = Some(name.into());
+        self
+    }
+
+    /// Add a top-level SystemRDL parameter
+    #[must_use]
+    pub fn parameter(mut self, name: impl Into<String>, value: impl Into<String>) -> Self {
+        self.parameters.insert(name.into(), value.into());
+        self
+    }
+
+    /// Set the ordering of bytes within `accesswidth`-sized accesses to the register file.
+    #[must_use]
+    pub fn byte_endian(mut self, endian: Endian) -> Self {
+        self.byte_endian = Some(endian);
+        self
+    }
+
+    /// Set the ordering of `accesswidth`-sized words within a wide register.
+    #[must_use]
+    pub fn word_endian(mut self, endian: Endian) -> Self {
+        self.word_endian = Some(endian);
+        self
+    }
+
+    /// Set the access mode for register/field access functions.
+    #[must_use]
+    pub fn access_mode(mut self, mode: AccessMode) -> Self {
+        self.access_mode = Some(mode);
+        self
+    }
+
+    /// Set to `true` to treat all registers/fields as read-only.
+    #[must_use]
+    pub fn read_only(mut self, read_only: bool) -> Self {
+        self.read_only = Some(read_only);
+        self
+    }
+
+    /// Instance name of the generated top-level addrmap, which is also the
+    /// name of its output subdirectory.
+    pub(crate) fn name(&self) -> &str {
+        self.rename.as_ref().unwrap_or(&self.top)
+    }
+
+    pub(crate) fn top(&self) -> &str {
+        &self.top
+    }
+
+    pub(crate) fn renamed(&self) -> Option<&str> {
+        self.rename.as_deref()
+    }
+
+    /// JSON object describing the design in a `--batch` file
+    fn to_json(&self) -> String {
+        let mut fields = vec![format!("\"top\": {}", json_string(&self.top))];
+        if let Some(rename) = &self.rename {
+            fields.push(format!("\"rename\": {}", json_string(rename)));
+        }
+        if !self.parameters.is_empty() {
+            let parameters: Vec<String> = self
+                .parameters
+                .iter()
+                .map(|(name, value)| format!("{}: {}", json_string(name), json_string(value)))
+                .collect();
+            fields.push(format!("\"parameters\": {{{}}}", parameters.join(", ")));
+        }
+        let endian = |endian| match endian {
+            Endian::Big => "\"big\"",
+            Endian::Little => "\"little\"",
+        };
+        if let Some(byte_endian) = self.byte_endian {
+            fields.push(format!("\"byte_endian\": {}", endian(byte_endian)));
+        }
+        if let Some(word_endian) = self.word_endian {
+            fields.push(format!("\"word_endian\": {}", endian(word_endian)));
+        }
+        match self.access_mode {
+            Some(AccessMode::Hardware) => fields.push("\"access_mode\": \"hardware\"".into()),
+            Some(AccessMode::Software) => fields.push("\"access_mode\": \"software\"".into()),
+            None => (),
+        }
+        if let Some(read_only) = self.read_only {
+            fields.push(format!("\"read_only\": {read_only}"));
+        }
+        format!("{{{}}}", fields.join(", "))
+    }
+}
+
+/// Contents of a `--batch` file generating all of `designs`
+pub(crate) fn batch_json(designs: &[Design]) -> String {
+    let designs: Vec<String> = designs
+        .iter()
+        .map(|d| format!("  {}", d.to_json()))
+        .collect();
+    format!("[\n{}\n]\n", designs.join(",\n"))
+}
+
+fn json_string(s: &str) -> String {
+    let mut out = String::with_capacity(s.len() + 2);
+    out.push('"');
+    for c in s.chars() {
+        match c {
+            '"' => out.push_str("\\\""),
+            '\\' => out.push_str("\\\\"),
+            c if c.is_control() => {
+                let _ = write!(out, "\\u{:04x}", u32::from(c));
+            }
+            c => out.push(c),
+        }
+    }
+    out.push('"');
+    out
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_batch_json() {
+        let designs = [
+            Design::new("uart").rename("uart0").parameter("DEPTH", "16"),
+            Design::new("spi")
+                .byte_endian(Endian::Big)
+                .access_mode(AccessMode::Hardware)
+                .read_only(true),
+        ];
+        assert_eq!(
+            batch_json(&designs),
+            "[\n  \
+             {\"top\": \"uart\", \"rename\": \"uart0\", \"parameters\": {\"DEPTH\": \"16\"}},\n  \
+             {\"top\": \"spi\", \"byte_endian\": \"big\", \"access_mode\": \"hardware\", \"read_only\": true}\n\
+             ]\n"
+        );
+    }
+
+    #[test]
+    fn test_json_string() {
+        assert_eq!(json_string("a\"b\\c\n"), "\"a\\\"b\\\\c\\u000a\"");
+    }
+}
@@ -5,8 +5,11 @@ use std::path::{Path, PathBuf};
 use std::process::Command;
 
 mod binary;
+mod depfile;
+mod design;
 mod error;
 
+pub use design::Design;
 pub use error::Error;
 
 /// Result type for this crate.
@@ -48,6 +51,8 @@ pub struct Generator {
     /// Override the top-component's instantiated name. By default, the instantiated name is the same as
     /// the component's type name
     rename: Option<String>,
+    /// Additional top-level designs to generate in the same invocation.
+    designs: Vec<Design>,
     /// Output directory. Defaults to `$OUT_DIR`. The generated module is placed in a subfolder with
     /// the name of the instantiated top addrmap.
     out_dir: Option<PathBuf>,
@@ -89,6 +94,7 @@ impl Generator {
             parameters: HashMap::new(),
             top: None,
             rename: None,
+            designs: Vec::new(),
             out_dir: None,
             fmt: false,
             byte_endian: None,
@@ -153,6 +159,28 @@ impl Generator {
         self
     }
 
+    /// Add another top-level design to generate.
+    ///
+    /// All designs are generated by a single invocation of the generator, so
+    /// the input files shared between them are only compiled once. Each design
+    /// is placed in its own subfolder of [`Self::out_dir`], and uses the
+    /// options set on this generator unless overridden by the [`Design`].
+    ///
+    /// ```rust,ignore
+    /// use peakrdl_rust_build::{Design, Endian};
+    ///
+    /// peakrdl_rust_build::Generator::new()
+    ///     .rdl_files(["regs/common.rdl", "regs/uart.rdl", "regs/spi.rdl"])
+    ///     .design(Design::new("uart").rename("uart0"))
+    ///     .design(Design::new("spi").byte_endian(Endian::Big))
+    ///     .generate()
+    ///     .unwrap();
+    /// ```
+    pub fn design(&mut self, design: Design) -> &mut Self {
+        self.designs.push(design);
+        self
+    }
+
     /// Override the output directory. Defaults to `$OUT_DIR` set by Cargo.
     /// The generated module is placed in a subfolder with the name of the instantiated top addrmap.
     pub fn out_dir(&mut self, path: impl AsRef<Path>) -> &mut Self {
@@ -208,8 +236,9 @@ impl Generator {
     ///
     /// This will:
     /// 1. Locate (or download) the `peakrdl-rust` binary.
-    /// 2. Emit `cargo:rerun-if-changed` directives for all input files.
-    /// 3. Invoke `peakrdl rust` with the specified options.
+    /// 2. Invoke `peakrdl rust` with the specified options.
+    /// 3. Emit `cargo:rerun-if-changed` directives for every file read by the
+    ///    generator, including \`include'd files.
     ///
     /// # Panics
     ///
@@ -219,7 +248,17 @@ impl Generator {
             return Err(Error::NoInputs);
         }
 
-        let Some(top) = &self.top else {
+        // The design set with `top()`, followed by any added with `design()`
+        let mut designs = Vec::new();
+        if let Some(top) = &self.top {
+            let mut design = Design::new(top);
+            if let Some(rename) = &self.rename {
+                design = design.rename(rename);
+            }
+            designs.push(design);
+        }
+        designs.extend(self.designs.iter().cloned());
+        let Some(first) = designs.first() else {
             return Err(Error::NoTop);
         };
 
@@ -228,16 +267,14 @@ impl Generator {
             None => PathBuf::from(std::env::var("OUT_DIR").map_err(|_| Error::NoOutDir)?),
         };
 
-        // Tell Cargo to re-run this build script if any input file changes.
+        // Tell Cargo to re-run this build script if any input file changes. The
+        // files they include are added from the depfile once the generator runs.
         for file in &self.files {
             println!("cargo:rerun-if-changed={}", file.display());
         }
         if let Some(config_file) = &self.config_file {
             println!("cargo:rerun-if-changed={}", config_file.display());
         }
-        if let Some(include_dir) = &self.incdir {
-            println!("cargo:rerun-if-changed={}", include_dir.display());
-        }
 
         // Also re-run if the user overrides the binary path.
         println!("cargo:rerun-if-env-changed=PEAKRDL_RUST_BINARY");
@@ -267,23 +304,27 @@ impl Generator {
             };
         }
 
-        // top
-        cmd.args(["--top", top]);
-
-        // rename
-        if let Some(rename) = &self.rename {
-            cmd.args(["--rename", rename]);
-        }
-
         // parameters
         for (name, value) in &self.parameters {
             cmd.args(["-D", &format!("{name}={value}")]);
         }
 
-        // output directory
-        let top_name = self.rename.as_ref().unwrap_or(top);
-        let top_dir = out_dir.join(top_name);
-        cmd.args(["-o", top_dir.to_str().unwrap()]);
+        let mut batch_file = None;
+        if self.designs.is_empty() {
+            // top, rename, and output directory
+            cmd.args(["--top", first.top()]);
+            if let Some(rename) = first.renamed() {
+                cmd.args(["--rename", rename]);
+            }
+            cmd.args(["-o", out_dir.join(first.name()).to_str().unwrap()]);
+        } else {
+            // each design is placed in a subdirectory of the output directory
+            let path = out_dir.join(format!("{}.batch.json", first.name()));
+            std::fs::write(&path, design::batch_json(&designs))?;
+            cmd.args(["--batch", path.to_str().unwrap()]);
+            batch_file = Some(path);
+            cmd.args(["-o", out_dir.to_str().unwrap()]);
+        }
 
         // force
         if self.force {
@@ -329,6 +370,10 @@ impl Generator {
             cmd.arg("--read-only");
         }
 
+        // dependency tracking
+        let depfile = out_dir.join(format!("{}.d", first.name()));
+        cmd.args(["--depfile", depfile.to_str().unwrap()]);
+
         for file in &self.files {
             cmd.arg(file);
         }
@@ -346,10 +391,21 @@ impl Generator {
             });
         }
 
-        eprintln!(
-            "cargo:warning=Generated {top_name} code in {}",
-            top_dir.display()
-        );
+        for dependency in depfile::parse(&std::fs::read_to_string(&depfile)?) {
+            // The batch file is rewritten every time the build script runs
+            if batch_file.as_ref() == Some(&dependency) {
+                continue;
+            }
+            println!("cargo:rerun-if-changed={}", dependency.display());
+        }
+
+        for design in &designs {
+            eprintln!(
+                "cargo:warning=Generated {} code in {}",
+                design.name(),
+                out_dir.join(design.name()).display()
+            );
+        }
 
         Ok(())
     }
@@ -5,6 +5,9 @@ use num_traits::PrimInt;
 /// Endianness of a register
 #[allow(private_bounds)]
 pub trait Endian: Sealed + Copy {
+    /// `true` if this is the endianness of the target.
+    const NATIVE: bool;
+
     /// Convert from native endianness to register endianness.
     fn to_register_endian<T: PrimInt>(value: T) -> T;
 
@@ -32,6 +35,8 @@ impl Sealed for BigEndian {}
 impl Sealed for LittleEndian {}
 
 impl Endian for BigEndian {
+    const NATIVE: bool = cfg!(target_endian = "big");
+
     fn to_register_endian<T: PrimInt>(value: T) -> T {
         value.to_be()
     }
@@ -47,6 +52,8 @@ impl Endian for BigEndian {
 }
 
 impl Endian for LittleEndian {
+    const NATIVE: bool = cfg!(target_endian = "little");
+
     fn to_register_endian<T: PrimInt>(value: T) -> T {
         value.to_le()
     }
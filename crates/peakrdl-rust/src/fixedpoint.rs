@@ -333,10 +333,10 @@ where
         let scaled_value = value * scale;
 
         // saturate
-        if scaled_value >= P::max_value().as_() {
-            Self::from_bits(P::max_value())
-        } else if scaled_value <= P::min_value().as_() {
-            Self::from_bits(P::min_value())
+        if scaled_value >= Self::max_bits().as_() {
+            Self::from_bits(Self::max_bits())
+        } else if scaled_value <= Self::min_bits().as_() {
+            Self::from_bits(Self::min_bits())
         } else {
             // round
             Self::from_bits(
@@ -399,6 +399,163 @@ where
             .powi(-F as i32);
         self.val.as_() * scale
     }
+
+    /// Converts a slice of raw fixed-point bits to 32-bit floating-point values.
+    ///
+    /// Equivalent to calling [`Self::from_bits`] and [`Self::to_f32`] on each
+    /// element, but the scaling is computed once and the loop can be
+    /// auto-vectorized. The bits are not checked to be in range.
+    ///
+    /// # Panics
+    ///
+    /// Panics if `bits` and `out` have different lengths.
+    ///
+    /// # Examples
+    ///
+    /// ```
+    /// # use peakrdl_rust::fixedpoint::FixedPoint;
+    /// let mut out = [0.0; 3];
+    /// FixedPoint::<i16, 8, 4>::slice_to_f32(&[16, -24, 1], &mut out);
+    /// assert_eq!(out, [1.0, -1.5, 0.0625]);
+    /// ```
+    pub fn slice_to_f32(bits: &[P], out: &mut [f32])
+    where
+        P: AsPrimitive<f32>,
+    {
+        Self::slice_to_float(bits, out);
+    }
+
+    /// Converts a slice of raw fixed-point bits to 64-bit floating-point values.
+    ///
+    /// Equivalent to calling [`Self::from_bits`] and [`Self::to_f64`] on each
+    /// element, but the scaling is computed once and the loop can be
+    /// auto-vectorized. The bits are not checked to be in range.
+    ///
+    /// # Panics
+    ///
+    /// Panics if `bits` and `out` have different lengths.
+    ///
+    /// # Examples
+    ///
+    /// ```
+    /// # use peakrdl_rust::fixedpoint::FixedPoint;
+    /// let mut out = [0.0; 3];
+    /// FixedPoint::<u16, 8, 2>::slice_to_f64(&[8, 9, 0], &mut out);
+    /// assert_eq!(out, [2.0, 2.25, 0.0]);
+    /// ```
+    pub fn slice_to_f64(bits: &[P], out: &mut [f64])
+    where
+        P: AsPrimitive<f64>,
+    {
+        Self::slice_to_float(bits, out);
+    }
+
+    fn slice_to_float<T>(bits: &[P], out: &mut [T])
+    where
+        T: Float + 'static,
+        P: AsPrimitive<T>,
+    {
+        assert_eq!(bits.len(), out.len(), "Slice lengths must match");
+        #[allow(clippy::cast_possible_truncation)]
+        let scale = T::from(2)
+            .expect("two can be represented by any float type")
+            .powi(-F as i32);
+        for (out, bits) in out.iter_mut().zip(bits) {
+            *out = bits.as_() * scale;
+        }
+    }
+
+    /// Converts a slice of 32-bit floating-point values to raw fixed-point bits.
+    ///
+    /// Equivalent to calling [`Self::from_f32`] and [`Self::to_bits`] on each
+    /// element, but the scaling and saturation limits are computed once and
+    /// the loop can be auto-vectorized. Values are rounded to the nearest
+    /// representable value (ties away from 0) and saturated to the min/max
+    /// representable values.
+    ///
+    /// # Panics
+    ///
+    /// Panics if `values` and `out` have different lengths, or if any value
+    /// is NaN.
+    ///
+    /// # Examples
+    ///
+    /// ```
+    /// # use peakrdl_rust::fixedpoint::FixedPoint;
+    /// let mut out = [0; 3];
+    /// FixedPoint::<i8, 4, 4>::slice_from_f32(&[1.5, -0.03125, 100.0], &mut out);
+    /// assert_eq!(out, [24, -1, 127]);
+    /// ```
+    pub fn slice_from_f32(values: &[f32], out: &mut [P])
+    where
+        P: AsPrimitive<f32>,
+        f32: AsPrimitive<P>,
+    {
+        Self::slice_from_float(values, out);
+    }
+
+    /// Converts a slice of 64-bit floating-point values to raw fixed-point bits.
+    ///
+    /// Equivalent to calling [`Self::from_f64`] and [`Self::to_bits`] on each
+    /// element, but the scaling and saturation limits are computed once and
+    /// the loop can be auto-vectorized. Values are rounded to the nearest
+    /// representable value (ties away from 0) and saturated to the min/max
+    /// representable values.
+    ///
+    /// # Panics
+    ///
+    /// Panics if `values` and `out` have different lengths, or if any value
+    /// is NaN.
+    ///
+    /// # Examples
+    ///
+    /// ```
+    /// # use peakrdl_rust::fixedpoint::FixedPoint;
+    /// let mut out = [0; 3];
+    /// FixedPoint::<u16, 8, 2>::slice_from_f64(&[2.25, 2.3, -1.0], &mut out);
+    /// assert_eq!(out, [9, 9, 0]);
+    /// ```
+    pub fn slice_from_f64(values: &[f64], out: &mut [P])
+    where
+        P: AsPrimitive<f64>,
+        f64: AsPrimitive<P>,
+    {
+        Self::slice_from_float(values, out);
+    }
+
+    fn slice_from_float<T>(values: &[T], out: &mut [P])
+    where
+        T: Float + AsPrimitive<P>,
+        P: AsPrimitive<T>,
+    {
+        assert_eq!(values.len(), out.len(), "Slice lengths must match");
+        #[allow(clippy::cast_possible_truncation)]
+        let scale = T::from(2)
+            .expect("two can be represented by any float type")
+            .powi(F as i32);
+        let min: T = Self::min_bits().as_();
+        let max: T = Self::max_bits().as_();
+        let half = T::from(0.5).expect("one half can be represented by any float type");
+
+        // Branch-free so that the loop can be vectorized: NaNs are collected
+        // and reported after the loop, and rounding is done by truncating and
+        // adjusting by the fractional part.
+        let mut nan = false;
+        for (out, &value) in out.iter_mut().zip(values) {
+            nan |= value.is_nan();
+            let scaled = (value * scale).max(min).min(max);
+            let truncated: P = scaled.as_();
+            let fract = scaled - truncated.as_();
+            *out = if fract >= half {
+                truncated + P::one()
+            } else if fract <= -half {
+                truncated - P::one()
+            } else {
+                truncated
+            };
+        }
+        assert!(!nan, "Can't convert NaN to FixedPoint");
+    }
 }
 
 /// Automatic conversion from floating-point types to fixed-point.
@@ -467,6 +624,50 @@ mod tests {
         );
     }
 
+    #[test]
+    #[allow(clippy::float_cmp)]
+    fn test_slice_conversions() {
+        type Fp = FixedPoint<i16, 6, 6>;
+        let values: [f64; 8] = [0.0, 1.5, -1.5, 0.007_812_5, -0.007_812_5, 0.0234, 1e9, -1e9];
+
+        let mut bits = [0; 8];
+        Fp::slice_from_f64(&values, &mut bits);
+        let expected = values.map(|v| Fp::from_f64(v).to_bits());
+        assert_eq!(bits, expected);
+        assert_eq!(bits[6], Fp::max_value().to_bits());
+        assert_eq!(bits[7], Fp::min_value().to_bits());
+
+        let mut bits_f32 = [0; 8];
+        #[allow(clippy::cast_possible_truncation)]
+        Fp::slice_from_f32(&values.map(|v| v as f32), &mut bits_f32);
+        assert_eq!(bits_f32, expected);
+
+        let mut floats = [0.0; 8];
+        Fp::slice_to_f64(&bits, &mut floats);
+        assert_eq!(floats, bits.map(|b| Fp::from_bits(b).to_f64()));
+
+        let mut floats_f32 = [0.0; 8];
+        Fp::slice_to_f32(&bits, &mut floats_f32);
+        assert_eq!(floats_f32, bits.map(|b| Fp::from_bits(b).to_f32()));
+    }
+
+    #[test]
+    fn test_saturation_narrow() {
+        // Saturates to the width of the representation, not the primitive
+        type Fp = FixedPoint<i8, 3, 4>;
+        assert_eq!(Fp::from_f32(100.0).to_bits(), 63);
+        assert_eq!(Fp::from_f32(-100.0).to_bits(), -64);
+        let mut bits = [0; 2];
+        Fp::slice_from_f32(&[100.0, -100.0], &mut bits);
+        assert_eq!(bits, [63, -64]);
+    }
+
+    #[test]
+    #[should_panic(expected = "Can't convert NaN to FixedPoint")]
+    fn test_slice_from_float_nan_panic() {
+        FixedPoint::<u8, 4, 4>::slice_from_f64(&[1.0, f64::NAN], &mut [0; 2]);
+    }
+
     #[test]
     #[should_panic(expected = "Can't convert NaN to FixedPoint")]
     fn test_from_float_nan_panic() {
@@ -40,8 +40,90 @@ pub trait RawRegisterIO {
     /// is valid and points to a valid writeable memory location.
     #[allow(clippy::missing_errors_doc)]
     unsafe fn try_write<T: RegInt>(&self, ptr: *mut T, value: T) -> Result<(), Self::Error>;
+
+    /// Try to read a block of consecutive primitive integers from memory.
+    ///
+    /// This is used to read registers that are wider than their accesswidth.
+    /// `buf[i]` receives the word located at `ptr.wrapping_add(i)`, so the words
+    /// are transferred in address order. Each word is in the register's native
+    /// endianness (not necessarily the host's endianness).
+    ///
+    /// The default implementation calls [`RawRegisterIO::try_read`] once per word.
+    /// Transports with a per-transaction overhead (e.g., tunneled registers) can
+    /// override it to transfer the whole block in a single transaction.
+    ///
+    /// # Safety
+    ///
+    /// This method may dereference a raw pointer. The caller must ensure the pointer
+    /// is valid and points to `buf.len()` valid memory locations.
+    #[allow(clippy::missing_errors_doc)]
+    unsafe fn try_read_block<T: RegInt>(
+        &self,
+        ptr: *const T,
+        buf: &mut [T],
+    ) -> Result<(), Self::Error> {
+        for (i, word) in buf.iter_mut().enumerate() {
+            // SAFETY: the caller guarantees `buf.len()` words are valid
+            *word = unsafe { self.try_read(ptr.wrapping_add(i))? };
+        }
+        Ok(())
+    }
+
+    /// Try to write a block of consecutive primitive integers to memory.
+    ///
+    /// This is used to write registers that are wider than their accesswidth.
+    /// `buf[i]` is written to `ptr.wrapping_add(i)`, and the words must be
+    /// transferred in address order. Each word is in the register's native
+    /// endianness (not necessarily the host's endianness).
+    ///
+    /// The default implementation calls [`RawRegisterIO::try_write`] once per word.
+    /// Transports with a per-transaction overhead (e.g., tunneled registers) can
+    /// override it to transfer the whole block in a single transaction.
+    ///
+    /// # Safety
+    ///
+    /// This method may dereference a raw pointer. The caller must ensure the pointer
+    /// is valid and points to `buf.len()` valid writeable memory locations.
+    #[allow(clippy::missing_errors_doc)]
+    unsafe fn try_write_block<T: RegInt>(&self, ptr: *mut T, buf: &[T]) -> Result<(), Self::Error> {
+        for (i, word) in buf.iter().enumerate() {
+            // SAFETY: the caller guarantees `buf.len()` words are valid
+            unsafe { self.try_write(ptr.wrapping_add(i), *word)? };
+        }
+        Ok(())
+    }
 }
 
+/// Shares a stateful I/O implementation between register handles, which hold
+/// their I/O implementation by value.
+impl<T: RawRegisterIO + ?Sized> RawRegisterIO for &T {
+    type Error = T::Error;
+
+    unsafe fn try_read<U: RegInt>(&self, ptr: *const U) -> Result<U, Self::Error> {
+        unsafe { (**self).try_read(ptr) }
+    }
+
+    unsafe fn try_write<U: RegInt>(&self, ptr: *mut U, value: U) -> Result<(), Self::Error> {
+        unsafe { (**self).try_write(ptr, value) }
+    }
+
+    unsafe fn try_read_block<U: RegInt>(
+        &self,
+        ptr: *const U,
+        buf: &mut [U],
+    ) -> Result<(), Self::Error> {
+        unsafe { (**self).try_read_block(ptr, buf) }
+    }
+
+    unsafe fn try_write_block<U: RegInt>(&self, ptr: *mut U, buf: &[U]) -> Result<(), Self::Error> {
+        unsafe { (**self).try_write_block(ptr, buf) }
+    }
+}
+
+/// Maximum number of accesswidth subwords in a register (a 128-bit register
+/// accessed 8 bits at a time).
+const MAX_SUBWORDS: usize = 16;
+
 /// Register I/O
 ///
 /// Register accesses are performed through implementers of this trait. This trait's
@@ -109,29 +191,33 @@ where
 
         // Fast path: a single-word register is one volatile load. `num_subwords`
         // is a compile-time constant (derived from `size_of`), so for single-word
-        // registers the multi-word loop below is dropped entirely and the access
+        // registers the multi-word block path below is dropped entirely and the access
         // folds to a single load at the call site.
         if num_subwords == 1 {
             // SAFETY: accesswidth == regwidth here, so this reads exactly the
-            // register's bounds (same guarantee the loop relies on).
+            // register's bounds (same guarantee the block path relies on).
             let subword = unsafe { self.try_read::<R::Accesswidth>(ptr)? };
             let subword = R::ByteEndian::from_register_endian(subword);
             // SAFETY: value just read directly from hardware.
             return unsafe { Ok(R::from_raw(subword.as_())) };
         }
 
-        // read one subword at a time, starting at the lowest address
-        let raw_value = (0..num_subwords)
-            .map(|i| {
-                // SAFETY: SystemRDL guarantees accesswidth <= regwidth, so we won't
-                // read outside the bounds of the original pointer.
-                unsafe { (i, self.try_read(ptr.wrapping_add(i))) }
-            })
-            .try_fold(R::Regwidth::ZERO, |reg, (i, subword)| {
-                let significance = R::WordEndian::address_order_to_significance(i, num_subwords);
-                let subword = R::ByteEndian::from_register_endian(subword?);
-                Ok(reg | (subword.as_() << (significance * accesswidth)))
-            })?;
+        // read all subwords as one block, starting at the lowest address
+        let mut subwords = [R::Accesswidth::ZERO; MAX_SUBWORDS];
+        let subwords = &mut subwords[..num_subwords];
+        // SAFETY: SystemRDL guarantees accesswidth <= regwidth, so we won't
+        // read outside the bounds of the original pointer.
+        unsafe { self.try_read_block(ptr, subwords)? };
+        let raw_value =
+            subwords
+                .iter()
+                .enumerate()
+                .fold(R::Regwidth::ZERO, |reg, (i, &subword)| {
+                    let significance =
+                        R::WordEndian::address_order_to_significance(i, num_subwords);
+                    let subword = R::ByteEndian::from_register_endian(subword);
+                    reg | (subword.as_() << (significance * accesswidth))
+                });
         // SAFETY: The value was just read directly from hardware, and should
         // therefore be a valid register value.
         unsafe { Ok(R::from_raw(raw_value)) }
@@ -154,27 +240,26 @@ where
         let mask = R::Accesswidth::max_value().as_();
 
         // Fast path: a single-word register is one volatile store. `num_subwords`
-        // is a compile-time constant, so for single-word registers the loop below
-        // is dropped entirely and the access folds to a single store at the call site.
+        // is a compile-time constant, so for single-word registers the block path
+        // below is dropped entirely and the access folds to a single store at the call site.
         if num_subwords == 1 {
             let subword = R::ByteEndian::to_register_endian(value.as_());
             // SAFETY: accesswidth == regwidth here, so this writes exactly the
-            // register's bounds (same guarantee the loop relies on).
+            // register's bounds (same guarantee the block path relies on).
             return unsafe { self.try_write::<R::Accesswidth>(ptr, subword) };
         }
 
-        // write one subword at a time, starting at the lowest address
-        for i in 0..num_subwords {
+        // write all subwords as one block, starting at the lowest address
+        let mut subwords = [R::Accesswidth::ZERO; MAX_SUBWORDS];
+        let subwords = &mut subwords[..num_subwords];
+        for (i, word) in subwords.iter_mut().enumerate() {
             let significance = R::WordEndian::address_order_to_significance(i, num_subwords);
             let subword = (value >> (significance * accesswidth)) & mask;
-            let subword = R::ByteEndian::to_register_endian(subword.as_());
-            // SAFETY: SystemRDL guarantees accesswidth <= regwidth, so we won't
-            // write outside the bounds of the original pointer.
-            unsafe {
-                self.try_write(ptr.wrapping_add(i), subword)?;
-            }
+            *word = R::ByteEndian::to_register_endian(subword.as_());
         }
-        Ok(())
+        // SAFETY: SystemRDL guarantees accesswidth <= regwidth, so we won't
+        // write outside the bounds of the original pointer.
+        unsafe { self.try_write_block(ptr, subwords) }
     }
 }
 
@@ -182,6 +267,7 @@ where
 ///
 /// Provides infallible register access through volatile pointer reads
 /// and writes.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
 pub struct PtrIO;
 
 impl RawRegisterIO for PtrIO {
@@ -197,6 +283,72 @@ impl RawRegisterIO for PtrIO {
     }
 }
 
+/// [`RegisterIO`] implementation for buses that allow full-width accesses to
+/// registers wider than their accesswidth.
+///
+/// Like [`PtrIO`], but a register wider than its accesswidth is read or written
+/// with a single `regwidth` volatile access, with no byte swaps, if its layout
+/// in memory matches the target's layout of its `Regwidth` type: both its byte
+/// and word endianness are the target's endianness (checked at compile time),
+/// and it is naturally aligned. Otherwise, this falls back to the [`PtrIO`]
+/// accesses of each subword.
+///
+/// Only use this if the bus and the hardware accept accesses wider than the
+/// registers' accesswidth, and don't rely on the subwords being accessed
+/// separately (e.g., for side effects on accesses to a specific subword).
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct WidePtrIO;
+
+impl WidePtrIO {
+    /// `true` if a register's layout in memory matches the target's layout of
+    /// its `Regwidth` type, so it can be accessed with a single volatile access
+    /// of `Regwidth`.
+    fn is_native_layout<R: Register>(ptr: *const R::Regwidth) -> bool {
+        let native_endian = const { R::ByteEndian::NATIVE && R::WordEndian::NATIVE };
+        native_endian && ptr.is_aligned()
+    }
+}
+
+impl RegisterIO for WidePtrIO {
+    type Error = core::convert::Infallible;
+
+    unsafe fn try_read_register<R: Register>(
+        &self,
+        ptr: *const R::Regwidth,
+    ) -> Result<R, Self::Error>
+    where
+        R::Access: Read,
+    {
+        if Self::is_native_layout::<R>(ptr) {
+            // SAFETY: The caller guarantees the pointer is valid, and it is
+            // aligned. The value was just read directly from hardware.
+            unsafe { Ok(R::from_raw(ptr.read_volatile())) }
+        } else {
+            // SAFETY: Same requirements as this method
+            unsafe { PtrIO.try_read_register(ptr) }
+        }
+    }
+
+    unsafe fn try_write_register<R: Register>(
+        &self,
+        ptr: *mut R::Regwidth,
+        value: R,
+    ) -> Result<(), Self::Error>
+    where
+        R::Access: Write,
+    {
+        if Self::is_native_layout::<R>(ptr) {
+            // SAFETY: The caller guarantees the pointer is valid, and it is
+            // aligned.
+            unsafe { ptr.write_volatile(value.to_raw()) };
+            Ok(())
+        } else {
+            // SAFETY: Same requirements as this method
+            unsafe { PtrIO.try_write_register(ptr, value) }
+        }
+    }
+}
+
 /// Mocked [`RegisterIO`] implementation.
 ///
 /// Implemented as an array of N bytes, register writes and reads
@@ -237,4 +389,95 @@ impl<const N: usize> RawRegisterIO for MockIO<N> {
         bytes.copy_from_slice(value.to_ne_bytes().as_ref());
         Ok(())
     }
+
+    unsafe fn try_read_block<T: RegInt>(
+        &self,
+        ptr: *const T,
+        buf: &mut [T],
+    ) -> Result<(), Self::Error> {
+        let addr = ptr.addr();
+        let size = core::mem::size_of::<T>();
+        let data = self.0.borrow();
+        let bytes = &data[addr..addr + core::mem::size_of_val(buf)];
+        for (word, bytes) in buf.iter_mut().zip(bytes.chunks_exact(size)) {
+            *word = T::from_ne_bytes(&bytes.try_into().expect("Incorrect slice length"));
+        }
+        Ok(())
+    }
+
+    unsafe fn try_write_block<T: RegInt>(&self, ptr: *mut T, buf: &[T]) -> Result<(), Self::Error> {
+        let addr = ptr.addr();
+        let size = core::mem::size_of::<T>();
+        let mut data = self.0.borrow_mut();
+        let bytes = &mut data[addr..addr + core::mem::size_of_val(buf)];
+        for (word, bytes) in buf.iter().zip(bytes.chunks_exact_mut(size)) {
+            bytes.copy_from_slice(word.to_ne_bytes().as_ref());
+        }
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::{
+        access::RW,
+        endian::{BigEndian, LittleEndian},
+    };
+
+    /// 64-bit register with a 16-bit accesswidth
+    #[derive(Clone, Copy)]
+    struct Wide<B, W>(u64, core::marker::PhantomData<(B, W)>);
+
+    impl<B: Endian, W: Endian> Register for Wide<B, W> {
+        type Regwidth = u64;
+        type Accesswidth = u16;
+        type Access = RW;
+        type ByteEndian = B;
+        type WordEndian = W;
+
+        unsafe fn from_raw(val: u64) -> Self {
+            Self(val, core::marker::PhantomData)
+        }
+
+        fn to_raw(self) -> u64 {
+            self.0
+        }
+    }
+
+    /// Check that `WidePtrIO` and `PtrIO` access registers in the same way
+    fn check_same_as_ptr_io<B: Endian, W: Endian>() {
+        let mut buf = [0_u64; 3];
+        // aligned, and misaligned by one subword
+        let ptrs = [
+            buf.as_mut_ptr().wrapping_add(1),
+            buf.as_mut_ptr().wrapping_byte_add(10),
+        ];
+        for ptr in ptrs {
+            let value = Wide::<B, W>(0x0123_4567_89AB_CDEF, core::marker::PhantomData);
+            unsafe {
+                WidePtrIO.try_write_register(ptr, value).unwrap();
+                let wide_bytes = ptr.cast::<[u8; 8]>().read_unaligned();
+                assert_eq!(
+                    PtrIO.try_read_register::<Wide<B, W>>(ptr).unwrap().0,
+                    value.0
+                );
+
+                PtrIO.try_write_register(ptr, value).unwrap();
+                assert_eq!(ptr.cast::<[u8; 8]>().read_unaligned(), wide_bytes);
+                assert_eq!(
+                    WidePtrIO.try_read_register::<Wide<B, W>>(ptr).unwrap().0,
+                    value.0
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn test_wide_ptr_io() {
+        check_same_as_ptr_io::<LittleEndian, LittleEndian>();
+        check_same_as_ptr_io::<LittleEndian, BigEndian>();
+        check_same_as_ptr_io::<BigEndian, LittleEndian>();
+        check_same_as_ptr_io::<BigEndian, BigEndian>();
+    }
 }
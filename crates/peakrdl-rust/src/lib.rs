@@ -7,6 +7,12 @@ pub mod endian;
 #[cfg(feature = "fixedpoint")]
 pub mod fixedpoint;
 pub mod io;
+pub mod lock;
 pub mod mem;
+pub mod model;
+#[cfg(target_has_atomic = "ptr")]
+pub mod profile;
 pub mod reg;
+pub mod trace;
 pub mod version;
+pub mod wait;
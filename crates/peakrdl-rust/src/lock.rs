@@ -0,0 +1,216 @@
+//! Striped locks for concurrent read-modify-write accesses
+//!
+//! [`Reg::modify`][crate::reg::Reg::modify] reads a register and then writes it
+//! back, so two threads (or a thread and an interrupt handler) modifying the same
+//! register can lose each other's updates. [`Reg::modify_locked`] holds a lock
+//! from a [`StripeLock`] for the duration of the read-modify-write. The lock is
+//! selected by the register's address, so modifications of unrelated registers
+//! rarely contend, unlike a single mutex around the whole register block.
+//!
+//! Two backends are provided:
+//!
+//! - [`SpinStripes`], a table of `N` spinlocks for targets with atomic
+//!   compare-and-swap. Registers whose addresses hash to the same stripe share a
+//!   lock.
+//! - `CriticalSection` (with the `critical-section` feature), which runs the
+//!   read-modify-write in a critical section from the `critical-section` crate,
+//!   for single-core `no_std` targets where the register is also modified by
+//!   interrupt handlers.
+//!
+//! The locks are only effective if every read-modify-write of a shared register
+//! goes through [`Reg::modify_locked`] with the same lock table. Writes that
+//! don't depend on the current value (e.g., [`Reg::write`]) don't need a lock.
+//!
+//! # Example
+//!
+//! ```
+//! use peakrdl_rust::lock::{SpinStripes, StripeLock};
+//!
+//! static LOCKS: SpinStripes<16> = SpinStripes::new();
+//!
+//! let mut counter = 0;
+//! LOCKS.with_lock(0x40, || counter += 1);
+//! assert_eq!(counter, 1);
+//! ```
+//!
+//! [`Reg::modify_locked`]: crate::reg::Reg::modify_locked
+//! [`Reg::write`]: crate::reg::Reg::write
+#![allow(clippy::inline_always)]
+
+#[cfg(target_has_atomic = "8")]
+use core::sync::atomic::{AtomicBool, Ordering};
+
+/// Table of locks selected by register address.
+pub trait StripeLock {
+    /// Run `f` while holding the lock for the register at `addr`.
+    ///
+    /// Locks are not reentrant: `f` must not take a lock from the same table,
+    /// since it may select the same stripe.
+    fn with_lock<T>(&self, addr: usize, f: impl FnOnce() -> T) -> T;
+}
+
+impl<L: StripeLock + ?Sized> StripeLock for &L {
+    #[inline(always)]
+    fn with_lock<T>(&self, addr: usize, f: impl FnOnce() -> T) -> T {
+        (**self).with_lock(addr, f)
+    }
+}
+
+/// Table of `N` spinlocks, selected by a hash of the register address.
+///
+/// Each lock is padded to its own cache line, so threads holding different
+/// stripes don't contend on the same line. `N` should be a power of two, and a
+/// few times larger than the number of registers modified concurrently to keep
+/// collisions between unrelated registers rare.
+#[cfg(target_has_atomic = "8")]
+pub struct SpinStripes<const N: usize> {
+    stripes: [Stripe; N],
+}
+
+#[cfg(target_has_atomic = "8")]
+#[repr(align(64))]
+struct Stripe(AtomicBool);
+
+#[cfg(target_has_atomic = "8")]
+impl<const N: usize> SpinStripes<N> {
+    /// Create a table of unlocked stripes.
+    ///
+    /// # Panics
+    ///
+    /// Panics (at compile time in a `const` or `static`) if `N` is zero.
+    #[must_use]
+    pub const fn new() -> Self {
+        assert!(N > 0, "SpinStripes needs at least one stripe");
+        Self {
+            stripes: [const { Stripe(AtomicBool::new(false)) }; N],
+        }
+    }
+
+    /// Index of the stripe locking the register at `addr`.
+    #[must_use]
+    pub const fn stripe(addr: usize) -> usize {
+        // Fibonacci hashing: registers are usually 4-byte aligned and adjacent,
+        // so the low bits alone would leave most stripes unused.
+        let hash = (addr as u64).wrapping_mul(0x9E37_79B9_7F4A_7C15);
+        #[allow(clippy::cast_possible_truncation)]
+        let hash = (hash >> 32) as usize;
+        hash % N
+    }
+}
+
+#[cfg(target_has_atomic = "8")]
+impl<const N: usize> Default for SpinStripes<N> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+#[cfg(target_has_atomic = "8")]
+impl<const N: usize> StripeLock for SpinStripes<N> {
+    #[inline]
+    fn with_lock<T>(&self, addr: usize, f: impl FnOnce() -> T) -> T {
+        /// Releases the stripe when dropped, including if `f` panics
+        struct Guard<'a>(&'a AtomicBool);
+
+        impl Drop for Guard<'_> {
+            #[inline(always)]
+            fn drop(&mut self) {
+                self.0.store(false, Ordering::Release);
+            }
+        }
+
+        let lock = &self.stripes[Self::stripe(addr)].0;
+        while lock
+            .compare_exchange_weak(false, true, Ordering::Acquire, Ordering::Relaxed)
+            .is_err()
+        {
+            // wait for the stripe to look free before retrying the exchange
+            while lock.load(Ordering::Relaxed) {
+                core::hint::spin_loop();
+            }
+        }
+        let _guard = Guard(lock);
+        f()
+    }
+}
+
+/// [`StripeLock`] that runs every read-modify-write in a critical section
+/// from the `critical-section` crate, regardless of the register address.
+///
+/// On single-core targets a critical section typically disables interrupts, so
+/// this protects registers shared with interrupt handlers without any lock
+/// table.
+#[cfg(feature = "critical-section")]
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct CriticalSection;
+
+#[cfg(feature = "critical-section")]
+impl StripeLock for CriticalSection {
+    #[inline(always)]
+    fn with_lock<T>(&self, _addr: usize, f: impl FnOnce() -> T) -> T {
+        critical_section::with(|_| f())
+    }
+}
+
+#[cfg(all(test, target_has_atomic = "8"))]
+mod tests {
+    extern crate std;
+
+    use super::*;
+    use crate::io::PtrIO;
+    use crate::reg::{Reg, Register};
+    use std::thread;
+
+    #[derive(Clone, Copy)]
+    struct Counter(u32);
+
+    impl Register for Counter {
+        type Regwidth = u32;
+        type Accesswidth = u32;
+        type Access = crate::access::RW;
+        type ByteEndian = crate::endian::LittleEndian;
+        type WordEndian = crate::endian::LittleEndian;
+
+        unsafe fn from_raw(val: u32) -> Self {
+            Self(val)
+        }
+
+        fn to_raw(self) -> u32 {
+            self.0
+        }
+    }
+
+    #[test]
+    fn test_stripe_spread() {
+        // adjacent registers don't all map to the same few stripes
+        let mut used = [false; 16];
+        for addr in (0..64).map(|i| 0x4000_0000 + 4 * i) {
+            used[SpinStripes::<16>::stripe(addr)] = true;
+        }
+        assert!(used.iter().filter(|&&u| u).count() >= 12);
+    }
+
+    #[test]
+    fn test_modify_locked() {
+        const THREADS: u32 = 4;
+        const ITERATIONS: u32 = 10_000;
+
+        static LOCKS: SpinStripes<8> = SpinStripes::new();
+        let mut memory = [0_u32; 2];
+        let ptr = memory.as_mut_ptr();
+        let regs = [ptr, ptr.wrapping_add(1)]
+            .map(|p| unsafe { Reg::<Counter, PtrIO>::from_ptr_with(p, PtrIO) });
+
+        thread::scope(|s| {
+            for t in 0..THREADS {
+                let reg = regs[t as usize % 2];
+                s.spawn(move || {
+                    for _ in 0..ITERATIONS {
+                        reg.modify_locked(&LOCKS, |r| r.0 += 1);
+                    }
+                });
+            }
+        });
+        assert_eq!(memory, [THREADS / 2 * ITERATIONS; 2]);
+    }
+}
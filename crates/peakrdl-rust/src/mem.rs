@@ -1,5 +1,7 @@
 //! Memory abstraction used to read, write, and iterate over memory entries
 
+#[cfg(feature = "fixedpoint")]
+use crate::fixedpoint::FixedPoint;
 use crate::{
     access::{Access, Read, Write},
     endian::Endian,
@@ -10,6 +12,8 @@ use core::{
     iter::{ExactSizeIterator, FusedIterator},
     ops::{Bound, RangeBounds},
 };
+#[cfg(feature = "fixedpoint")]
+use num_traits::AsPrimitive;
 
 /// Behaviors common to all SystemRDL memories
 pub trait Memory: Sized {
@@ -70,6 +74,233 @@ pub trait Memory: Sized {
     }
 }
 
+/// A [`Memory`] whose entries hold signed integers or fixed-point numbers.
+///
+/// Implemented by generated memories whose virtual registers have a single
+/// field with the `is_signed` or `fracwidth` property. Entries are decoded
+/// to `Element` (a signed integer or `FixedPoint` type) with the sign extension and masking for the field's width and offset.
+pub trait TypedMemory: Memory {
+    /// Type of the value held in each memory entry
+    type Element: Copy;
+
+    /// Decode the raw value of a memory entry
+    #[must_use]
+    fn decode(bits: Self::Memwidth) -> Self::Element;
+
+    /// Encode a value as the raw value of a memory entry
+    #[must_use]
+    fn encode(value: Self::Element) -> Self::Memwidth;
+
+    /// Read the decoded values of consecutive entries, starting at index
+    /// `start`, into `out`.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds.
+    fn read_slice(&self, start: usize, out: &mut [Self::Element])
+    where
+        Self::Access: Read,
+    {
+        read_entries(self, start, out.len(), |i, bits| {
+            out[i] = Self::decode(bits);
+        });
+    }
+
+    /// Encode and write `values` to consecutive entries, starting at index
+    /// `start`.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds.
+    fn write_slice(&self, start: usize, values: &[Self::Element])
+    where
+        Self::Access: Write,
+    {
+        write_entries(self, start, values.len(), |i| Self::encode(values[i]));
+    }
+}
+
+/// Conversions between the entries of a fixed-point [`TypedMemory`] and
+/// floating-point values.
+///
+/// The entries are converted in chunks with the
+/// [`FixedPoint::slice_to_f32`]-style slice conversions, which compute the
+/// scaling once and can be auto-vectorized.
+#[cfg(feature = "fixedpoint")]
+pub trait FixedPointMemory<P, const I: isize, const F: isize>:
+    TypedMemory<Element = FixedPoint<P, I, F>>
+where
+    P: RegInt,
+{
+    /// Read consecutive entries, starting at index `start`, as 32-bit
+    /// floating-point values into `out`.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds.
+    fn read_f32(&self, start: usize, out: &mut [f32])
+    where
+        Self::Access: Read,
+        P: AsPrimitive<f32>,
+    {
+        read_floats(self, start, out, FixedPoint::<P, I, F>::slice_to_f32);
+    }
+
+    /// Read consecutive entries, starting at index `start`, as 64-bit
+    /// floating-point values into `out`.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds.
+    fn read_f64(&self, start: usize, out: &mut [f64])
+    where
+        Self::Access: Read,
+        P: AsPrimitive<f64>,
+    {
+        read_floats(self, start, out, FixedPoint::<P, I, F>::slice_to_f64);
+    }
+
+    /// Write 32-bit floating-point `values` to consecutive entries, starting
+    /// at index `start`. Values are rounded and saturated like
+    /// [`FixedPoint::from_f32`].
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds or if any value is NaN.
+    fn write_f32(&self, start: usize, values: &[f32])
+    where
+        Self::Access: Write,
+        P: AsPrimitive<f32>,
+        f32: AsPrimitive<P>,
+    {
+        write_floats(self, start, values, FixedPoint::<P, I, F>::slice_from_f32);
+    }
+
+    /// Write 64-bit floating-point `values` to consecutive entries, starting
+    /// at index `start`. Values are rounded and saturated like
+    /// [`FixedPoint::from_f64`].
+    ///
+    /// # Panics
+    ///
+    /// Panics if the entries are out of bounds or if any value is NaN.
+    fn write_f64(&self, start: usize, values: &[f64])
+    where
+        Self::Access: Write,
+        P: AsPrimitive<f64>,
+        f64: AsPrimitive<P>,
+    {
+        write_floats(self, start, values, FixedPoint::<P, I, F>::slice_from_f64);
+    }
+}
+
+#[cfg(feature = "fixedpoint")]
+impl<M, P, const I: isize, const F: isize> FixedPointMemory<P, I, F> for M
+where
+    M: TypedMemory<Element = FixedPoint<P, I, F>>,
+    P: RegInt,
+{
+}
+
+/// Number of entries converted at once by [`FixedPointMemory`]
+#[cfg(feature = "fixedpoint")]
+const FLOAT_CHUNK: usize = 32;
+
+#[cfg(feature = "fixedpoint")]
+fn read_floats<M, P, T, const I: isize, const F: isize>(
+    mem: &M,
+    start: usize,
+    out: &mut [T],
+    convert: fn(&[P], &mut [T]),
+) where
+    M: TypedMemory<Element = FixedPoint<P, I, F>>,
+    M::Access: Read,
+    P: RegInt,
+{
+    let mut bits = [P::zero(); FLOAT_CHUNK];
+    check_bounds(mem, start, out.len());
+    for (chunk_idx, out) in out.chunks_mut(FLOAT_CHUNK).enumerate() {
+        let bits = &mut bits[..out.len()];
+        read_entries(mem, start + chunk_idx * FLOAT_CHUNK, out.len(), |i, raw| {
+            bits[i] = M::decode(raw).to_bits();
+        });
+        convert(bits, out);
+    }
+}
+
+#[cfg(feature = "fixedpoint")]
+fn write_floats<M, P, T, const I: isize, const F: isize>(
+    mem: &M,
+    start: usize,
+    values: &[T],
+    convert: fn(&[T], &mut [P]),
+) where
+    M: TypedMemory<Element = FixedPoint<P, I, F>>,
+    M::Access: Write,
+    P: RegInt,
+{
+    let mut bits = [P::zero(); FLOAT_CHUNK];
+    check_bounds(mem, start, values.len());
+    for (chunk_idx, values) in values.chunks(FLOAT_CHUNK).enumerate() {
+        let bits = &mut bits[..values.len()];
+        convert(values, bits);
+        write_entries(mem, start + chunk_idx * FLOAT_CHUNK, values.len(), |i| {
+            M::encode(FixedPoint::from_bits(bits[i]))
+        });
+    }
+}
+
+fn check_bounds<M: Memory>(mem: &M, start: usize, len: usize) {
+    assert!(
+        start
+            .checked_add(len)
+            .is_some_and(|end| end <= mem.num_entries()),
+        "Tried to access {} entries starting at {} in a memory with only {} entries",
+        len,
+        start,
+        mem.num_entries()
+    );
+}
+
+/// Read `len` consecutive entries starting at index `start`, calling `f`
+/// with the index (relative to `start`) and value of each.
+fn read_entries<M: Memory>(mem: &M, start: usize, len: usize, mut f: impl FnMut(usize, M::Memwidth))
+where
+    M::Access: Read,
+{
+    check_bounds(mem, start, len);
+    let ptr = mem.first_entry_ptr().wrapping_add(start);
+    for i in 0..len {
+        // SAFETY: The memory's pointer is guaranteed to point to a suitable
+        // hardware memory, and the entry is in bounds.
+        f(
+            i,
+            M::Endian::from_register_endian(unsafe { ptr.add(i).read_volatile() }),
+        );
+    }
+}
+
+/// Write `len` consecutive entries starting at index `start` with the value
+/// returned by `f` for each index (relative to `start`).
+fn write_entries<M: Memory>(
+    mem: &M,
+    start: usize,
+    len: usize,
+    mut f: impl FnMut(usize) -> M::Memwidth,
+) where
+    M::Access: Write,
+{
+    check_bounds(mem, start, len);
+    let ptr = mem.first_entry_ptr().wrapping_add(start);
+    for i in 0..len {
+        // SAFETY: The memory's pointer is guaranteed to point to a suitable
+        // hardware memory, and the entry is in bounds.
+        unsafe {
+            ptr.add(i)
+                .write_volatile(M::Endian::to_register_endian(f(i)));
+        }
+    }
+}
+
 /// Representation of a single memory entry
 #[derive(Copy, Clone, PartialEq, Eq, Hash, Debug)]
 pub struct MemEntry<M: Memory> {
@@ -164,3 +395,120 @@ impl<M: Memory> DoubleEndedIterator for MemEntryIter<M> {
 
 impl<M: Memory> ExactSizeIterator for MemEntryIter<M> {}
 impl<M: Memory> FusedIterator for MemEntryIter<M> {}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::{access::RW, endian::LittleEndian};
+
+    /// 20-bit memory with a signed 12-bit value in bits [15:4] of each entry
+    struct SignedMem(*mut u32);
+
+    impl Memory for SignedMem {
+        type Memwidth = u32;
+        type Access = RW;
+        type Endian = LittleEndian;
+
+        fn first_entry_ptr(&self) -> *mut u32 {
+            self.0
+        }
+
+        fn num_entries(&self) -> usize {
+            40
+        }
+
+        fn width(&self) -> usize {
+            20
+        }
+    }
+
+    impl TypedMemory for SignedMem {
+        type Element = i16;
+
+        #[allow(clippy::cast_possible_truncation)]
+        fn decode(bits: u32) -> i16 {
+            ((bits >> 4) as i16).wrapping_shl(4).wrapping_shr(4)
+        }
+
+        #[allow(clippy::cast_sign_loss)]
+        fn encode(value: i16) -> u32 {
+            ((value as u32) & 0xFFF) << 4
+        }
+    }
+
+    #[test]
+    fn test_typed_slices() {
+        let mut buf = [0u32; 40];
+        let mem = SignedMem(buf.as_mut_ptr());
+        mem.write_slice(1, &[-2048, -1, 0, 2047]);
+        let mut out = [0; 4];
+        mem.read_slice(1, &mut out);
+        assert_eq!(out, [-2048, -1, 0, 2047]);
+        assert_eq!(buf[..6], [0, 0x8000, 0xFFF0, 0, 0x7FF0, 0]);
+    }
+
+    #[test]
+    #[should_panic(expected = "Tried to access 2 entries starting at 39")]
+    fn test_typed_slice_out_of_bounds() {
+        let mut buf = [0u32; 40];
+        let mem = SignedMem(buf.as_mut_ptr());
+        let mut out = [0; 2];
+        mem.read_slice(39, &mut out);
+    }
+
+    #[cfg(feature = "fixedpoint")]
+    #[test]
+    #[allow(clippy::float_cmp)]
+    fn test_fixedpoint_slices() {
+        /// Same memory, with 8 fractional bits
+        struct FixedMem(SignedMem);
+
+        impl Memory for FixedMem {
+            type Memwidth = u32;
+            type Access = RW;
+            type Endian = LittleEndian;
+
+            fn first_entry_ptr(&self) -> *mut u32 {
+                self.0.first_entry_ptr()
+            }
+
+            fn num_entries(&self) -> usize {
+                self.0.num_entries()
+            }
+
+            fn width(&self) -> usize {
+                self.0.width()
+            }
+        }
+
+        impl TypedMemory for FixedMem {
+            type Element = FixedPoint<i16, 4, 8>;
+
+            fn decode(bits: u32) -> Self::Element {
+                FixedPoint::from_bits(SignedMem::decode(bits))
+            }
+
+            fn encode(value: Self::Element) -> u32 {
+                SignedMem::encode(value.to_bits())
+            }
+        }
+
+        let mut buf = [0u32; 40];
+        let mem = FixedMem(SignedMem(buf.as_mut_ptr()));
+        // span more than one chunk
+        let values: [f64; 38] =
+            core::array::from_fn(|i| f64::from(u8::try_from(i).unwrap()) * 0.5 - 8.0);
+        mem.write_f64(2, &values);
+        let mut out = [0.0; 38];
+        mem.read_f64(2, &mut out);
+        assert_eq!(out[..32], values[..32]);
+        // saturated to the range of the fixed-point representation
+        assert_eq!(out[32..], [7.996_093_75; 6]);
+        assert_eq!(buf[2], 0x8000);
+
+        let mut out = [0.0f32; 2];
+        mem.write_f32(0, &[0.25, -0.5]);
+        mem.read_f32(0, &mut out);
+        assert_eq!(out, [0.25, -0.5]);
+    }
+}
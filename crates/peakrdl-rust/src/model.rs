@@ -0,0 +1,579 @@
+//! Behavioral register model for host-side tests
+//!
+//! [`MockIO`][crate::io::MockIO] stores whatever is written and returns it on
+//! reads. [`ModelIO`] instead applies the software-visible behavior of each
+//! register described by its SystemRDL properties:
+//!
+//! - Registers start at their reset value.
+//! - Reads only return the software-readable bits, and clear or set the `rclr`
+//!   and `rset` fields.
+//! - Writes only change the software-writable bits, and apply the `onwrite`
+//!   side effects (`woclr`, `wot`, `wzs`, ...).
+//! - `singlepulse` fields clear themselves after each write.
+//!
+//! The behavior of each register is its [`Register::BEHAVIOR`], which the
+//! exporter generates from the field properties. Test code plays the part of the
+//! hardware through the `hw_*` methods, which read and update the stored values
+//! (including fields software can't access), and through a [`Hardware`]
+//! implementation whose hooks run on every software access.
+//!
+//! # Example
+//!
+//! ```ignore
+//! use core::cell::Cell;
+//! use peakrdl_rust::model::{Hardware, ModelIO};
+//!
+//! const SIZE: usize = Dma::<()>::SIZE;
+//!
+//! /// Completes each transfer after the status register is polled twice
+//! #[derive(Default)]
+//! struct DmaModel {
+//!     polls: Cell<u32>,
+//! }
+//!
+//! impl Hardware<SIZE> for DmaModel {
+//!     fn before_read(&self, model: &ModelIO<SIZE, Self>, addr: usize) {
+//!         if addr == Dma::<()>::STATUS_OFFSET {
+//!             self.polls.set(self.polls.get() + 1);
+//!             if self.polls.get() == 2 {
+//!                 let dma = unsafe { Dma::from_ptr_with(model.base_ptr(), model) };
+//!                 model.hw_write(&dma.status(), Status::DONE_MASK << Status::DONE_OFFSET, !0);
+//!             }
+//!         }
+//!     }
+//! }
+//!
+//! let model = ModelIO::<SIZE, _>::with_hardware(DmaModel::default());
+//! let dma = unsafe { Dma::from_ptr_with(model.base_ptr(), &model) };
+//! dma.ctrl().write(|r| r.set_start(true)); // singlepulse: reads back as 0
+//! while !dma.status().read().done() {}
+//! ```
+
+use core::{cell::RefCell, convert::Infallible};
+
+use num_traits::NumCast;
+
+use crate::{
+    access::{Read, Write},
+    io::RegisterIO,
+    reg::{Reg, RegInt, Register},
+};
+
+/// Software-visible behavior of the bits of a register.
+///
+/// Each member is a mask of the register bits with the corresponding SystemRDL
+/// property (except `reset`, which is the reset value). Bits that aren't
+/// software-writable under any of the write masks keep their value when the
+/// register is written.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Behavior {
+    /// Value of the register after reset, including fields software can't access.
+    pub reset: u128,
+    /// Software-readable bits. Other bits read as 0.
+    pub read: u128,
+    /// Bits cleared by software reads (`onread = rclr`).
+    pub rclr: u128,
+    /// Bits set by software reads (`onread = rset`).
+    pub rset: u128,
+    /// Software-writable bits that store the written value.
+    pub write: u128,
+    /// Bits cleared by writing 1 (`onwrite = woclr`).
+    pub woclr: u128,
+    /// Bits set by writing 1 (`onwrite = woset`).
+    pub woset: u128,
+    /// Bits toggled by writing 1 (`onwrite = wot`).
+    pub wot: u128,
+    /// Bits cleared by writing 0 (`onwrite = wzc`).
+    pub wzc: u128,
+    /// Bits set by writing 0 (`onwrite = wzs`).
+    pub wzs: u128,
+    /// Bits toggled by writing 0 (`onwrite = wzt`).
+    pub wzt: u128,
+    /// Bits cleared by any write (`onwrite = wclr`).
+    pub wclr: u128,
+    /// Bits set by any write (`onwrite = wset`).
+    pub wset: u128,
+    /// Bits that clear themselves after each software write (`singlepulse`).
+    pub singlepulse: u128,
+    /// Bits that [`ModelIO::hw_write`] can set but not clear (`sticky`/`stickybit`).
+    pub sticky: u128,
+    /// Counter bits that saturate at their maximum value instead of wrapping in
+    /// [`ModelIO::hw_increment`] (`incrsaturate`). A numeric saturation value
+    /// isn't modeled: the counter saturates at the maximum value of the field.
+    pub incrsaturate: u128,
+    /// Counter bits that saturate at 0 instead of wrapping in
+    /// [`ModelIO::hw_decrement`] (`decrsaturate`). A numeric saturation value
+    /// isn't modeled: the counter saturates at 0.
+    pub decrsaturate: u128,
+}
+
+impl Behavior {
+    /// No readable or writable bits, and a reset value of 0.
+    pub const NONE: Self = Self {
+        reset: 0,
+        read: 0,
+        rclr: 0,
+        rset: 0,
+        write: 0,
+        woclr: 0,
+        woset: 0,
+        wot: 0,
+        wzc: 0,
+        wzs: 0,
+        wzt: 0,
+        wclr: 0,
+        wset: 0,
+        singlepulse: 0,
+        sticky: 0,
+        incrsaturate: 0,
+        decrsaturate: 0,
+    };
+
+    /// Plain storage: every bit is readable and writable without side effects.
+    pub const STORAGE: Self = Self {
+        read: u128::MAX,
+        write: u128::MAX,
+        ..Self::NONE
+    };
+
+    /// Value stored after software writes `written` over `old`.
+    #[must_use]
+    pub const fn write(&self, old: u128, written: u128) -> u128 {
+        let changed = self.write
+            | self.woclr
+            | self.woset
+            | self.wot
+            | self.wzc
+            | self.wzs
+            | self.wzt
+            | self.wclr
+            | self.wset;
+        (old & !changed)
+            | (written & self.write)
+            | (old & !written & self.woclr)
+            | ((old | written) & self.woset)
+            | ((old ^ written) & self.wot)
+            | (old & written & self.wzc)
+            | ((old | !written) & self.wzs)
+            | ((old ^ !written) & self.wzt)
+            | self.wset
+    }
+}
+
+/// Hooks through which a test models the hardware side of the registers.
+///
+/// Both hooks do nothing by default. They can read and update the model with
+/// the `hw_*` methods, and use interior mutability (e.g., [`Cell`][core::cell::Cell])
+/// for their own state.
+pub trait Hardware<const N: usize>: Sized {
+    /// Called before software reads the register at byte offset `addr`, e.g. to
+    /// update its status fields.
+    fn before_read(&self, model: &ModelIO<N, Self>, addr: usize) {
+        let _ = (model, addr);
+    }
+
+    /// Called after software writes `value` to the register at byte offset
+    /// `addr`, once the write side effects are applied but before the
+    /// `singlepulse` fields clear.
+    fn after_write(&self, model: &ModelIO<N, Self>, addr: usize, value: u128) {
+        let _ = (model, addr, value);
+    }
+}
+
+/// No hardware activity: registers only change through software accesses.
+impl<const N: usize> Hardware<N> for () {}
+
+struct State<const N: usize> {
+    /// Value of each register, in little-endian order at its byte offset
+    data: [u8; N],
+    /// Whether the register at each byte offset has been set to its reset value
+    initialized: [bool; N],
+}
+
+/// Behavioral [`RegisterIO`] implementation.
+///
+/// Models a block of `N` bytes at address 0 (see [`ModelIO::base_ptr`]), in
+/// which each register behaves according to its [`Register::BEHAVIOR`]. A
+/// register is set to its reset value the first time it is accessed, so
+/// registers of different types must not overlap.
+///
+/// Register handles hold their I/O by value, so blocks are created with a
+/// reference to the model (e.g., `Top::from_ptr_with(model.base_ptr(), &model)`).
+/// Wide registers are accessed as a whole, regardless of their accesswidth and
+/// endianness.
+pub struct ModelIO<const N: usize, H: Hardware<N> = ()> {
+    state: RefCell<State<N>>,
+    hardware: H,
+}
+
+impl<const N: usize> ModelIO<N> {
+    /// Construct a model in its reset state, without hardware hooks.
+    #[must_use]
+    pub fn new() -> Self {
+        Self::with_hardware(())
+    }
+}
+
+impl<const N: usize> Default for ModelIO<N> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+impl<const N: usize, H: Hardware<N>> ModelIO<N, H> {
+    /// Construct a model in its reset state, calling the hooks of `hardware` on
+    /// every software access.
+    pub fn with_hardware(hardware: H) -> Self {
+        Self {
+            state: RefCell::new(State {
+                data: [0; N],
+                initialized: [false; N],
+            }),
+            hardware,
+        }
+    }
+
+    /// The hardware hooks passed to [`ModelIO::with_hardware`].
+    pub fn hardware(&self) -> &H {
+        &self.hardware
+    }
+
+    /// Get the base register address of the instance (always 0).
+    pub fn base_ptr(&self) -> *mut () {
+        core::ptr::null_mut()
+    }
+
+    /// Return every register to its reset value.
+    pub fn reset(&self) {
+        self.state.borrow_mut().initialized = [false; N];
+    }
+
+    /// Current value of a register, including the bits software can't read,
+    /// without any read side effects.
+    pub fn hw_read<R: Register, IO: RegisterIO>(&self, reg: &Reg<R, IO>) -> R::Regwidth {
+        let (addr, size) = location(reg);
+        from_u128(self.load(addr, size, R::BEHAVIOR.reset))
+    }
+
+    /// Update the bits of a register that are set in `mask` to those of `value`,
+    /// as the hardware would (regardless of software access). Sticky bits are
+    /// only set, never cleared.
+    pub fn hw_write<R: Register, IO: RegisterIO>(
+        &self,
+        reg: &Reg<R, IO>,
+        mask: R::Regwidth,
+        value: R::Regwidth,
+    ) {
+        let (addr, size) = location(reg);
+        let (mask, value) = (to_u128(mask), to_u128(value));
+        let sticky = R::BEHAVIOR.sticky;
+        let old = self.load(addr, size, R::BEHAVIOR.reset);
+        self.store(addr, size, (old & !(mask & !sticky)) | (value & mask));
+    }
+
+    /// Add `amount` to the `width`-bit counter field at bit `offset` of a
+    /// register, saturating at its maximum value if it is in the
+    /// [`Behavior::incrsaturate`] mask and wrapping otherwise.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the field doesn't fit in the register.
+    pub fn hw_increment<R: Register, IO: RegisterIO>(
+        &self,
+        reg: &Reg<R, IO>,
+        offset: usize,
+        width: usize,
+        amount: R::Regwidth,
+    ) {
+        let saturate = R::BEHAVIOR.incrsaturate;
+        self.count(reg, offset, width, saturate, |count, max, saturate| {
+            let sum = count.wrapping_add(to_u128(amount));
+            if saturate && (sum > max || sum < count) {
+                max
+            } else {
+                sum & max
+            }
+        });
+    }
+
+    /// Subtract `amount` from the `width`-bit counter field at bit `offset` of a
+    /// register, saturating at 0 if it is in the [`Behavior::decrsaturate`] mask
+    /// and wrapping otherwise.
+    ///
+    /// # Panics
+    ///
+    /// Panics if the field doesn't fit in the register.
+    pub fn hw_decrement<R: Register, IO: RegisterIO>(
+        &self,
+        reg: &Reg<R, IO>,
+        offset: usize,
+        width: usize,
+        amount: R::Regwidth,
+    ) {
+        let saturate = R::BEHAVIOR.decrsaturate;
+        self.count(reg, offset, width, saturate, |count, max, saturate| {
+            let amount = to_u128(amount);
+            if saturate && amount > count {
+                0
+            } else {
+                count.wrapping_sub(amount) & max
+            }
+        });
+    }
+
+    fn count<R: Register, IO: RegisterIO>(
+        &self,
+        reg: &Reg<R, IO>,
+        offset: usize,
+        width: usize,
+        saturate: u128,
+        f: impl FnOnce(u128, u128, bool) -> u128,
+    ) {
+        let (addr, size) = location(reg);
+        assert!(
+            width > 0 && offset + width <= 8 * size,
+            "counter field outside of the register"
+        );
+        let max = u128::MAX >> (128 - width);
+        let saturate = (saturate >> offset) & max != 0;
+        let old = self.load(addr, size, R::BEHAVIOR.reset);
+        let count = f((old >> offset) & max, max, saturate);
+        self.store(addr, size, (old & !(max << offset)) | (count << offset));
+    }
+
+    /// Stored value of the `size`-byte register at `addr`, which is first set to
+    /// `reset` if it hasn't been accessed since the last reset
+    fn load(&self, addr: usize, size: usize, reset: u128) -> u128 {
+        let mut state = self.state.borrow_mut();
+        if !state.initialized[addr] {
+            state.initialized[addr] = true;
+            drop(state);
+            self.store(addr, size, reset);
+            return reset & width_mask(size);
+        }
+        let mut bytes = [0; 16];
+        bytes[..size].copy_from_slice(&state.data[addr..addr + size]);
+        u128::from_le_bytes(bytes)
+    }
+
+    fn store(&self, addr: usize, size: usize, value: u128) {
+        let mut state = self.state.borrow_mut();
+        state.data[addr..addr + size].copy_from_slice(&value.to_le_bytes()[..size]);
+    }
+}
+
+impl<const N: usize, H: Hardware<N>> RegisterIO for ModelIO<N, H> {
+    type Error = Infallible;
+
+    unsafe fn try_read_register<R: Register>(
+        &self,
+        ptr: *const R::Regwidth,
+    ) -> Result<R, Self::Error>
+    where
+        R::Access: Read,
+    {
+        let addr = ptr.addr();
+        let size = size_of::<R::Regwidth>();
+        let behavior = &R::BEHAVIOR;
+        self.hardware.before_read(self, addr);
+        let value = self.load(addr, size, behavior.reset);
+        if behavior.rclr | behavior.rset != 0 {
+            self.store(addr, size, (value & !behavior.rclr) | behavior.rset);
+        }
+        // SAFETY: the model holds the register's value
+        Ok(unsafe { R::from_raw(from_u128(value & behavior.read)) })
+    }
+
+    unsafe fn try_write_register<R: Register>(
+        &self,
+        ptr: *mut R::Regwidth,
+        value: R,
+    ) -> Result<(), Self::Error>
+    where
+        R::Access: Write,
+    {
+        let addr = ptr.addr();
+        let size = size_of::<R::Regwidth>();
+        let behavior = &R::BEHAVIOR;
+        let written = to_u128(value.to_raw());
+        let old = self.load(addr, size, behavior.reset);
+        let new = behavior.write(old, written) & width_mask(size);
+        self.store(addr, size, new);
+        self.hardware.after_write(self, addr, written);
+        if behavior.singlepulse != 0 {
+            let pulsed = self.load(addr, size, behavior.reset);
+            self.store(addr, size, pulsed & !behavior.singlepulse);
+        }
+        Ok(())
+    }
+}
+
+/// Shares a model between the register handles of a block, which hold their
+/// I/O implementation by value.
+impl<const N: usize, H: Hardware<N>> RegisterIO for &ModelIO<N, H> {
+    type Error = Infallible;
+
+    unsafe fn try_read_register<R: Register>(
+        &self,
+        ptr: *const R::Regwidth,
+    ) -> Result<R, Self::Error>
+    where
+        R::Access: Read,
+    {
+        unsafe { (**self).try_read_register(ptr) }
+    }
+
+    unsafe fn try_write_register<R: Register>(
+        &self,
+        ptr: *mut R::Regwidth,
+        value: R,
+    ) -> Result<(), Self::Error>
+    where
+        R::Access: Write,
+    {
+        unsafe { (**self).try_write_register(ptr, value) }
+    }
+}
+
+/// Byte offset and size of a register in the model
+fn location<R: Register, IO: RegisterIO>(reg: &Reg<R, IO>) -> (usize, usize) {
+    (reg.as_ptr().addr(), size_of::<R::Regwidth>())
+}
+
+/// Mask of the bits of a `size`-byte register
+const fn width_mask(size: usize) -> u128 {
+    u128::MAX >> (128 - 8 * size)
+}
+
+fn to_u128<T: RegInt>(value: T) -> u128 {
+    value.to_u128().expect("register values are unsigned")
+}
+
+fn from_u128<T: RegInt>(value: u128) -> T {
+    <T as NumCast>::from(value).expect("value fits in the register")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::access::RW;
+    use crate::endian::LittleEndian;
+    use core::cell::Cell;
+
+    /// 16-bit register with a field of each kind
+    #[derive(Clone, Copy)]
+    struct Status(u16);
+
+    impl Register for Status {
+        type Regwidth = u16;
+        type Accesswidth = u16;
+        type Access = RW;
+        type ByteEndian = LittleEndian;
+        type WordEndian = LittleEndian;
+
+        // [1:0] rw, [2] woclr + sticky, [3] rclr, [4] singlepulse,
+        // [7:5] hw-only (reset 0b101), [11:8] saturating counter,
+        // [15:12] counter saturating when decremented
+        const BEHAVIOR: Behavior = Behavior {
+            reset: 0b101 << 5,
+            read: 0xFF1F,
+            rclr: 1 << 3,
+            write: 0b1_0011,
+            woclr: 1 << 2,
+            singlepulse: 1 << 4,
+            sticky: 1 << 2,
+            incrsaturate: 0xF << 8,
+            decrsaturate: 0xFF << 8,
+            ..Behavior::NONE
+        };
+
+        unsafe fn from_raw(val: u16) -> Self {
+            Self(val)
+        }
+
+        fn to_raw(self) -> u16 {
+            self.0
+        }
+    }
+
+    fn status<IO: RegisterIO>(io: IO) -> Reg<Status, IO> {
+        unsafe { Reg::from_ptr_with(core::ptr::without_provenance_mut(2), io) }
+    }
+
+    #[test]
+    fn test_software_access() {
+        let model: ModelIO<4> = ModelIO::new();
+        let reg = status(&model);
+        assert_eq!(model.hw_read(&reg), 0b101 << 5);
+        assert_eq!(reg.read().0, 0);
+
+        // read-only and hw-only bits ignore writes, singlepulse reads back as 0
+        reg.write_value(Status(0xFFFF));
+        assert_eq!(model.hw_read(&reg), (0b101 << 5) | 0b11);
+
+        // woclr, rclr
+        model.hw_write(&reg, 0b1100, 0b1100);
+        assert_eq!(reg.read().0, 0b1111);
+        assert_eq!(reg.read().0, 0b0111);
+        reg.write_value(Status(0b0111));
+        assert_eq!(reg.read().0, 0b0011);
+
+        model.reset();
+        assert_eq!(model.hw_read(&reg), 0b101 << 5);
+    }
+
+    #[test]
+    fn test_hardware_side() {
+        let model: ModelIO<4> = ModelIO::new();
+        let reg = status(&model);
+
+        // sticky bits aren't cleared by the hardware
+        model.hw_write(&reg, 1 << 2, !0);
+        model.hw_write(&reg, 1 << 2, 0);
+        assert_eq!(reg.read().0 & (1 << 2), 1 << 2);
+
+        model.hw_increment(&reg, 8, 4, 14);
+        model.hw_increment(&reg, 8, 4, 3);
+        assert_eq!(model.hw_read(&reg) >> 8, 0xF);
+        model.hw_decrement(&reg, 8, 4, 16);
+        assert_eq!(model.hw_read(&reg) >> 8, 0);
+        // other fields are left unchanged
+        model.hw_increment(&reg, 5, 3, 4);
+        assert_eq!(model.hw_read(&reg), (0b001 << 5) | (1 << 2));
+        // counters only saturate in the direction they're configured for
+        model.hw_increment(&reg, 12, 4, 17);
+        assert_eq!(model.hw_read(&reg) >> 12, 1);
+        model.hw_decrement(&reg, 12, 4, 2);
+        assert_eq!(model.hw_read(&reg) >> 12, 0);
+    }
+
+    #[test]
+    fn test_hooks() {
+        /// Records the singlepulse bit after each write, and sets the counter
+        /// before each read
+        #[derive(Default)]
+        struct Hooks {
+            pulse: Cell<bool>,
+        }
+
+        impl Hardware<4> for Hooks {
+            fn before_read(&self, model: &ModelIO<4, Self>, addr: usize) {
+                assert_eq!(addr, 2);
+                model.hw_write(&status(model), 0xF << 8, 0x9 << 8);
+            }
+
+            fn after_write(&self, model: &ModelIO<4, Self>, addr: usize, value: u128) {
+                assert_eq!((addr, value), (2, 1 << 4));
+                self.pulse
+                    .set(model.hw_read(&status(model)) & (1 << 4) != 0);
+            }
+        }
+
+        let model = ModelIO::<4, _>::with_hardware(Hooks::default());
+        let reg = status(&model);
+        reg.write_value(Status(1 << 4));
+        assert!(model.hardware().pulse.get());
+        assert_eq!(model.hw_read(&reg) & (1 << 4), 0);
+        assert_eq!(reg.read().0 >> 8, 0x9);
+    }
+}
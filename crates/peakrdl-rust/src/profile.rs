@@ -0,0 +1,442 @@
+//! Register access profiling
+//!
+//! [`ProfileIO`] wraps another [`RawRegisterIO`] implementation and counts every
+//! access made through it, per address and per access width. It can optionally
+//! record latency histograms using a user-provided [`Clock`]. The counters are
+//! plain relaxed atomics, so any number of threads can profile through the same
+//! instance without locking.
+//!
+//! # Example
+//!
+//! ```
+//! use peakrdl_rust::io::{MockIO, RawRegisterIO};
+//! use peakrdl_rust::profile::{AccessCounts, ProfileIO};
+//!
+//! let io: ProfileIO<MockIO<16>> = ProfileIO::new(MockIO::new_zeroed());
+//! let reg0 = io.inner().base_ptr().cast::<u32>();
+//! let reg1 = reg0.wrapping_add(1);
+//! unsafe {
+//!     io.try_write(reg1, 1).unwrap();
+//!     io.try_read(reg1).unwrap();
+//!     io.try_read(reg0).unwrap();
+//! }
+//!
+//! let mut report = [AccessCounts::default(); 4];
+//! let hottest = io.hottest(&mut report);
+//! assert_eq!(hottest.len(), 2);
+//! assert_eq!(hottest[0].address, 4);
+//! assert_eq!(hottest[0].total(), 2);
+//! ```
+
+use core::sync::atomic::{AtomicUsize, Ordering};
+
+use crate::{io::RawRegisterIO, reg::RegInt};
+
+/// Number of access widths tracked per address (8, 16, 32, 64, and 128 bits).
+pub const NUM_WIDTHS: usize = 5;
+
+/// Number of buckets in a latency histogram.
+///
+/// Bucket `i` counts accesses whose latency `t` satisfies `2^(i-1) <= t < 2^i`
+/// (bucket 0 counts zero-tick accesses). The last bucket also counts all
+/// longer accesses.
+pub const NUM_BUCKETS: usize = 32;
+
+/// Marker for an unused address slot.
+const EMPTY: usize = usize::MAX;
+
+/// Source of timestamps used to measure access latency.
+pub trait Clock {
+    /// Whether latencies are measured at all. If `false`, [`Clock::now`] is never
+    /// called and no latency histograms are recorded.
+    const ENABLED: bool = true;
+
+    /// Current timestamp in arbitrary monotonic ticks (e.g., CPU cycles).
+    fn now(&self) -> u64;
+}
+
+/// [`Clock`] that disables latency measurement.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct NoClock;
+
+impl Clock for NoClock {
+    const ENABLED: bool = false;
+
+    fn now(&self) -> u64 {
+        0
+    }
+}
+
+impl<F: Fn() -> u64> Clock for F {
+    fn now(&self) -> u64 {
+        self()
+    }
+}
+
+/// Access counts for a single address.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct AccessCounts {
+    /// Address of the access (as seen by the wrapped I/O).
+    pub address: usize,
+    /// Number of reads, indexed by width (index `i` is `8 << i` bits).
+    pub reads: [usize; NUM_WIDTHS],
+    /// Number of writes, indexed by width (index `i` is `8 << i` bits).
+    pub writes: [usize; NUM_WIDTHS],
+}
+
+impl AccessCounts {
+    /// Total number of reads of any width.
+    #[must_use]
+    pub fn total_reads(&self) -> usize {
+        self.reads.iter().sum()
+    }
+
+    /// Total number of writes of any width.
+    #[must_use]
+    pub fn total_writes(&self) -> usize {
+        self.writes.iter().sum()
+    }
+
+    /// Total number of accesses of any width.
+    #[must_use]
+    pub fn total(&self) -> usize {
+        self.total_reads() + self.total_writes()
+    }
+}
+
+struct Slot {
+    address: AtomicUsize,
+    reads: [AtomicUsize; NUM_WIDTHS],
+    writes: [AtomicUsize; NUM_WIDTHS],
+}
+
+impl Slot {
+    const fn new() -> Self {
+        Self {
+            address: AtomicUsize::new(EMPTY),
+            reads: [const { AtomicUsize::new(0) }; NUM_WIDTHS],
+            writes: [const { AtomicUsize::new(0) }; NUM_WIDTHS],
+        }
+    }
+}
+
+/// Profiling [`RawRegisterIO`] adapter.
+///
+/// Each access is forwarded to the wrapped I/O and counted in a fixed-size,
+/// open-addressed table of `N` addresses. Accesses to new addresses once the
+/// table is full are not attributed to an address, but are still counted by
+/// [`ProfileIO::dropped`]. Multi-word block transfers are counted as a single
+/// access to the first address, with the width of the whole block.
+///
+/// If a [`Clock`] is provided, the latency of every access is also
+/// accumulated into log2 histograms for reads and writes.
+///
+/// All counters use relaxed atomic increments, so the adapter can be shared
+/// between threads without locks. Counters wrap on overflow.
+pub struct ProfileIO<IO, C: Clock = NoClock, const N: usize = 64> {
+    io: IO,
+    clock: C,
+    slots: [Slot; N],
+    dropped: AtomicUsize,
+    read_latency: [AtomicUsize; NUM_BUCKETS],
+    write_latency: [AtomicUsize; NUM_BUCKETS],
+}
+
+impl<IO, const N: usize> ProfileIO<IO, NoClock, N> {
+    /// Wrap an I/O implementation, counting accesses without measuring latency.
+    #[must_use]
+    pub const fn new(io: IO) -> Self {
+        Self::with_clock(io, NoClock)
+    }
+}
+
+impl<IO, C: Clock, const N: usize> ProfileIO<IO, C, N> {
+    /// Wrap an I/O implementation, counting accesses and measuring their
+    /// latency using the provided clock.
+    #[must_use]
+    pub const fn with_clock(io: IO, clock: C) -> Self {
+        Self {
+            io,
+            clock,
+            slots: [const { Slot::new() }; N],
+            dropped: AtomicUsize::new(0),
+            read_latency: [const { AtomicUsize::new(0) }; NUM_BUCKETS],
+            write_latency: [const { AtomicUsize::new(0) }; NUM_BUCKETS],
+        }
+    }
+
+    /// The wrapped I/O implementation.
+    pub const fn inner(&self) -> &IO {
+        &self.io
+    }
+
+    /// Unwrap the inner I/O implementation, discarding all counts.
+    pub fn into_inner(self) -> IO {
+        self.io
+    }
+
+    /// Iterate over the access counts of every address accessed so far.
+    pub fn counts(&self) -> impl Iterator<Item = AccessCounts> + '_ {
+        self.slots.iter().filter_map(|slot| {
+            let address = slot.address.load(Ordering::Relaxed);
+            (address != EMPTY).then(|| AccessCounts {
+                address,
+                reads: core::array::from_fn(|i| slot.reads[i].load(Ordering::Relaxed)),
+                writes: core::array::from_fn(|i| slot.writes[i].load(Ordering::Relaxed)),
+            })
+        })
+    }
+
+    /// Fill `out` with the most frequently accessed addresses, in descending
+    /// order of total accesses.
+    ///
+    /// Returns the filled portion of `out`, which is shorter than `out` if
+    /// fewer addresses have been accessed.
+    pub fn hottest<'a>(&self, out: &'a mut [AccessCounts]) -> &'a [AccessCounts] {
+        let mut len = 0;
+        for counts in self.counts() {
+            // insertion into the sorted prefix, dropping the coldest entry if full
+            let total = counts.total();
+            let pos = out[..len]
+                .iter()
+                .position(|c| c.total() < total)
+                .unwrap_or(len);
+            if pos == out.len() {
+                continue;
+            }
+            if len < out.len() {
+                len += 1;
+            }
+            out[pos..len].rotate_right(1);
+            out[pos] = counts;
+        }
+        &out[..len]
+    }
+
+    /// Number of accesses that could not be attributed to an address because
+    /// the address table was full.
+    pub fn dropped(&self) -> usize {
+        self.dropped.load(Ordering::Relaxed)
+    }
+
+    /// Latency histogram of all reads. See [`NUM_BUCKETS`] for the bucket ranges.
+    pub fn read_latency(&self) -> [usize; NUM_BUCKETS] {
+        core::array::from_fn(|i| self.read_latency[i].load(Ordering::Relaxed))
+    }
+
+    /// Latency histogram of all writes. See [`NUM_BUCKETS`] for the bucket ranges.
+    pub fn write_latency(&self) -> [usize; NUM_BUCKETS] {
+        core::array::from_fn(|i| self.write_latency[i].load(Ordering::Relaxed))
+    }
+
+    /// Clear all counts and histograms.
+    ///
+    /// Accesses made concurrently with a reset may be partially counted.
+    pub fn reset(&self) {
+        for slot in &self.slots {
+            slot.address.store(EMPTY, Ordering::Relaxed);
+            for count in slot.reads.iter().chain(&slot.writes) {
+                count.store(0, Ordering::Relaxed);
+            }
+        }
+        self.dropped.store(0, Ordering::Relaxed);
+        for count in self.read_latency.iter().chain(&self.write_latency) {
+            count.store(0, Ordering::Relaxed);
+        }
+    }
+
+    /// Find (or claim) the table slot for an address.
+    fn slot(&self, address: usize) -> Option<&Slot> {
+        if N == 0 {
+            return None;
+        }
+        // Fibonacci hashing, ignoring the low bits that are usually zero
+        let start = (address >> 2).wrapping_mul(0x9E37_79B9) % N;
+        for i in 0..N {
+            let slot = &self.slots[(start + i) % N];
+            match slot.address.load(Ordering::Relaxed) {
+                a if a == address => return Some(slot),
+                EMPTY => match slot.address.compare_exchange(
+                    EMPTY,
+                    address,
+                    Ordering::Relaxed,
+                    Ordering::Relaxed,
+                ) {
+                    Ok(_) => return Some(slot),
+                    // another thread claimed this slot for the same address
+                    Err(a) if a == address => return Some(slot),
+                    Err(_) => {}
+                },
+                _ => {}
+            }
+        }
+        None
+    }
+
+    fn count(&self, address: usize, bytes: usize, write: bool) {
+        let Some(slot) = self.slot(address) else {
+            self.dropped.fetch_add(1, Ordering::Relaxed);
+            return;
+        };
+        let width = (bytes.trailing_zeros() as usize).min(NUM_WIDTHS - 1);
+        let counts = if write { &slot.writes } else { &slot.reads };
+        counts[width].fetch_add(1, Ordering::Relaxed);
+    }
+
+    #[inline]
+    fn start(&self) -> u64 {
+        if C::ENABLED { self.clock.now() } else { 0 }
+    }
+
+    #[inline]
+    fn finish(&self, start: u64, write: bool) {
+        if C::ENABLED {
+            let ticks = self.clock.now().wrapping_sub(start);
+            let bucket = ((u64::BITS - ticks.leading_zeros()) as usize).min(NUM_BUCKETS - 1);
+            let histogram = if write {
+                &self.write_latency
+            } else {
+                &self.read_latency
+            };
+            histogram[bucket].fetch_add(1, Ordering::Relaxed);
+        }
+    }
+}
+
+impl<IO: RawRegisterIO, C: Clock, const N: usize> RawRegisterIO for ProfileIO<IO, C, N> {
+    type Error = IO::Error;
+
+    #[inline]
+    unsafe fn try_read<T: RegInt>(&self, ptr: *const T) -> Result<T, Self::Error> {
+        let start = self.start();
+        let result = unsafe { self.io.try_read(ptr) };
+        self.finish(start, false);
+        self.count(ptr.addr(), core::mem::size_of::<T>(), false);
+        result
+    }
+
+    #[inline]
+    unsafe fn try_write<T: RegInt>(&self, ptr: *mut T, value: T) -> Result<(), Self::Error> {
+        let start = self.start();
+        let result = unsafe { self.io.try_write(ptr, value) };
+        self.finish(start, true);
+        self.count(ptr.addr(), core::mem::size_of::<T>(), true);
+        result
+    }
+
+    #[inline]
+    unsafe fn try_read_block<T: RegInt>(
+        &self,
+        ptr: *const T,
+        buf: &mut [T],
+    ) -> Result<(), Self::Error> {
+        let start = self.start();
+        let result = unsafe { self.io.try_read_block(ptr, buf) };
+        self.finish(start, false);
+        self.count(ptr.addr(), core::mem::size_of_val(buf), false);
+        result
+    }
+
+    #[inline]
+    unsafe fn try_write_block<T: RegInt>(&self, ptr: *mut T, buf: &[T]) -> Result<(), Self::Error> {
+        let start = self.start();
+        let result = unsafe { self.io.try_write_block(ptr, buf) };
+        self.finish(start, true);
+        self.count(ptr.addr(), core::mem::size_of_val(buf), true);
+        result
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use core::cell::Cell;
+
+    use super::*;
+    use crate::io::MockIO;
+
+    #[test]
+    fn test_counts() {
+        let io: ProfileIO<MockIO<32>> = ProfileIO::new(MockIO::new_zeroed());
+        let base = io.inner().base_ptr();
+        unsafe {
+            io.try_write(base.wrapping_byte_add(8).cast::<u32>(), 1)
+                .unwrap();
+            io.try_read(base.wrapping_byte_add(8).cast::<u32>())
+                .unwrap();
+            io.try_read(base.wrapping_byte_add(8).cast::<u16>())
+                .unwrap();
+            io.try_read(base.wrapping_byte_add(16).cast::<u64>())
+                .unwrap();
+            let mut buf = [0_u32; 4];
+            io.try_read_block(base.wrapping_byte_add(16).cast::<u32>(), &mut buf)
+                .unwrap();
+        }
+
+        let mut report = [AccessCounts::default(); 4];
+        let hottest = io.hottest(&mut report);
+        assert_eq!(hottest.len(), 2);
+        assert_eq!(hottest[0].address, 8);
+        assert_eq!(hottest[0].reads, [0, 1, 1, 0, 0]);
+        assert_eq!(hottest[0].writes, [0, 0, 1, 0, 0]);
+        assert_eq!(hottest[1].address, 16);
+        assert_eq!(hottest[1].reads, [0, 0, 0, 1, 1]);
+        assert_eq!(io.dropped(), 0);
+
+        io.reset();
+        assert_eq!(io.counts().count(), 0);
+    }
+
+    #[test]
+    fn test_hottest_truncated() {
+        let io: ProfileIO<MockIO<16>> = ProfileIO::new(MockIO::new_zeroed());
+        let base = io.inner().base_ptr();
+        for (addr, n) in [(0, 1), (1, 3), (2, 2), (3, 4)] {
+            for _ in 0..n {
+                unsafe {
+                    io.try_read(base.wrapping_byte_add(addr).cast::<u8>())
+                        .unwrap()
+                };
+            }
+        }
+        let mut report = [AccessCounts::default(); 2];
+        let hottest = io.hottest(&mut report);
+        assert_eq!(hottest.len(), 2);
+        assert_eq!((hottest[0].address, hottest[0].total()), (3, 4));
+        assert_eq!((hottest[1].address, hottest[1].total()), (1, 3));
+    }
+
+    #[test]
+    fn test_table_full() {
+        let io: ProfileIO<MockIO<16>, NoClock, 2> = ProfileIO::new(MockIO::new_zeroed());
+        let base = io.inner().base_ptr();
+        for addr in 0..4 {
+            unsafe {
+                io.try_read(base.wrapping_byte_add(addr).cast::<u8>())
+                    .unwrap()
+            };
+        }
+        assert_eq!(io.counts().count(), 2);
+        assert_eq!(io.dropped(), 2);
+    }
+
+    #[test]
+    fn test_latency() {
+        // each clock read advances time by 5 ticks
+        let time = Cell::new(0);
+        let clock = || {
+            time.set(time.get() + 5);
+            time.get()
+        };
+        let io = ProfileIO::<_, _, 4>::with_clock(MockIO::<16>::new_zeroed(), clock);
+        let ptr = io.inner().base_ptr().cast::<u32>();
+        unsafe {
+            io.try_write(ptr, 1).unwrap();
+            io.try_read(ptr).unwrap();
+            io.try_read(ptr).unwrap();
+        }
+        // 5 ticks per access falls in bucket 3 (4 <= t < 8)
+        assert_eq!(io.read_latency()[3], 2);
+        assert_eq!(io.write_latency()[3], 1);
+        assert_eq!(io.read_latency().iter().sum::<usize>(), 2);
+    }
+}
@@ -7,6 +7,9 @@ use crate::{
     access::{Access, Read, Write},
     endian::Endian,
     io::{PtrIO, RegisterIO},
+    lock::StripeLock,
+    model::Behavior,
+    wait::{Backoff, Timeout, WaitError},
 };
 use num_traits::{
     AsPrimitive, FromBytes, PrimInt, ToBytes, WrappingAdd, WrappingSub, identities::ConstZero,
@@ -49,6 +52,9 @@ pub trait Register: Copy {
     type ByteEndian: Endian;
     /// Ordering of accesswidth subwords within the register.
     type WordEndian: Endian;
+    /// Software-visible behavior of the register's bits, used by
+    /// [`ModelIO`][crate::model::ModelIO]. Defaults to plain storage.
+    const BEHAVIOR: Behavior = Behavior::STORAGE;
 
     /// Convert a raw bit value into a Register instance.
     ///
@@ -62,6 +68,38 @@ pub trait Register: Copy {
     fn to_raw(self) -> Self::Regwidth;
 }
 
+/// Name and bit position of a register field, used by [`debug_fields`].
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct FieldInfo<T> {
+    pub name: &'static str,
+    /// Bit offset of the field's least significant bit
+    pub offset: usize,
+    /// Mask of the field's bits, after shifting the field down by `offset`
+    pub mask: T,
+}
+
+/// Format a register value as a struct containing the raw value of each field.
+///
+/// Registers generated with table-driven `Debug` implementations call this with
+/// a static table of their readable fields, so the formatting code is shared by
+/// all registers of the same width instead of being generated for each one.
+///
+/// # Errors
+///
+/// Returns an error if writing to the formatter fails.
+pub fn debug_fields<T: RegInt>(
+    f: &mut core::fmt::Formatter<'_>,
+    name: &str,
+    value: T,
+    fields: &[FieldInfo<T>],
+) -> core::fmt::Result {
+    let mut s = f.debug_struct(name);
+    for field in fields {
+        s.field(field.name, &((value >> field.offset) & field.mask));
+    }
+    s.finish()
+}
+
 /// Register abstraction used to read, write, and modify register values.
 ///
 /// This is generic over both the [`Register`] to access and the [`RegisterIO`] type
@@ -73,47 +111,39 @@ pub trait Register: Copy {
 ///
 /// [`RegisterIO`] defaults to regular volatile pointer
 /// I/O and is only needed for advanced use cases like tunneled registers.
-#[derive(Debug, PartialEq, Eq)]
-pub struct Reg<'io, R: Register, IO: RegisterIO = PtrIO> {
+///
+/// The I/O implementation is held by value, so a `Reg` using a zero-sized I/O
+/// type like [`PtrIO`] is the size of a pointer. Stateful I/O implementations
+/// are shared by passing a reference (`&IO` implements [`RegisterIO`] for every
+/// [`RawRegisterIO`](crate::io::RawRegisterIO) implementation).
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Reg<R: Register, IO: RegisterIO = PtrIO> {
     ptr: *mut R::Regwidth,
-    io: &'io IO,
-}
-
-// manually implemented to ease generic bounds (IO does not need to be Copy)
-impl<R: Register, IO: RegisterIO> Copy for Reg<'_, R, IO> where R::Regwidth: Copy {}
-
-// manually implemented to ease generic bounds (IO does not need to be Clone)
-impl<R: Register, IO: RegisterIO> Clone for Reg<'_, R, IO>
-where
-    R::Regwidth: Clone,
-{
-    fn clone(&self) -> Self {
-        *self
-    }
+    io: IO,
 }
 
-unsafe impl<R: Register, IO: RegisterIO + Sync> Send for Reg<'_, R, IO> {}
-unsafe impl<R: Register, IO: RegisterIO + Sync> Sync for Reg<'_, R, IO> {}
+unsafe impl<R: Register, IO: RegisterIO + Send> Send for Reg<R, IO> {}
+unsafe impl<R: Register, IO: RegisterIO + Sync> Sync for Reg<R, IO> {}
 
 // pointer conversion functions
-impl<R: Register> Reg<'static, R, PtrIO> {
+impl<R: Register> Reg<R, PtrIO> {
     /// # Safety
     ///
     /// The caller must guarantee that the provided address points to a
     /// hardware register of type `R`.
     #[inline(always)]
     pub const unsafe fn from_ptr(ptr: *mut R::Regwidth) -> Self {
-        Self { ptr, io: &PtrIO }
+        Self { ptr, io: PtrIO }
     }
 }
 
-impl<'io, R: Register, IO: RegisterIO> Reg<'io, R, IO> {
+impl<R: Register, IO: RegisterIO> Reg<R, IO> {
     /// # Safety
     ///
     /// The caller must guarantee that the provided address points to a
     /// hardware register of type `R`.
     #[inline(always)]
-    pub const unsafe fn from_ptr_with(ptr: *mut R::Regwidth, io: &'io IO) -> Self {
+    pub const unsafe fn from_ptr_with(ptr: *mut R::Regwidth, io: IO) -> Self {
         Self { ptr, io }
     }
 
@@ -125,7 +155,7 @@ impl<'io, R: Register, IO: RegisterIO> Reg<'io, R, IO> {
 }
 
 // read access
-impl<R: Register, IO: RegisterIO> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO> Reg<R, IO>
 where
     R::Access: Read,
 {
@@ -148,7 +178,7 @@ where
     }
 }
 
-impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
 where
     R::Access: Read,
 {
@@ -171,8 +201,124 @@ where
     }
 }
 
+// polling
+impl<R: Register, IO: RegisterIO> Reg<R, IO>
+where
+    R::Access: Read,
+{
+    /// Try to poll a register until its value satisfies a condition.
+    ///
+    /// After each poll where `f` returns `false`, `backoff` decides how long to
+    /// wait before the next poll, or whether to give up. Returns the register
+    /// value that satisfied the condition.
+    ///
+    /// # Example
+    ///
+    /// ```ignore
+    /// let status = registers.status().try_wait_until(|s| s.ready(), SpinBackoff::default())?;
+    /// ```
+    #[inline(always)]
+    #[allow(clippy::missing_errors_doc)]
+    pub fn try_wait_until(
+        &self,
+        mut f: impl FnMut(R) -> bool,
+        mut backoff: impl Backoff,
+    ) -> Result<R, WaitError<IO::Error>> {
+        loop {
+            let val = self.try_read().map_err(WaitError::Io)?;
+            if f(val) {
+                return Ok(val);
+            }
+            if !backoff.wait() {
+                return Err(WaitError::Timeout);
+            }
+        }
+    }
+
+    /// Try to poll a register until `(raw_value & mask) == value`.
+    ///
+    /// Unlike [`Reg::try_wait_until`], the condition is checked on the raw
+    /// register value, so each poll is a single read and compare. The mask and
+    /// value are typically built from the register's generated field constants.
+    ///
+    /// # Example
+    ///
+    /// ```ignore
+    /// // wait for status.ready == 1 and status.error == 0
+    /// const MASK: u32 = (Status::READY_MASK << Status::READY_OFFSET)
+    ///     | (Status::ERROR_MASK << Status::ERROR_OFFSET);
+    /// const VALUE: u32 = 1 << Status::READY_OFFSET;
+    /// registers.status().try_wait_for_bits(MASK, VALUE, SpinBackoff::default())?;
+    /// ```
+    #[inline(always)]
+    #[allow(clippy::missing_errors_doc)]
+    pub fn try_wait_for_bits(
+        &self,
+        mask: R::Regwidth,
+        value: R::Regwidth,
+        backoff: impl Backoff,
+    ) -> Result<R, WaitError<IO::Error>> {
+        self.try_wait_until(|val| val.to_raw() & mask == value, backoff)
+    }
+}
+
+impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
+where
+    R::Access: Read,
+{
+    /// Poll a register until its value satisfies a condition.
+    ///
+    /// After each poll where `f` returns `false`, `backoff` decides how long to
+    /// wait before the next poll, or whether to give up. Returns the register
+    /// value that satisfied the condition.
+    ///
+    /// # Example
+    ///
+    /// ```ignore
+    /// let status = registers.status().wait_until(|s| s.ready(), SpinBackoff::default())?;
+    /// ```
+    #[inline(always)]
+    #[allow(clippy::missing_errors_doc)]
+    pub fn wait_until(
+        &self,
+        f: impl FnMut(R) -> bool,
+        backoff: impl Backoff,
+    ) -> Result<R, Timeout> {
+        self.try_wait_until(f, backoff).map_err(|e| match e {
+            WaitError::Timeout => Timeout,
+            WaitError::Io(e) => match e {},
+        })
+    }
+
+    /// Poll a register until `(raw_value & mask) == value`.
+    ///
+    /// Unlike [`Reg::wait_until`], the condition is checked on the raw
+    /// register value, so each poll is a single read and compare. The mask and
+    /// value are typically built from the register's generated field constants.
+    ///
+    /// # Example
+    ///
+    /// ```ignore
+    /// // wait for status.ready == 1 and status.error == 0
+    /// const MASK: u32 = (Status::READY_MASK << Status::READY_OFFSET)
+    ///     | (Status::ERROR_MASK << Status::ERROR_OFFSET);
+    /// const VALUE: u32 = 1 << Status::READY_OFFSET;
+    /// registers.status().wait_for_bits(MASK, VALUE, SpinBackoff::default())?;
+    /// ```
+    #[inline(always)]
+    #[allow(clippy::missing_errors_doc)]
+    pub fn wait_for_bits(
+        &self,
+        mask: R::Regwidth,
+        value: R::Regwidth,
+        backoff: impl Backoff,
+    ) -> Result<R, Timeout> {
+        self.wait_until(|val| val.to_raw() & mask == value, backoff)
+    }
+}
+
 // write access
-impl<R: Register, IO: RegisterIO> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO> Reg<R, IO>
 where
     R::Access: Write,
 {
@@ -197,7 +343,7 @@ where
     }
 }
 
-impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
 where
     R::Access: Write,
 {
@@ -221,7 +367,7 @@ where
     }
 }
 
-impl<R: Default + Register, IO: RegisterIO> Reg<'_, R, IO>
+impl<R: Default + Register, IO: RegisterIO> Reg<R, IO>
 where
     R::Access: Write,
 {
@@ -250,7 +396,7 @@ where
     }
 }
 
-impl<R: Default + Register, IO: RegisterIO<Error = Infallible>> Reg<'_, R, IO>
+impl<R: Default + Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
 where
     R::Access: Write,
 {
@@ -276,7 +422,7 @@ where
 }
 
 // read/write access
-impl<R: Register, IO: RegisterIO> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO> Reg<R, IO>
 where
     R::Access: Read + Write,
 {
@@ -308,7 +454,7 @@ where
     }
 }
 
-impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<'_, R, IO>
+impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
 where
     R::Access: Read + Write,
 {
@@ -336,6 +482,48 @@ where
     }
 }
 
+impl<R: Register, IO: RegisterIO> Reg<R, IO>
+where
+    R::Access: Read + Write,
+{
+    /// Try to modify a register while holding its lock from `locks`.
+    ///
+    /// Like [`Reg::try_modify`], but the read-modify-write can't interleave with
+    /// another `try_modify_locked`/`modify_locked` of the same register using
+    /// the same lock table. See the [`lock`](crate::lock) module.
+    #[inline(always)]
+    #[allow(clippy::missing_errors_doc)]
+    pub fn try_modify_locked<T>(
+        &self,
+        locks: &impl StripeLock,
+        f: impl FnOnce(&mut R) -> T,
+    ) -> Result<T, IO::Error> {
+        locks.with_lock(self.ptr.addr(), || self.try_modify(f))
+    }
+}
+
+impl<R: Register, IO: RegisterIO<Error = Infallible>> Reg<R, IO>
+where
+    R::Access: Read + Write,
+{
+    /// Modify a register while holding its lock from `locks`.
+    ///
+    /// Like [`Reg::modify`], but the read-modify-write can't interleave with
+    /// another `try_modify_locked`/`modify_locked` of the same register using
+    /// the same lock table. See the [`lock`](crate::lock) module.
+    ///
+    /// # Example
+    ///
+    /// ```ignore
+    /// static LOCKS: SpinStripes<64> = SpinStripes::new();
+    /// registers.regfile().register1().modify_locked(&LOCKS, |r| r.set_field1(true));
+    /// ```
+    #[inline(always)]
+    pub fn modify_locked<T>(&self, locks: &impl StripeLock, f: impl FnOnce(&mut R) -> T) -> T {
+        self.try_modify_locked(locks, f).unwrap_infallible()
+    }
+}
+
 trait UnwrapInfallible {
     type T;
 
@@ -352,3 +540,43 @@ impl<T> UnwrapInfallible for Result<T, Infallible> {
         }
     }
 }
+
+#[cfg(test)]
+mod tests {
+    extern crate std;
+
+    use super::*;
+    use std::format;
+
+    struct Fields(u16);
+
+    impl core::fmt::Debug for Fields {
+        fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+            const FIELDS: &[FieldInfo<u16>] = &[
+                FieldInfo {
+                    name: "lo",
+                    offset: 0,
+                    mask: 0xF,
+                },
+                FieldInfo {
+                    name: "hi",
+                    offset: 8,
+                    mask: 0xFF,
+                },
+            ];
+            debug_fields(f, "Fields", self.0, FIELDS)
+        }
+    }
+
+    #[test]
+    fn test_debug_fields() {
+        assert_eq!(
+            format!("{:?}", Fields(0xA5_3C)),
+            "Fields { lo: 12, hi: 165 }"
+        );
+        assert_eq!(
+            format!("{:x?}", Fields(0xA5_3C)),
+            "Fields { lo: c, hi: a5 }"
+        );
+    }
+}
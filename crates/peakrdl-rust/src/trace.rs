@@ -0,0 +1,680 @@
+//! Recording and replaying register accesses
+//!
+//! [`RecordIO`] wraps another [`RawRegisterIO`] implementation and streams every
+//! access made through it (address, width, direction, and value) to a
+//! [`TraceSink`] in a compact binary format. [`ReplayIO`] serves the reads of a
+//! recorded trace and checks that every write matches it, without accessing any
+//! memory. A firmware run recorded on hardware (or in a slow simulation) can then
+//! be replayed deterministically, and much faster, on the host.
+//!
+//! # Trace format
+//!
+//! A trace starts with the 4 bytes of [`MAGIC`] and the [`VERSION`] byte,
+//! followed by one record per access:
+//!
+//! - A header byte: bit 0 is set for writes, and bits 3:1 hold the base-2
+//!   logarithm of the access width in bytes.
+//! - The difference between the address and the address of the previous access
+//!   (or 0 for the first one), as a zigzag-encoded LEB128 varint.
+//! - The value, as a LEB128 varint. This is the value passed to
+//!   [`RawRegisterIO`], in the register's native endianness.
+//!
+//! A run of identical accesses (e.g., polling a status register that doesn't
+//! change) is stored as the first access followed by a `0x80` header byte and
+//! the number of repetitions as a LEB128 varint.
+//!
+//! # Example
+//!
+//! ```
+//! use core::cell::RefCell;
+//! use peakrdl_rust::io::{MockIO, RawRegisterIO};
+//! use peakrdl_rust::trace::{RecordIO, ReplayIO};
+//!
+//! let io = RecordIO::new(MockIO::<16>::new_zeroed(), RefCell::new(Vec::new()));
+//! let reg = io.inner().base_ptr().cast::<u32>();
+//! unsafe {
+//!     io.try_write(reg, 7).unwrap();
+//!     io.try_read(reg).unwrap();
+//! }
+//! let trace = io.finish().into_inner();
+//!
+//! let replay = ReplayIO::new(&trace).unwrap();
+//! unsafe {
+//!     replay.try_write(reg, 7).unwrap();
+//!     assert_eq!(replay.try_read(reg).unwrap(), 7);
+//! }
+//! assert!(replay.is_finished());
+//! ```
+
+use core::cell::{Cell, RefCell};
+use core::convert::Infallible;
+use core::mem::ManuallyDrop;
+use core::ptr;
+
+use crate::{io::RawRegisterIO, reg::RegInt};
+
+/// First bytes of every trace.
+pub const MAGIC: [u8; 4] = *b"RDLT";
+
+/// Version of the trace format, stored after [`MAGIC`].
+pub const VERSION: u8 = 1;
+
+/// Header bit set for writes
+const WRITE: u8 = 0x01;
+
+/// Header byte of a record repeating the previous access
+const REPEAT: u8 = 0x80;
+
+/// Longest encoding of a repeat record followed by an access record
+const MAX_RECORDS_LEN: usize = (1 + 10) + (1 + 10 + 19);
+
+/// A single register access.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Access {
+    /// Address of the access (as seen by the wrapped I/O).
+    pub address: usize,
+    /// Width of the access in bytes (1, 2, 4, 8, or 16).
+    pub width: usize,
+    /// `true` for writes, `false` for reads.
+    pub write: bool,
+    /// Value read or written, in the register's native endianness.
+    pub value: u128,
+}
+
+impl Access {
+    fn new<T: RegInt>(address: usize, write: bool, value: T) -> Self {
+        Self {
+            address,
+            width: size_of::<T>(),
+            write,
+            value: to_bits(value),
+        }
+    }
+
+    /// Append the encoding of this access to `buf`, returning the encoded length.
+    fn encode(&self, previous: usize, buf: &mut [u8]) -> usize {
+        #[allow(clippy::cast_possible_truncation)]
+        let log2_width = self.width.trailing_zeros() as u8;
+        buf[0] = (log2_width << 1) | if self.write { WRITE } else { 0 };
+        #[allow(clippy::cast_possible_wrap)]
+        let delta = self.address.wrapping_sub(previous) as isize as i64;
+        #[allow(clippy::cast_sign_loss)]
+        let zigzag = ((delta << 1) ^ (delta >> 63)) as u64;
+        let len = 1 + encode_varint(u128::from(zigzag), &mut buf[1..]);
+        len + encode_varint(self.value, &mut buf[len..])
+    }
+}
+
+impl core::fmt::Display for Access {
+    fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+        let bits = 8 * self.width;
+        if self.write {
+            write!(
+                f,
+                "{bits}-bit write of {:#x} to {:#x}",
+                self.value, self.address
+            )
+        } else {
+            write!(f, "{bits}-bit read of {:#x}", self.address)
+        }
+    }
+}
+
+/// Error reading a trace.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum TraceError {
+    /// The trace doesn't start with [`MAGIC`].
+    BadMagic,
+    /// The trace was written in another version of the format.
+    UnsupportedVersion(u8),
+    /// The record at this byte offset is truncated or invalid.
+    Corrupt { offset: usize },
+}
+
+impl core::fmt::Display for TraceError {
+    fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+        match self {
+            Self::BadMagic => write!(f, "not a register access trace"),
+            Self::UnsupportedVersion(version) => {
+                write!(f, "unsupported trace format version {version}")
+            }
+            Self::Corrupt { offset } => write!(f, "corrupt trace record at byte {offset}"),
+        }
+    }
+}
+
+impl core::error::Error for TraceError {}
+
+/// Destination of a trace.
+pub trait TraceSink {
+    /// Append the encoding of one or more records to the trace.
+    fn append(&self, bytes: &[u8]);
+}
+
+/// Appends to a growable buffer, e.g. a `Vec<u8>` or a `heapless::Vec<u8, N>`
+/// (which panics once full).
+impl<S: for<'a> Extend<&'a u8>> TraceSink for RefCell<S> {
+    #[inline]
+    fn append(&self, bytes: &[u8]) {
+        self.borrow_mut().extend(bytes);
+    }
+}
+
+impl<S: TraceSink + ?Sized> TraceSink for &S {
+    #[inline]
+    fn append(&self, bytes: &[u8]) {
+        (**self).append(bytes);
+    }
+}
+
+/// Recording [`RawRegisterIO`] adapter.
+///
+/// Each access is forwarded to the wrapped I/O, and then appended to the trace
+/// if it succeeded. Block transfers are forwarded as a whole, and recorded as one
+/// access per word.
+///
+/// A run of identical accesses is only written to the sink once it ends, or when
+/// the trace is flushed by [`RecordIO::flush`], [`RecordIO::finish`], or dropping
+/// the `RecordIO`. Use `finish` (or a sink borrowed by the `RecordIO`, such as a
+/// `&RefCell<Vec<u8>>`) to get at the complete trace.
+pub struct RecordIO<IO, S: TraceSink> {
+    io: IO,
+    sink: S,
+    /// Previous access, or `None` at the start of the trace
+    last: Cell<Option<Access>>,
+    /// Number of times `last` was repeated since it was written to the sink
+    repeats: Cell<u64>,
+}
+
+impl<IO, S: TraceSink> RecordIO<IO, S> {
+    /// Wrap an I/O implementation, writing the trace header to `sink`.
+    pub fn new(io: IO, sink: S) -> Self {
+        sink.append(&MAGIC);
+        sink.append(&[VERSION]);
+        Self {
+            io,
+            sink,
+            last: Cell::new(None),
+            repeats: Cell::new(0),
+        }
+    }
+
+    /// The wrapped I/O implementation.
+    pub const fn inner(&self) -> &IO {
+        &self.io
+    }
+
+    /// The sink the trace is written to.
+    pub const fn sink(&self) -> &S {
+        &self.sink
+    }
+
+    /// Write the pending repetitions of the last access to the sink, so that it
+    /// holds the complete trace so far.
+    pub fn flush(&self) {
+        let mut buf = [0; MAX_RECORDS_LEN];
+        let len = self.encode_repeats(&mut buf);
+        if len > 0 {
+            self.sink.append(&buf[..len]);
+        }
+    }
+
+    /// Flush the trace and return the sink.
+    pub fn finish(self) -> S {
+        self.flush();
+        let this = ManuallyDrop::new(self);
+        // SAFETY: the fields are moved out of `this` once, and it isn't dropped
+        unsafe {
+            drop(ptr::read(&raw const this.io));
+            ptr::read(&raw const this.sink)
+        }
+    }
+
+    /// Append the pending repeat record (if any) to `buf`
+    fn encode_repeats(&self, buf: &mut [u8]) -> usize {
+        let repeats = self.repeats.replace(0);
+        if repeats == 0 {
+            return 0;
+        }
+        buf[0] = REPEAT;
+        1 + encode_varint(u128::from(repeats), &mut buf[1..])
+    }
+
+    #[inline]
+    fn record(&self, access: Access) {
+        let last = self.last.get();
+        if last == Some(access) {
+            self.repeats.set(self.repeats.get() + 1);
+            return;
+        }
+        let mut buf = [0; MAX_RECORDS_LEN];
+        let mut len = self.encode_repeats(&mut buf);
+        len += access.encode(last.map_or(0, |a| a.address), &mut buf[len..]);
+        self.sink.append(&buf[..len]);
+        self.last.set(Some(access));
+    }
+}
+
+impl<IO, S: TraceSink> Drop for RecordIO<IO, S> {
+    fn drop(&mut self) {
+        self.flush();
+    }
+}
+
+impl<IO: RawRegisterIO, S: TraceSink> RawRegisterIO for RecordIO<IO, S> {
+    type Error = IO::Error;
+
+    #[inline]
+    unsafe fn try_read<T: RegInt>(&self, ptr: *const T) -> Result<T, Self::Error> {
+        let value = unsafe { self.io.try_read(ptr)? };
+        self.record(Access::new(ptr.addr(), false, value));
+        Ok(value)
+    }
+
+    #[inline]
+    unsafe fn try_write<T: RegInt>(&self, ptr: *mut T, value: T) -> Result<(), Self::Error> {
+        unsafe { self.io.try_write(ptr, value)? };
+        self.record(Access::new(ptr.addr(), true, value));
+        Ok(())
+    }
+
+    #[inline]
+    unsafe fn try_read_block<T: RegInt>(
+        &self,
+        ptr: *const T,
+        buf: &mut [T],
+    ) -> Result<(), Self::Error> {
+        unsafe { self.io.try_read_block(ptr, buf)? };
+        for (i, &word) in buf.iter().enumerate() {
+            self.record(Access::new(ptr.wrapping_add(i).addr(), false, word));
+        }
+        Ok(())
+    }
+
+    #[inline]
+    unsafe fn try_write_block<T: RegInt>(&self, ptr: *mut T, buf: &[T]) -> Result<(), Self::Error> {
+        unsafe { self.io.try_write_block(ptr, buf)? };
+        for (i, &word) in buf.iter().enumerate() {
+            self.record(Access::new(ptr.wrapping_add(i).addr(), true, word));
+        }
+        Ok(())
+    }
+}
+
+/// Iterator over the accesses of a trace.
+///
+/// Repeated accesses are yielded once per repetition. After an error, the
+/// iterator returns `None`.
+#[derive(Debug, Clone)]
+pub struct TraceReader<'a> {
+    trace: &'a [u8],
+    /// Byte offset of the next record
+    offset: usize,
+    /// Previous access, or `None` at the start of the trace
+    last: Option<Access>,
+    /// Number of repetitions of `last` left to yield
+    repeats: u64,
+}
+
+impl<'a> TraceReader<'a> {
+    /// Start reading a trace written by [`RecordIO`].
+    ///
+    /// # Errors
+    ///
+    /// Returns an error if the trace doesn't start with a valid header.
+    pub fn new(trace: &'a [u8]) -> Result<Self, TraceError> {
+        if trace.get(..MAGIC.len()) != Some(&MAGIC) {
+            return Err(TraceError::BadMagic);
+        }
+        match trace.get(MAGIC.len()) {
+            Some(&VERSION) => {}
+            Some(&version) => return Err(TraceError::UnsupportedVersion(version)),
+            None => return Err(TraceError::BadMagic),
+        }
+        Ok(Self {
+            trace,
+            offset: MAGIC.len() + 1,
+            last: None,
+            repeats: 0,
+        })
+    }
+
+    /// `true` if every access of the trace has been read.
+    #[must_use]
+    pub fn is_finished(&self) -> bool {
+        self.repeats == 0 && self.offset >= self.trace.len()
+    }
+
+    fn decode(&mut self) -> Option<Access> {
+        let header = *self.trace.get(self.offset)?;
+        self.offset += 1;
+        if header == REPEAT {
+            let repeats = u64::try_from(self.decode_varint()?).ok()?;
+            let last = self.last?;
+            self.repeats = repeats.checked_sub(1)?;
+            return Some(last);
+        }
+        let log2_width = header >> 1;
+        if log2_width > 4 {
+            return None;
+        }
+        let zigzag = u64::try_from(self.decode_varint()?).ok()?;
+        #[allow(clippy::cast_possible_wrap)]
+        let delta = (zigzag >> 1) as i64 ^ -((zigzag & 1) as i64);
+        let previous = self.last.map_or(0, |a| a.address);
+        #[allow(clippy::cast_possible_truncation, clippy::cast_sign_loss)]
+        let address = previous.wrapping_add(delta as isize as usize);
+        let width = 1 << log2_width;
+        let value = self.decode_varint()?;
+        if width < 16 && value >> (8 * width) != 0 {
+            return None;
+        }
+        let access = Access {
+            address,
+            width,
+            write: header & WRITE != 0,
+            value,
+        };
+        self.last = Some(access);
+        Some(access)
+    }
+
+    fn decode_varint(&mut self) -> Option<u128> {
+        let mut value = 0_u128;
+        for shift in (0..128).step_by(7) {
+            let byte = *self.trace.get(self.offset)?;
+            self.offset += 1;
+            value |= u128::from(byte & 0x7F) << shift;
+            if byte & 0x80 == 0 {
+                return Some(value);
+            }
+        }
+        None
+    }
+}
+
+impl Iterator for TraceReader<'_> {
+    type Item = Result<Access, TraceError>;
+
+    fn next(&mut self) -> Option<Self::Item> {
+        if self.repeats > 0 {
+            self.repeats -= 1;
+            return self.last.map(Ok);
+        }
+        if self.offset >= self.trace.len() {
+            return None;
+        }
+        let offset = self.offset;
+        let access = self.decode();
+        if access.is_none() {
+            // stop at the first error
+            self.offset = self.trace.len();
+        }
+        Some(access.ok_or(TraceError::Corrupt { offset }))
+    }
+}
+
+/// Replaying [`RawRegisterIO`] implementation.
+///
+/// Serves each read with the value of the next access in the trace, and checks
+/// that each write matches it, without accessing any memory. Registers can be
+/// accessed at the addresses they were recorded at (e.g., with the same
+/// `from_ptr` base address as on the hardware), since pointers are never
+/// dereferenced.
+///
+/// # Panics
+///
+/// Accesses panic if they don't match the next access in the trace (address,
+/// width, direction, and written value), or if the trace is exhausted or
+/// corrupt, so that a test fails at the first access where the run diverges
+/// from the recording.
+pub struct ReplayIO<'a> {
+    reader: RefCell<TraceReader<'a>>,
+    /// Number of accesses replayed so far
+    position: Cell<usize>,
+}
+
+impl<'a> ReplayIO<'a> {
+    /// Start replaying a trace written by [`RecordIO`].
+    ///
+    /// # Errors
+    ///
+    /// Returns an error if the trace doesn't start with a valid header.
+    pub fn new(trace: &'a [u8]) -> Result<Self, TraceError> {
+        Ok(Self {
+            reader: RefCell::new(TraceReader::new(trace)?),
+            position: Cell::new(0),
+        })
+    }
+
+    /// Number of accesses replayed so far.
+    pub fn position(&self) -> usize {
+        self.position.get()
+    }
+
+    /// `true` if every access of the trace has been replayed.
+    pub fn is_finished(&self) -> bool {
+        self.reader.borrow().is_finished()
+    }
+
+    /// Check `actual` against the next access of the trace, ignoring its value
+    /// for reads, and return the recorded access
+    #[inline]
+    fn replay(&self, actual: Access) -> Access {
+        let next = self.reader.borrow_mut().next();
+        let position = self.position.replace(self.position.get() + 1);
+        let expected = match next {
+            Some(Ok(expected)) => expected,
+            Some(Err(err)) => panic!("replay failed at access {position}: {err}"),
+            None => panic!("replay failed at access {position}: unexpected {actual}"),
+        };
+        let matches = expected.address == actual.address
+            && expected.width == actual.width
+            && expected.write == actual.write
+            && (!actual.write || expected.value == actual.value);
+        assert!(
+            matches,
+            "replay diverged at access {position}: expected {expected}, got {actual}"
+        );
+        expected
+    }
+}
+
+impl RawRegisterIO for ReplayIO<'_> {
+    type Error = Infallible;
+
+    #[inline]
+    unsafe fn try_read<T: RegInt>(&self, ptr: *const T) -> Result<T, Self::Error> {
+        let access = self.replay(Access::new(ptr.addr(), false, T::ZERO));
+        Ok(from_bits(access.value))
+    }
+
+    #[inline]
+    unsafe fn try_write<T: RegInt>(&self, ptr: *mut T, value: T) -> Result<(), Self::Error> {
+        self.replay(Access::new(ptr.addr(), true, value));
+        Ok(())
+    }
+}
+
+/// Append `value` to `buf` as a LEB128 varint, returning the encoded length
+#[inline]
+fn encode_varint(mut value: u128, buf: &mut [u8]) -> usize {
+    let mut len = 0;
+    while value >= 0x80 {
+        #[allow(clippy::cast_possible_truncation)]
+        let byte = value as u8;
+        buf[len] = byte | 0x80;
+        value >>= 7;
+        len += 1;
+    }
+    #[allow(clippy::cast_possible_truncation)]
+    let byte = value as u8;
+    buf[len] = byte;
+    len + 1
+}
+
+/// Bits of an integer (zero-extended)
+#[inline]
+fn to_bits<T: RegInt>(value: T) -> u128 {
+    let mut bytes = [0; 16];
+    let le_bytes = value.to_le_bytes();
+    let le_bytes = le_bytes.as_ref();
+    bytes[..le_bytes.len()].copy_from_slice(le_bytes);
+    u128::from_le_bytes(bytes)
+}
+
+/// Integer with the low bits of `bits`
+#[inline]
+fn from_bits<T: RegInt>(bits: u128) -> T {
+    let bytes = bits.to_le_bytes();
+    T::from_le_bytes(
+        &bytes[..size_of::<T>()]
+            .try_into()
+            .expect("Incorrect slice length"),
+    )
+}
+
+#[cfg(test)]
+mod tests {
+    extern crate std;
+
+    use std::vec::Vec;
+
+    use super::*;
+    use crate::io::MockIO;
+
+    type Trace = RefCell<Vec<u8>>;
+
+    /// Record a few accesses of each kind through a `MockIO`
+    fn record() -> (Vec<u8>, Vec<Access>) {
+        let io = RecordIO::new(MockIO::<64>::new_zeroed(), Trace::default());
+        let base = io.inner().base_ptr();
+        let reg32 = base.wrapping_byte_add(8).cast::<u32>();
+        let reg8 = base.wrapping_byte_add(3).cast::<u8>();
+        let reg128 = base.wrapping_byte_add(32).cast::<u128>();
+        unsafe {
+            io.try_write(reg32, 0xDEAD_BEEF).unwrap();
+            for _ in 0..1000 {
+                io.try_read(reg32).unwrap();
+            }
+            io.try_write(reg8, 0x7F).unwrap();
+            io.try_write(reg128, u128::MAX).unwrap();
+            io.try_read(reg128).unwrap();
+            io.try_write_block(reg32, &[1, 2]).unwrap();
+            let mut buf = [0_u16; 2];
+            io.try_read_block(reg32.cast::<u16>(), &mut buf).unwrap();
+            io.try_read(reg32).unwrap();
+        }
+
+        let access = |address, width, write, value| Access {
+            address,
+            width,
+            write,
+            value,
+        };
+        let mut expected = vec_of(access(8, 4, true, 0xDEAD_BEEF), 1);
+        expected.extend(vec_of(access(8, 4, false, 0xDEAD_BEEF), 1000));
+        expected.extend([
+            access(3, 1, true, 0x7F),
+            access(32, 16, true, u128::MAX),
+            access(32, 16, false, u128::MAX),
+            access(8, 4, true, 1),
+            access(12, 4, true, 2),
+            access(8, 2, false, 1),
+            access(10, 2, false, 0),
+            access(8, 4, false, 1),
+        ]);
+        (io.finish().into_inner(), expected)
+    }
+
+    fn vec_of(access: Access, n: usize) -> Vec<Access> {
+        core::iter::repeat_n(access, n).collect()
+    }
+
+    #[test]
+    fn test_record() {
+        let (trace, expected) = record();
+        let accesses: Result<Vec<_>, _> = TraceReader::new(&trace).unwrap().collect();
+        assert_eq!(accesses.unwrap(), expected);
+        // the polling reads are a single repeat record
+        assert!(trace.len() < 100, "{} bytes", trace.len());
+    }
+
+    #[test]
+    fn test_flush_on_drop() {
+        let mock = MockIO::<4>::new_zeroed();
+        let reg = mock.base_ptr().cast::<u32>();
+        let trace = Trace::default();
+        {
+            let io = RecordIO::new(&mock, &trace);
+            for _ in 0..10 {
+                unsafe { io.try_read(reg).unwrap() };
+            }
+        }
+        let trace = trace.into_inner();
+        assert_eq!(TraceReader::new(&trace).unwrap().count(), 10);
+    }
+
+    #[test]
+    fn test_replay() {
+        let (trace, expected) = record();
+        let replay = ReplayIO::new(&trace).unwrap();
+        for access in &expected {
+            unsafe {
+                match access.width {
+                    1 => replay.try_write(access.address as *mut u8, 0x7F).unwrap(),
+                    2 => {
+                        let value = replay.try_read(access.address as *const u16).unwrap();
+                        assert_eq!(u128::from(value), access.value);
+                    }
+                    4 if access.write => {
+                        #[allow(clippy::cast_possible_truncation)]
+                        let value = access.value as u32;
+                        replay.try_write(access.address as *mut u32, value).unwrap();
+                    }
+                    4 => {
+                        let value = replay.try_read(access.address as *const u32).unwrap();
+                        assert_eq!(u128::from(value), access.value);
+                    }
+                    _ if access.write => replay
+                        .try_write(access.address as *mut u128, u128::MAX)
+                        .unwrap(),
+                    _ => assert_eq!(
+                        replay.try_read(access.address as *const u128).unwrap(),
+                        u128::MAX
+                    ),
+                }
+            }
+        }
+        assert!(replay.is_finished());
+        assert_eq!(replay.position(), expected.len());
+    }
+
+    #[test]
+    #[should_panic(
+        expected = "replay diverged at access 0: expected 32-bit write of 0xdeadbeef to 0x8, got 32-bit write of 0x1 to 0x8"
+    )]
+    fn test_replay_diverged() {
+        let (trace, _) = record();
+        let replay = ReplayIO::new(&trace).unwrap();
+        unsafe { replay.try_write(8 as *mut u32, 1).unwrap() };
+    }
+
+    #[test]
+    fn test_corrupt() {
+        assert_eq!(TraceReader::new(b"RDL").unwrap_err(), TraceError::BadMagic);
+        assert_eq!(
+            TraceReader::new(b"RDLT\x02").unwrap_err(),
+            TraceError::UnsupportedVersion(2)
+        );
+        let (mut trace, _) = record();
+        // truncate the last record
+        trace.pop();
+        let last = TraceReader::new(&trace).unwrap().last();
+        assert!(matches!(last, Some(Err(TraceError::Corrupt { .. }))));
+        // a repeat record without a previous access
+        let mut reader = TraceReader::new(b"RDLT\x01\x80\x01").unwrap();
+        assert_eq!(reader.next(), Some(Err(TraceError::Corrupt { offset: 5 })));
+        assert_eq!(reader.next(), None);
+    }
+}
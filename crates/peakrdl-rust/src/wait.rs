@@ -0,0 +1,172 @@
+//! Policies for polling registers until a condition is met
+//!
+//! Used by [`Reg::wait_until`](crate::reg::Reg::wait_until) and
+//! [`Reg::wait_for_bits`](crate::reg::Reg::wait_for_bits) and their fallible
+//! `try_` variants.
+
+/// Policy controlling the delay between register polls, and when to give up.
+///
+/// Any `FnMut() -> bool` closure is a [`Backoff`], which makes it easy to poll
+/// until a deadline from a platform timer:
+///
+/// ```ignore
+/// let deadline = timer.now() + TIMEOUT;
+/// reg.wait_for_bits(mask, value, || timer.now() < deadline)?;
+/// ```
+pub trait Backoff {
+    /// Called after each unsuccessful poll, before the next one.
+    ///
+    /// Returns `false` to stop polling and report a [`Timeout`].
+    fn wait(&mut self) -> bool;
+}
+
+impl<F: FnMut() -> bool> Backoff for F {
+    #[inline]
+    fn wait(&mut self) -> bool {
+        self()
+    }
+}
+
+/// Poll as fast as possible, forever.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct Spin;
+
+impl Backoff for Spin {
+    #[inline]
+    fn wait(&mut self) -> bool {
+        core::hint::spin_loop();
+        true
+    }
+}
+
+/// Spin-then-backoff polling policy.
+///
+/// The first `spins` polls are issued back-to-back. After that, the delay
+/// between polls (measured in [`core::hint::spin_loop`] iterations) doubles
+/// after every poll, up to `max_delay`. This keeps the latency low for
+/// conditions that become true quickly, while reducing bus traffic for ones
+/// that take longer.
+///
+/// By default it polls forever. Use [`SpinBackoff::with_max_polls`] to time
+/// out after a number of polls.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct SpinBackoff {
+    spins: u32,
+    max_delay: u32,
+    max_polls: Option<u32>,
+    polls: u32,
+    delay: u32,
+}
+
+impl SpinBackoff {
+    /// Spin for `spins` polls, then back off exponentially up to `max_delay`
+    /// spin loop iterations between polls.
+    #[must_use]
+    pub const fn new(spins: u32, max_delay: u32) -> Self {
+        Self {
+            spins,
+            max_delay,
+            max_polls: None,
+            polls: 0,
+            delay: 1,
+        }
+    }
+
+    /// Give up after a total of `max_polls` unsuccessful polls.
+    #[must_use]
+    pub const fn with_max_polls(mut self, max_polls: u32) -> Self {
+        self.max_polls = Some(max_polls);
+        self
+    }
+}
+
+impl Default for SpinBackoff {
+    fn default() -> Self {
+        Self::new(64, 1024)
+    }
+}
+
+impl Backoff for SpinBackoff {
+    #[inline]
+    fn wait(&mut self) -> bool {
+        self.polls = self.polls.saturating_add(1);
+        if self.max_polls.is_some_and(|max| self.polls >= max) {
+            return false;
+        }
+        if self.polls <= self.spins {
+            core::hint::spin_loop();
+        } else {
+            for _ in 0..self.delay {
+                core::hint::spin_loop();
+            }
+            self.delay = self.delay.saturating_mul(2).min(self.max_delay);
+        }
+        true
+    }
+}
+
+/// Error returned when a [`Backoff`] policy gives up waiting.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct Timeout;
+
+impl core::fmt::Display for Timeout {
+    fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+        f.write_str("timed out waiting for register condition")
+    }
+}
+
+impl core::error::Error for Timeout {}
+
+/// Error returned by the fallible `try_wait_*` methods.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum WaitError<E> {
+    /// The [`Backoff`] policy gave up waiting.
+    Timeout,
+    /// A register read failed.
+    Io(E),
+}
+
+impl<E> From<Timeout> for WaitError<E> {
+    fn from(_: Timeout) -> Self {
+        Self::Timeout
+    }
+}
+
+impl<E: core::fmt::Display> core::fmt::Display for WaitError<E> {
+    fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+        match self {
+            Self::Timeout => Timeout.fmt(f),
+            Self::Io(e) => write!(f, "register read failed: {e}"),
+        }
+    }
+}
+
+impl<E: core::error::Error> core::error::Error for WaitError<E> {}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_spin_backoff_max_polls() {
+        let mut backoff = SpinBackoff::new(2, 8).with_max_polls(5);
+        let mut polls = 1;
+        while backoff.wait() {
+            polls += 1;
+        }
+        assert_eq!(polls, 5);
+        assert_eq!(backoff.delay, 4);
+    }
+
+    #[test]
+    fn test_closure_backoff() {
+        let mut remaining = 3;
+        let mut backoff = || {
+            remaining -= 1;
+            remaining > 0
+        };
+        assert!(backoff.wait());
+        assert!(backoff.wait());
+        assert!(!backoff.wait());
+    }
+}
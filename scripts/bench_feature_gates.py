@@ -0,0 +1,108 @@
+"""Compare build times of generated code with and without Cargo feature gates.
+
+Generates a synthetic design with many top-level blocks, exports it with
+``feature_gates=True``, and times ``cargo build`` of the generated crate with
+no blocks, one block, and all blocks enabled.
+
+Usage: python scripts/bench_feature_gates.py [--blocks N] [--regs N] [--release]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from systemrdl.compiler import RDLCompiler
+
+from peakrdl_rust.exporter import RustExporter
+from peakrdl_rust.udps import ALL_UDPS
+
+ROOT = Path(__file__).resolve().parent.parent
+UDP_FILE = ROOT / "src" / "peakrdl_rust" / "udps" / "udps.rdl"
+RUNTIME_CRATE = ROOT / "crates" / "peakrdl-rust"
+
+
+def synthetic_rdl(blocks: int, regs: int) -> str:
+    lines = ["addrmap soc {", "    default sw = rw;", "    default hw = r;"]
+    for b in range(blocks):
+        lines.append("    addrmap {")
+        for r in range(regs):
+            lines.append(
+                "        reg { field {} a[7:0]; field {} b[15:8]; "
+                f"field {{}} c[31:16]; }} reg{r};"
+            )
+        lines.append(f"    }} block{b};")
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def timed_build(crate_dir: Path, release: bool, *features: str) -> float:
+    args = ["cargo", "build", "--quiet"]
+    if release:
+        args.append("--release")
+    if features:
+        args += ["--features", ",".join(features)]
+    subprocess.run(["cargo", "clean", "--quiet", "-p", "soc"], cwd=crate_dir)
+    start = time.perf_counter()
+    subprocess.run(args, cwd=crate_dir, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=64)
+    parser.add_argument("--regs", type=int, default=64)
+    parser.add_argument("--release", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crate_dir = Path(tmp)
+        rdl_file = crate_dir / "soc.rdl"
+        rdl_file.write_text(synthetic_rdl(args.blocks, args.regs))
+
+        rdlc = RDLCompiler()
+        for udp in ALL_UDPS:
+            rdlc.register_udp(udp)
+        rdlc.compile_file(str(UDP_FILE))
+        rdlc.compile_file(str(rdl_file))
+        root = rdlc.elaborate()
+        RustExporter().export(
+            root, str(crate_dir / "src" / "generated"), feature_gates=True
+        )
+
+        features = (crate_dir / "src" / "generated" / "features.toml").read_text()
+        (crate_dir / "Cargo.toml").write_text(
+            "[package]\n"
+            'name = "soc"\n'
+            'version = "0.1.0"\n'
+            'edition = "2024"\n\n'
+            "[dependencies]\n"
+            f"peakrdl-rust = {{ path = {str(RUNTIME_CRATE)!r} }}\n\n"
+            f"{features}"
+        )
+        (crate_dir / "src" / "lib.rs").write_text(
+            "#![no_std]\npub mod generated;\npub use generated::*;\n"
+        )
+
+        # Build dependencies once so that they aren't included in the timings
+        timed_build(crate_dir, args.release)
+
+        all_blocks = [f"block{b}" for b in range(args.blocks)]
+        results = [
+            ("no blocks", timed_build(crate_dir, args.release)),
+            ("1 block", timed_build(crate_dir, args.release, all_blocks[0])),
+            (
+                f"all {args.blocks} blocks",
+                timed_build(crate_dir, args.release, *all_blocks),
+            ),
+        ]
+
+    print(f"{args.blocks} blocks x {args.regs} registers")
+    for name, seconds in results:
+        print(f"  {name:>16}: {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Compare the code size of generated code with each inlining and Debug policy.
+
+Exports a design with every combination of the ``inline`` and ``debug_impls``
+options, and compiles it into an object file together with functions that
+read every readable field, modify every read-write field, and format every
+readable register with ``Debug`` (unless ``debug_impls="none"``). Reports the
+size of the code and read-only data sections of each object file, which must
+be ELF (i.e. the host is Linux, or ``--target`` is an embedded target).
+
+Usage: python scripts/code_size.py [RDL_FILE] [--top NAME] [--target TRIPLE]
+       [--opt-level LEVEL]
+"""
+
+import argparse
+import itertools
+import struct
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from systemrdl.compiler import RDLCompiler
+from systemrdl.node import AddrmapNode, FieldNode, Node, RegNode
+
+from peakrdl_rust.exporter import RustExporter
+from peakrdl_rust.udps import ALL_UDPS
+from peakrdl_rust.utils import field_access, kw_filter, rust_type_name
+
+ROOT = Path(__file__).resolve().parent.parent
+UDP_FILE = ROOT / "src" / "peakrdl_rust" / "udps" / "udps.rdl"
+RUNTIME_CRATE = ROOT / "crates" / "peakrdl-rust"
+TURBOENCABULATOR = ROOT / "tests" / "rdl_src" / "turboencabulator.rdl"
+
+INLINE_POLICIES = ("always", "hint", "outlined")
+DEBUG_POLICIES = ("fields", "table", "none")
+
+
+def accessor_path(top: AddrmapNode, node: Node) -> str:
+    """Chain of accessor calls from the top-level block to `node`, using the
+    first element of each array"""
+    parts = []
+    while node is not top:
+        part = f".{kw_filter(node.inst_name)}()"
+        if node.is_array:
+            part += "[0]" * len(node.array_dimensions)  # type: ignore[arg-type]
+        parts.append(part)
+        node = node.parent  # type: ignore[assignment]
+    return "top" + "".join(reversed(parts))
+
+
+def returns_result(field: FieldNode) -> bool:
+    """Whether the field getter returns a `Result` (non-exhaustive enum)"""
+    encode = field.get_property("encode")
+    return encode is not None and len(encode.members) != 2**field.width
+
+
+def driver(top: AddrmapNode, debug: bool) -> str:
+    """Functions exercising every register accessor of the design"""
+    top_type = f"generated::{rust_type_name(top)}"
+    read = []
+    modify = []
+    fmt = []
+    for reg in top.descendants(unroll=False):
+        if not isinstance(reg, RegNode):
+            continue
+        path = accessor_path(top, reg)
+        fields = [(f, field_access(f)) for f in reg.fields()]
+        readable = [f for f, access in fields if access is not None and "R" in access]
+        read_write = [f for f, access in fields if access == "RW"]
+        if readable:
+            read.append(f"    let r = {path}.read();")
+            read += [
+                f"    let _ = black_box(r.{kw_filter(f.inst_name)}());"
+                for f in readable
+            ]
+            fmt.append(f'    write!(out, "{{:?}}", {path}.read())?;')
+        if read_write:
+            modify.append(f"    {path}.modify(|r| {{")
+            for f in read_write:
+                name = kw_filter(f.inst_name)
+                if returns_result(f):
+                    modify.append(f"        if let Ok(v) = r.{name}() {{")
+                    modify.append(f"            r.set_{f.inst_name}(black_box(v));")
+                    modify.append("        }")
+                else:
+                    modify.append(
+                        f"        r.set_{f.inst_name}(black_box(r.{name}()));"
+                    )
+            modify.append("    });")
+
+    header = f"let top = unsafe {{ {top_type}::from_ptr(base) }};"
+    code = [
+        "#![no_std]",
+        "#![allow(clippy::all)]",
+        "#![allow(dead_code)]",
+        "use core::hint::black_box;",
+        "// Private so that only the code used by the functions below is compiled",
+        "mod generated;",
+        "",
+        "#[unsafe(no_mangle)]",
+        'pub extern "C" fn read_fields(base: *mut ()) {',
+        f"    {header}",
+        *read,
+        "}",
+        "",
+        "#[unsafe(no_mangle)]",
+        'pub extern "C" fn modify_fields(base: *mut ()) {',
+        f"    {header}",
+        *modify,
+        "}",
+    ]
+    if debug:
+        code += [
+            "",
+            "#[unsafe(no_mangle)]",
+            "pub fn debug_registers(",
+            "    base: *mut (),",
+            "    out: &mut dyn core::fmt::Write,",
+            ") -> core::fmt::Result {",
+            f"    {header}",
+            *fmt,
+            "    Ok(())",
+            "}",
+        ]
+    return "\n".join(code) + "\n"
+
+
+def section_sizes(obj: Path) -> dict[str, int]:
+    """Total size of the code and read-only data sections of an ELF file"""
+    data = obj.read_bytes()
+    if data[:4] != b"\x7fELF":
+        raise RuntimeError(f"{obj} is not an ELF file, try setting --target")
+    is_64 = data[4] == 2
+    endian = "<" if data[5] == 1 else ">"
+    if is_64:
+        shoff, shentsize, shnum, shstrndx = struct.unpack_from(
+            endian + "40xQ10xHHH", data
+        )
+        header = endian + "I4xQ8xQQ"  # name, flags, offset, size
+    else:
+        shoff, shentsize, shnum, shstrndx = struct.unpack_from(
+            endian + "32xI10xHHH", data
+        )
+        header = endian + "I4xI4xII"
+    sections = [
+        struct.unpack_from(header, data, shoff + i * shentsize) for i in range(shnum)
+    ]
+    strtab_offset = sections[shstrndx][2]
+
+    sizes = {"text": 0, "rodata": 0}
+    for name_offset, flags, _, size in sections:
+        end = data.index(b"\0", strtab_offset + name_offset)
+        name = data[strtab_offset + name_offset : end].decode()
+        if not flags & 0x2:  # SHF_ALLOC
+            continue
+        for kind in sizes:
+            if name == f".{kind}" or name.startswith(f".{kind}."):
+                sizes[kind] += size
+    return sizes
+
+
+def build(
+    crate_dir: Path,
+    root: AddrmapNode,
+    inline: str,
+    debug_impls: str,
+    target: "str | None",
+    opt_level: str,
+) -> dict[str, int]:
+    RustExporter().export(
+        root,
+        str(crate_dir / "src" / "generated"),
+        force=True,
+        inline=inline,
+        debug_impls=debug_impls,
+    )
+    (crate_dir / "src" / "lib.rs").write_text(driver(root, debug_impls != "none"))
+    obj = crate_dir / f"{inline}-{debug_impls}.o"
+    args = ["cargo", "rustc", "--quiet", "--release", "--lib"]
+    if target is not None:
+        args += ["--target", target]
+    args += [
+        "--",
+        f"--emit=obj={obj}",
+        "-C",
+        "codegen-units=1",
+        "-C",
+        f"opt-level={opt_level}",
+    ]
+    subprocess.run(args, cwd=crate_dir, check=True)
+    return section_sizes(obj)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rdl_file", nargs="?", default=str(TURBOENCABULATOR))
+    parser.add_argument("--top", default=None, help="Top-level addrmap name")
+    parser.add_argument("--target", default=None, help="Rust target triple")
+    parser.add_argument("--opt-level", default="s")
+    args = parser.parse_args()
+
+    rdlc = RDLCompiler()
+    for udp in ALL_UDPS:
+        rdlc.register_udp(udp)
+    rdlc.compile_file(str(UDP_FILE))
+    rdlc.compile_file(args.rdl_file)
+    root = rdlc.elaborate(top_def_name=args.top).top
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crate_dir = Path(tmp)
+        (crate_dir / "src").mkdir()
+        (crate_dir / "Cargo.toml").write_text(
+            "[package]\n"
+            'name = "code_size"\n'
+            'version = "0.1.0"\n'
+            'edition = "2024"\n\n'
+            "[dependencies]\n"
+            f"peakrdl-rust = {{ path = {str(RUNTIME_CRATE)!r}, "
+            'features = ["fixedpoint"] }\n'
+        )
+        results = [
+            (
+                inline,
+                debug_impls,
+                build(
+                    crate_dir, root, inline, debug_impls, args.target, args.opt_level
+                ),
+            )
+            for inline, debug_impls in itertools.product(
+                INLINE_POLICIES, DEBUG_POLICIES
+            )
+        ]
+
+    print(f"{root.inst_name}, opt-level={args.opt_level}")
+    print(f"  {'inline':>8}  {'debug_impls':>11}  {'.text':>7}  {'.rodata':>7}")
+    for inline, debug_impls, sizes in results:
+        print(
+            f"  {inline:>8}  {debug_impls:>11}  "
+            f"{sizes['text']:>7}  {sizes['rodata']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1 @@
-PEAKRDL_RUST_CRATE_MIN_VERSION = (0, 2, 0)
+PEAKRDL_RUST_CRATE_MIN_VERSION = (0, 3, 0)
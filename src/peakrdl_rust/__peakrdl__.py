@@ -1,14 +1,23 @@
-from typing import TYPE_CHECKING
+import argparse
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union
 
+from peakrdl import process_input
 from peakrdl.config import schema
 from peakrdl.plugins.exporter import ExporterSubcommandPlugin
+from systemrdl import RDLCompileError
+from systemrdl.compiler import RDLCompiler
 
+from .batch import load_batch
+from .depfile import rdl_dependencies, write_depfile
 from .exporter import RustExporter
+from .ir import SCAN_OPTIONS, DesignIR, cache_key
 from .udps import ALL_UDPS
+from .watch import modification_times, wait_for_change
 
 if TYPE_CHECKING:
-    import argparse
-
+    from peakrdl.plugins.importer import ImporterPlugin
     from systemrdl.node import AddrmapNode
 
 
@@ -24,9 +33,21 @@ class Exporter(ExporterSubcommandPlugin):
         "word_endian": schema.Choice(["big", "little"]),
         "access_mode": schema.Choice(["software", "hardware"]),
         "read_only": schema.Boolean(),
+        "address_table": schema.Boolean(),
+        "include": [schema.String()],
+        "exclude": [schema.String()],
+        "feature_gates": schema.Boolean(),
+        "dedup": schema.Boolean(),
+        "inline": schema.Choice(["always", "hint", "outlined"]),
+        "debug_impls": schema.Choice(["fields", "table", "none"]),
     }
 
-    def add_exporter_arguments(self, arg_group: "argparse._ActionsContainer") -> None:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Shared by all exports so that --watch can skip unchanged files
+        self.rust_exporter = RustExporter()
+
+    def add_exporter_arguments(self, arg_group: argparse._ActionsContainer) -> None:
         arg_group.add_argument(
             "--force",
             action="store_true",
@@ -85,15 +106,273 @@ class Exporter(ExporterSubcommandPlugin):
             """,
         )
 
-    def do_export(self, top_node: "AddrmapNode", options: "argparse.Namespace") -> None:
-        x = RustExporter()
-        x.export(
+        arg_group.add_argument(
+            "--address-table",
+            action="store_true",
+            default=False,
+            help="""
+            Generate a static address-to-register lookup table.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--include",
+            action="append",
+            metavar="PATTERN",
+            default=None,
+            help="""
+            Only export components whose hierarchical path (without array indices)
+            matches this glob pattern, e.g. 'soc.uart*'. Can be repeated.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--exclude",
+            action="append",
+            metavar="PATTERN",
+            default=None,
+            help="""
+            Do not export components whose hierarchical path (without array
+            indices) matches this glob pattern. Can be repeated.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--feature-gates",
+            action="store_true",
+            default=False,
+            help="""
+            Gate each block in the top-level addrmap behind a Cargo feature, and
+            write the feature list to features.toml.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--dedup",
+            action="store_true",
+            default=False,
+            help="""
+            Generate structurally identical anonymous components only once.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--inline",
+            choices=["always", "hint", "outlined"],
+            default="always",
+            help="""
+            Inlining policy for field getters/setters and block accessors:
+            `#[inline(always)]` (default), an `#[inline]` hint, or
+            `#[inline(never)]` to keep a single out-of-line copy of each.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--debug-impls",
+            choices=["fields", "table", "none"],
+            default="fields",
+            help="""
+            How to implement `Debug` for registers: by calling every field
+            getter (default), with a shared function printing the raw field
+            values from a static table, or not at all.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--depfile",
+            metavar="FILE",
+            default=None,
+            help="""
+            Write a Makefile-style depfile listing every file read to generate
+            the output, including `include'd files and the PeakRDL config file.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--watch",
+            action="store_true",
+            default=False,
+            help="""
+            Keep running, and export again whenever an input file changes. Only
+            the generated files whose contents change are rewritten and
+            formatted. The PeakRDL config file is only read at startup, so
+            changes to it need a restart.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--batch",
+            metavar="FILE",
+            default=None,
+            help="""
+            Export several top-level designs from the same input files. FILE is
+            a JSON list of objects with a 'top' name, and optionally a 'rename',
+            'parameters', and exporter options overriding the command line ones.
+            Each design is written to a subdirectory of the output path named
+            after its instance.
+            """,
+        )
+
+        arg_group.add_argument(
+            "--ir-cache",
+            metavar="DIR",
+            default=None,
+            help="""
+            Cache the scanned design in DIR, keyed by the contents of the input
+            files and the options affecting the scan. Later exports of the same
+            design (e.g., with other --inline or --debug-impls options) skip
+            elaborating and scanning it.
+            """,
+        )
+
+    def main(
+        self, importers: "list[ImporterPlugin]", options: argparse.Namespace
+    ) -> None:
+        if not options.watch:
+            self.run(importers, options)
+            return
+
+        try:
+            while True:
+                # Snapshot the inputs before reading them, so that changes made
+                # during the export trigger another one
+                try:
+                    deps = self.dependencies(options)
+                except RDLCompileError:
+                    deps = [os.path.abspath(path) for path in options.input_files]
+                # The config file was parsed into `options` at startup, so
+                # exporting again wouldn't pick up its changes
+                if options.peakrdl_cfg is not None:
+                    cfg = os.path.abspath(options.peakrdl_cfg)
+                    deps = [path for path in deps if path != cfg]
+                mtimes = modification_times(deps)
+                try:
+                    self.run(importers, options)
+                except RDLCompileError:
+                    print("Export failed")
+                print(f"Watching {len(deps)} files for changes (Ctrl+C to stop)")
+                wait_for_change(mtimes)
+        except KeyboardInterrupt:
+            pass
+
+    def run(
+        self, importers: "list[ImporterPlugin]", options: argparse.Namespace
+    ) -> None:
+        if options.batch is None:
+            if options.ir_cache is None:
+                super().main(importers, options)
+            else:
+                self.run_cached(importers, options)
+            return
+
+        rdlc = RDLCompiler()
+        for udp in self.udp_definitions:
+            rdlc.register_udp(udp)
+        if options.top_def_name is not None or options.inst_name is not None:
+            rdlc.msg.fatal("--top and --rename can't be used with --batch")
+        if options.ir_cache is not None:
+            rdlc.msg.fatal("--ir-cache can't be used with --batch")
+        designs = load_batch(options.batch, rdlc.msg)
+
+        # Compile the shared input files once, then elaborate each design
+        process_input.process_input(rdlc, importers, options.input_files, options)
+        targets = []
+        for design in designs:
+            root = rdlc.elaborate(
+                top_def_name=design.top,
+                inst_name=design.rename,
+                parameters=process_input.parse_parameters(
+                    rdlc, options.parameters + design.parameters
+                ),
+            )
+            design_options = argparse.Namespace(**vars(options))
+            vars(design_options).update(design.options)
+            design_options.output = os.path.join(options.output, root.top.inst_name)
+            self.export(root.top, design_options)
+            targets.append(os.path.join(design_options.output, "mod.rs"))
+
+        if options.depfile is not None:
+            self.write_depfile(options, targets)
+
+    def run_cached(
+        self, importers: "list[ImporterPlugin]", options: argparse.Namespace
+    ) -> None:
+        """Export the design scanned by a previous run with the same inputs and
+        options from the IR cache, or elaborate and scan it and add it to the
+        cache"""
+        scan_options = {name: getattr(options, name) for name in SCAN_OPTIONS}
+        key = cache_key(
+            self.dependencies(options),
+            {
+                "top": options.top_def_name,
+                "rename": options.inst_name,
+                "parameters": options.parameters,
+                "defines": options.defines,
+                **scan_options,
+            },
+        )
+        cache_file = Path(options.ir_cache) / f"{key}.json"
+        if cache_file.exists():
+            ir = DesignIR.load(cache_file)
+        else:
+            rdlc = RDLCompiler()
+            for udp in self.udp_definitions:
+                rdlc.register_udp(udp)
+            parameters = process_input.parse_parameters(rdlc, options.parameters)
+            process_input.process_input(rdlc, importers, options.input_files, options)
+            root = rdlc.elaborate(
+                top_def_name=options.top_def_name,
+                inst_name=options.inst_name,
+                parameters=parameters,
+            )
+            ir = self.rust_exporter.scan(root.top, **scan_options)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            ir.save(cache_file)
+        self.do_export(ir, options)
+
+    def do_export(
+        self, top_node: "Union[AddrmapNode, DesignIR]", options: argparse.Namespace
+    ) -> None:
+        self.export(top_node, options)
+        if options.depfile is not None:
+            self.write_depfile(options, [os.path.join(options.output, "mod.rs")])
+
+    def export(
+        self, top_node: "Union[AddrmapNode, DesignIR]", options: argparse.Namespace
+    ) -> None:
+        self.rust_exporter.export(
             top_node,
             path=options.output,
             force=options.force,
             fmt=options.fmt,
+            incremental=options.watch,
             byte_endian=options.byte_endian,
             word_endian=options.word_endian,
             access_mode=options.access_mode,
             read_only=options.read_only,
+            address_table=options.address_table,
+            include=options.include,
+            exclude=options.exclude,
+            feature_gates=options.feature_gates,
+            dedup=options.dedup,
+            inline=options.inline,
+            debug_impls=options.debug_impls,
+        )
+
+    def write_depfile(self, options: argparse.Namespace, targets: list[str]) -> None:
+        write_depfile(options.depfile, targets, self.dependencies(options))
+
+    def dependencies(self, options: argparse.Namespace) -> list[str]:
+        """Absolute paths of all files read to generate the output"""
+        rdlc = RDLCompiler()
+        deps = rdl_dependencies(
+            rdlc,
+            options.input_files,
+            options.incdirs,
+            process_input.parse_defines(rdlc, options.defines),
         )
+        if options.peakrdl_cfg is not None:
+            deps.append(os.path.abspath(options.peakrdl_cfg))
+        if options.batch is not None:
+            deps.append(os.path.abspath(options.batch))
+        return deps
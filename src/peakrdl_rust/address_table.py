@@ -0,0 +1,171 @@
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from systemrdl.node import (
+    AddressableNode,
+    AddrmapNode,
+    MemNode,
+    RegfileNode,
+    RegNode,
+)
+
+from . import utils
+from .path_filter import PathFilter
+
+
+@dataclass
+class AddressEntry:
+    """Register, register array, or memory in the address table"""
+
+    address: int  # offset of the first element from the top-level addrmap
+    size: int  # size of each element in bytes
+    count: int  # number of elements
+    stride: int  # address stride between elements
+    path: str  # hierarchical RDL path
+    type_name: str  # Rust type path, relative to the generated module
+    kind: Literal["Register", "Memory"]
+
+
+@dataclass
+class AddressTable:
+    """Sorted address table for one top-level addrmap"""
+
+    name: str  # name of the Rust static
+    top_type: str  # Rust type path of the top-level addrmap
+    entries: list[AddressEntry]
+
+
+class AddressTableScanner:
+    """Collect the address of every register, register array, and memory
+    exposed by the generated code."""
+
+    def __init__(
+        self,
+        top_nodes: list[AddrmapNode],
+        access_mode: str = "software",
+        read_only: bool = False,
+        path_filter: Optional[PathFilter] = None,
+    ) -> None:
+        self.top_nodes = top_nodes
+        self.access_mode = access_mode
+        self.read_only = read_only
+        self.path_filter = path_filter or PathFilter(top_nodes)
+        self.tables: list[AddressTable] = []
+        # Paths of the arrays listed element by element
+        self.unrolled_arrays: set[str] = set()
+
+    def run(self) -> None:
+        for node in self.top_nodes:
+            self.unrolled_arrays = set()
+            entries: list[AddressEntry] = []
+            self.scan(node, 0, entries)
+            # A lookup only checks the last entry starting at or before the
+            # address, so arrays with other entries starting in the gaps between
+            # their elements are listed element by element instead. Unrolling an
+            # array can interleave it with another one, so repeat until stable.
+            while True:
+                starts = sorted(entry.address for entry in entries)
+                interleaved_arrays = {
+                    entry.path for entry in entries if interleaved(entry, starts)
+                }
+                if not interleaved_arrays:
+                    break
+                self.unrolled_arrays |= interleaved_arrays
+                entries = []
+                self.scan(node, 0, entries)
+            entries.sort(key=lambda e: e.address)
+            self.tables.append(
+                AddressTable(
+                    name=utils.rust_module_name(node).upper(),
+                    top_type=self.type_path(node),
+                    entries=entries,
+                )
+            )
+
+    @staticmethod
+    def type_path(node: AddressableNode) -> str:
+        return "::".join(
+            ["components"]
+            + utils.crate_module_path(node, escaped=True)
+            + [utils.rust_type_name(node)]
+        )
+
+    def scan(
+        self,
+        node: AddressableNode,
+        address: int,
+        entries: list[AddressEntry],
+    ) -> None:
+        """Add entries for all descendants of a node at the given address"""
+        for child in node.children():
+            if not self.path_filter.keep(child):
+                continue
+            if isinstance(child, (AddrmapNode, RegfileNode)):
+                # Unroll block arrays so that every element gets its own entries
+                for elem in child.unrolled():
+                    assert isinstance(elem, AddressableNode)
+                    self.scan(elem, address + elem.address_offset, entries)
+            elif isinstance(child, RegNode):
+                if not utils.reg_access(child, self.access_mode, self.read_only):
+                    continue
+                self.add_entry(child, address, "Register", child.size, entries)
+            elif isinstance(child, MemNode):
+                if not utils.mem_access(child, self.access_mode, self.read_only):
+                    continue
+                # Virtual registers within the memory aren't listed separately
+                self.add_entry(child, address, "Memory", child.size, entries)
+
+    def add_entry(
+        self,
+        node: AddressableNode,
+        parent_address: int,
+        kind: Literal["Register", "Memory"],
+        size: int,
+        entries: list[AddressEntry],
+    ) -> None:
+        if node.get_path() in self.unrolled_arrays:
+            for elem in node.unrolled():
+                assert isinstance(elem, AddressableNode)
+                entries.append(
+                    AddressEntry(
+                        address=parent_address + elem.address_offset,
+                        size=size,
+                        count=1,
+                        stride=size,
+                        path=elem.get_path(),
+                        type_name=self.type_path(node),
+                        kind=kind,
+                    )
+                )
+            return
+        if node.is_array:
+            assert node.array_dimensions is not None
+            assert node.array_stride is not None
+            count = math.prod(node.array_dimensions)
+            stride = node.array_stride
+        else:
+            count = 1
+            stride = size
+        entries.append(
+            AddressEntry(
+                address=parent_address + node.raw_address_offset,
+                size=size,
+                count=count,
+                stride=stride,
+                path=node.get_path(),
+                type_name=self.type_path(node),
+                kind=kind,
+            )
+        )
+
+
+def interleaved(entry: AddressEntry, starts: list[int]) -> bool:
+    """Whether an entry is an array with any of the sorted `starts` addresses
+    after its first element and before its end"""
+    if entry.count == 1:
+        return False
+    end = entry.address + (entry.count - 1) * entry.stride + entry.size
+    i = bisect.bisect_right(starts, entry.address)
+    return i < len(starts) and starts[i] < end
@@ -0,0 +1,99 @@
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from systemrdl.messages import MessageHandler
+
+# Exporter options that can be overridden for each design, and their types or
+# valid values
+BATCH_OPTIONS: dict[str, Any] = {
+    "force": bool,
+    "fmt": bool,
+    "byte_endian": ("big", "little"),
+    "word_endian": ("big", "little"),
+    "access_mode": ("software", "hardware"),
+    "read_only": bool,
+    "address_table": bool,
+    "include": list,
+    "exclude": list,
+    "feature_gates": bool,
+    "dedup": bool,
+    "inline": ("always", "hint", "outlined"),
+    "debug_impls": ("fields", "table", "none"),
+}
+
+
+@dataclass
+class BatchDesign:
+    """A top-level design to elaborate and export in a batch"""
+
+    #: Name of the top-level addrmap definition
+    top: str
+    #: Instance name override
+    rename: Optional[str] = None
+    #: Top-level parameters, as ``NAME=VALUE`` strings
+    parameters: list[str] = field(default_factory=list)
+    #: Exporter options overriding the command line options
+    options: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def output_name(self) -> str:
+        """Name of the output directory, after the elaborated instance name"""
+        return self.rename or self.top
+
+
+def load_batch(path: str, msg: "MessageHandler") -> list[BatchDesign]:
+    """Load a JSON batch file, which contains a list of objects like:
+
+    .. code-block:: json
+
+        {"top": "uart", "rename": "uart0", "parameters": {"DEPTH": "16"},
+         "byte_endian": "big"}
+
+    Only ``top`` is required. The other keys are optional and may be any of
+    the exporter options in `BATCH_OPTIONS`. Designs must have distinct
+    instance names, since each is exported to a directory named after it.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        msg.fatal(f"{path}: expected a list of designs")
+
+    designs = []
+    for entry in data:
+        if not isinstance(entry, dict) or not isinstance(entry.get("top"), str):
+            msg.fatal(f"{path}: each design must be an object with a 'top' name")
+        design = BatchDesign(top=entry["top"], rename=entry.get("rename"))
+        for name, value in entry.get("parameters", {}).items():
+            design.parameters.append(f"{name}={value}")
+        for key, value in entry.items():
+            if key in ("top", "rename", "parameters"):
+                continue
+            if key not in BATCH_OPTIONS:
+                msg.fatal(f"{path}: unknown option '{key}' for design '{design.top}'")
+            expected = BATCH_OPTIONS[key]
+            if isinstance(expected, tuple):
+                if value not in expected:
+                    msg.fatal(
+                        f"{path}: option '{key}' for design '{design.top}' must "
+                        f"be one of {', '.join(expected)}"
+                    )
+            elif not isinstance(value, expected):
+                msg.fatal(
+                    f"{path}: option '{key}' for design '{design.top}' must be "
+                    f"of type {expected.__name__}"
+                )
+            design.options[key] = value
+        designs.append(design)
+
+    first_index: dict[str, int] = {}
+    for i, design in enumerate(designs):
+        j = first_index.setdefault(design.output_name, i)
+        if j != i:
+            msg.fatal(
+                f"{path}: designs {j} ('{designs[j].top}') and {i} ('{design.top}') "
+                f"would both be exported to '{design.output_name}'. Give them "
+                "distinct 'rename' values."
+            )
+    return designs
@@ -20,7 +20,29 @@ from systemrdl.rdltypes.user_enum import UserEnum
 from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
 
 from . import utils
+from .feature_gates import FeatureGates
 from .identifier_filter import kw_filter, kw_filter_path
+from .path_filter import PathFilter
+
+# Enums with at least this many variants are decoded with a range check and a
+# lookup table or direct conversion, instead of a match, if their encoded
+# values fill at least this fraction of the range they span.
+ENUM_DECODE_MIN_VARIANTS = 16
+ENUM_DECODE_MIN_DENSITY = 0.5
+
+
+@dataclass
+class DedupInstance:
+    """Anonymous component instance that re-exports an identical component
+    generated elsewhere, instead of being generated itself"""
+
+    inst_name: str  # name of the instance (and its module)
+    module: str  # scoped module path of the identical component
+    type_name: str  # type name of this instance
+    canonical_type_name: str  # type name of the identical component
+    generics: str  # generic parameters of the type, e.g. "<IO>"
+    generic_args: str
+    write_effects: bool  # whether the type has a `<Type>WriteEffects` trait
 
 
 @dataclass
@@ -41,13 +63,14 @@ class Component(abc.ABC):
     named_type_instances: list[tuple[str, str]]
     use_statements: list[str]
     type_name: str
+    # cfg predicates of conditionally compiled submodules, keyed by instance name
+    # or by "named_types::<module>" for named type declarations
+    cfg_gates: dict[str, str]
+    # anonymous components that are identical to another component
+    dedup_instances: list[DedupInstance]
 
-    def render(self, output_dir: Path, jj_env: jj.Environment) -> None:
-        out_file = output_dir / self.file
-        out_file.parent.mkdir(parents=True, exist_ok=True)
-        with out_file.open("w") as f:
-            template = jj_env.get_template(self.template)
-            template.stream(ctx=self).dump(f)  # type: ignore # jinja incorrectly typed
+    def render(self, jj_env: jj.Environment) -> str:
+        return jj_env.get_template(self.template).render(ctx=self)
 
 
 @dataclass
@@ -69,6 +92,8 @@ class Array:
     # string using loop variables i0, i1, ..., etc. to calculate address of an instance
     # for example: "(((i0 * 3) + i1) * 4) + i2) * 0x100"
     addr_offset: str
+    offset: int  # address offset of the first element from the parent component
+    stride: int
 
 
 @dataclass
@@ -78,6 +103,7 @@ class RegisterInst(Instantiation):
     # address offset from parent component, only used if array is None
     addr_offset: Optional[int]
     array: Optional[Array]
+    cfg: Optional[str]  # cfg predicate gating the accessor, if any
 
 
 @dataclass
@@ -87,6 +113,7 @@ class SubmapInst(Instantiation):
     # address offset from parent component, only used if array is None
     addr_offset: Optional[int]
     array: Optional[Array]
+    cfg: Optional[str]  # cfg predicate gating the accessor, if any
 
 
 @dataclass
@@ -96,6 +123,7 @@ class MemoryInst(Instantiation):
     # address offset from parent component, only used if array is None
     addr_offset: Optional[int]
     array: Optional[Array]
+    cfg: Optional[str]  # cfg predicate gating the accessor, if any
 
 
 @dataclass
@@ -113,6 +141,23 @@ class FieldInst(Instantiation):
     is_signed: Optional[bool]
     fracwidth: Optional[int]
     intwidth: Optional[int]
+    # "clear", "set", or "toggle" if the field has a single-bit write side effect
+    write_effect: Optional[str]
+
+
+@dataclass
+class AliasBitOp:
+    """Alias register that sets or clears the bits of its primary register
+    which are written with 1"""
+
+    primary: str  # instance name of the primary register
+    alias: str  # instance name of the alias register
+    alias_type: str  # scoped type name of the alias register
+    op: Literal["set", "clear"]
+    regwidth: int
+    bits: int  # bits of the alias's write-1-to-set/clear fields
+    dims: list[int]  # array dimensions of the primary and alias (empty if none)
+    cfg: Optional[str]  # cfg predicate gating the methods, if any
 
 
 @dataclass
@@ -124,9 +169,23 @@ class Addrmap(Component):
     registers: list[RegisterInst]
     submaps: list[SubmapInst]
     memories: list[MemoryInst]
+    alias_bit_ops: list[AliasBitOp]
     size: int
 
 
+@dataclass
+class MemElement:
+    """Signed integer or fixed-point value held in each memory entry"""
+
+    type_name: str  # rust type of the decoded value
+    primitive: str  # which integer type holds the field bits
+    bit_offset: int  # lowest bit index of the field within the entry
+    width: int  # bit width of the field
+    mask: int  # bitmask of the width of the field
+    is_signed: bool
+    fracwidth: Optional[int]
+
+
 @dataclass
 class Memory(Component):
     """Memory component, defined in its own Rust module."""
@@ -140,6 +199,9 @@ class Memory(Component):
     size: int
     access: str  # "R", "W", or "RW"
     endian: Literal["Big", "Little"]
+    # Decoded type of the entries, if the virtual registers hold a single
+    # signed or fixed-point field
+    element: Optional[MemElement]
 
 
 @dataclass
@@ -156,6 +218,16 @@ class Register(Component):
     has_sw_readable: bool
     byte_endian: Literal["Big", "Little"]
     word_endian: Literal["Big", "Little"]
+    # Value that can be written without side effects on any field, or None if
+    # there isn't one. Only set if some field has a write_effect.
+    idle_write_val: Optional[int]
+    # bits of fields with "clear"/"set"/"toggle" write effects
+    clear_bits: int
+    set_bits: int
+    toggle_bits: int
+    # Nonzero members of the register's `peakrdl_rust::model::Behavior`, or
+    # None to keep the default (only generated for software access)
+    behavior: Optional[dict[str, int]]
 
 
 @dataclass
@@ -175,6 +247,13 @@ class Enum(Component):
 
     primitive: str  # which unsigned rust type is used to represent
     variants: list[EnumVariant]
+    # How `from_bits` decodes a value: "match" on each variant, "range" check
+    # then convert directly if the values are contiguous, or "table" lookup of
+    # the variant names (None for unused values) indexed by value - min_value
+    decode: Literal["match", "range", "table"]
+    min_value: int
+    max_value: int
+    decode_table: list[Optional[str]]
 
 
 class ContextScanner(RDLListener):
@@ -185,13 +264,18 @@ class ContextScanner(RDLListener):
         word_endian: Literal["Big", "Little"],
         access_mode: str = "software",
         read_only: bool = False,
+        path_filter: Optional[PathFilter] = None,
+        feature_gates: Optional[FeatureGates] = None,
     ) -> None:
         self.top_nodes = top_nodes
         self.byte_endian: Literal["Big", "Little"] = byte_endian
         self.word_endian: Literal["Big", "Little"] = word_endian
         self.access_mode = access_mode
         self.read_only = read_only
+        self.path_filter = path_filter or PathFilter(top_nodes)
+        self.feature_gates = feature_gates or FeatureGates(top_nodes)
         self.top_component_modules: list[str] = []
+        self.top_component_cfg_gates: dict[str, str] = {}
         self.components: dict[Path, Component] = {}
         self.msg = top_nodes[0].env.msg
         self.access_mode = access_mode
@@ -220,6 +304,8 @@ class ContextScanner(RDLListener):
     def enter_addrmap_or_regfile_or_memory(
         self, node: Union[AddrmapNode, RegfileNode, MemNode]
     ) -> Optional[WalkerAction]:
+        if not self.path_filter.keep(node):
+            return WalkerAction.SkipDescendants
         file = self.get_node_module_file(node)
         if file in self.components:
             # already handled
@@ -230,10 +316,14 @@ class ContextScanner(RDLListener):
         memories: list[MemoryInst] = []
         anon_instances: list[str] = []
         named_type_instances: list[tuple[str, str]] = []
+        cfg_gates: dict[str, str] = {}
+        node_key = tuple(utils.crate_module_path(node))
 
         for child in node.children():
             if not isinstance(child, AddressableNode):
                 continue
+            if not self.path_filter.keep(child):
+                continue
             inst_name = snakecase(child.inst_name)
             if child.is_array:
                 dims = child.array_dimensions
@@ -251,19 +341,29 @@ class ContextScanner(RDLListener):
                         addr_calc = f"({addr_calc} * {dim}) + i{i}"
 
                 if len(dims) > 1:
-                    addr_calc = f"({addr_calc}) * {hex(stride)}"
+                    addr_calc = f"({addr_calc}) * 0x{stride:_X}"
                 else:
-                    addr_calc = f"{addr_calc} * {hex(stride)}"
+                    addr_calc = f"{addr_calc} * 0x{stride:_X}"
 
                 if child.raw_absolute_address != 0:
-                    addr_calc = f"{hex(child.raw_address_offset)} + {addr_calc}"
-
-                array = Array(type=arr_type, dims=dims, addr_offset=addr_calc)
+                    addr_calc = f"0x{child.raw_address_offset:_X} + {addr_calc}"
+
+                array = Array(
+                    type=arr_type,
+                    dims=dims,
+                    addr_offset=addr_calc,
+                    offset=child.raw_address_offset,
+                    stride=stride,
+                )
                 addr_offset = None
             else:
                 array = None
                 addr_offset = child.address_offset
 
+            cfg = self.feature_gates.instance_cfg(node_key, child)
+            if cfg is not None:
+                cfg_gates[inst_name] = cfg
+
             if isinstance(child, RegNode):
                 if not utils.reg_access(child, self.access_mode, self.read_only):
                     continue
@@ -276,6 +376,7 @@ class ContextScanner(RDLListener):
                         + kw_filter(utils.rust_type_name(child)),
                         array=array,
                         addr_offset=addr_offset,
+                        cfg=cfg,
                     )
                 )
             elif isinstance(child, (AddrmapNode, RegfileNode)):
@@ -288,6 +389,7 @@ class ContextScanner(RDLListener):
                         + kw_filter(utils.rust_type_name(child)),
                         array=array,
                         addr_offset=addr_offset,
+                        cfg=cfg,
                     )
                 )
             elif isinstance(child, MemNode):
@@ -300,6 +402,7 @@ class ContextScanner(RDLListener):
                         + kw_filter(utils.rust_type_name(child)),
                         array=array,
                         addr_offset=addr_offset,
+                        cfg=cfg,
                     )
                 )
             else:
@@ -325,9 +428,12 @@ class ContextScanner(RDLListener):
                 named_type_instances=named_type_instances,
                 named_type_declarations=[],
                 type_name=utils.rust_type_name(node),
+                cfg_gates=cfg_gates,
+                dedup_instances=[],
                 registers=registers,
                 submaps=submaps,
                 memories=memories,
+                alias_bit_ops=self.get_alias_bit_ops(node, registers),
                 size=node.size,
             )
         else:  # MemNode
@@ -346,6 +452,8 @@ class ContextScanner(RDLListener):
                 named_type_instances=named_type_instances,
                 named_type_declarations=[],
                 type_name=utils.rust_type_name(node),
+                cfg_gates=cfg_gates,
+                dedup_instances=[],
                 mementries=node.get_property("mementries"),
                 memwidth=memwidth,
                 primitive=f"u{primitive_width}",
@@ -353,9 +461,102 @@ class ContextScanner(RDLListener):
                 size=node.size,
                 access=access,
                 endian=self.byte_endian,
+                element=self.get_mem_element(node),
             )
         return WalkerAction.Continue
 
+    def get_mem_element(self, node: MemNode) -> Optional[MemElement]:
+        """Typed view of the memory entries, if the memory's virtual register
+        has a single signed or fixed-point field."""
+        virtual_regs = [
+            child
+            for child in node.children()
+            if isinstance(child, RegNode) and self.path_filter.keep(child)
+        ]
+        if len(virtual_regs) != 1:
+            return None
+        fields = virtual_regs[0].fields()
+        if len(fields) != 1:
+            return None
+        field = fields[0]
+        is_signed = bool(field.get_property("is_signed"))
+        fracwidth = field.get_property("fracwidth")
+        if not is_signed and fracwidth is None:
+            return None
+
+        primitive = utils.field_primitive(field, allow_bool=False)
+        if fracwidth is not None:
+            intwidth = field.get_property("intwidth")
+            type_name = (
+                f"peakrdl_rust::fixedpoint::FixedPoint<{primitive}, {intwidth}, "
+                f"{fracwidth}>"
+            )
+        else:
+            type_name = primitive
+        return MemElement(
+            type_name=type_name,
+            primitive=primitive,
+            bit_offset=field.low,
+            width=field.width,
+            mask=(1 << field.width) - 1,
+            is_signed=is_signed,
+            fracwidth=fracwidth,
+        )
+
+    def get_alias_bit_ops(
+        self, node: Union[AddrmapNode, RegfileNode], registers: list[RegisterInst]
+    ) -> list[AliasBitOp]:
+        """Alias registers of the registers in `node` whose writable fields are
+        all write-1-to-set or all write-1-to-clear"""
+        if self.access_mode != "software" or self.read_only:
+            return []
+        kept = {reg.inst_name: reg for reg in registers}
+        names = {snakecase(child.inst_name) for child in node.children()}
+        ops: list[AliasBitOp] = []
+        for alias in node.children():
+            if not isinstance(alias, RegNode) or not alias.is_alias:
+                continue
+            primary = alias.alias_primary
+            alias_inst = kept.get(snakecase(alias.inst_name))
+            primary_inst = kept.get(snakecase(primary.inst_name))
+            if alias_inst is None or primary_inst is None:
+                continue
+            if alias.array_dimensions != primary.array_dimensions:
+                continue
+            effects = set()
+            bits = 0
+            for field in alias.fields():
+                if field.is_sw_writable:
+                    effects.add(utils.field_write_effect(field))
+                    bits |= ((1 << field.width) - 1) << field.low
+            if len(effects) != 1:
+                continue
+            effect, idle_bit = effects.pop()
+            if effect not in ("set", "clear") or idle_bit:
+                continue
+            method = f"{primary_inst.inst_name}_{effect}_bits"
+            if method in names:
+                # name collision, or another alias already provides this method
+                continue
+            names.add(method)
+            cfgs = sorted({c for c in (primary_inst.cfg, alias_inst.cfg) if c})
+            cfg = cfgs[0] if len(cfgs) == 1 else None
+            if len(cfgs) > 1:
+                cfg = f"all({', '.join(cfgs)})"
+            ops.append(
+                AliasBitOp(
+                    primary=primary_inst.inst_name,
+                    alias=alias_inst.inst_name,
+                    alias_type=alias_inst.type_name,
+                    op=effect,  # type: ignore[arg-type]
+                    regwidth=alias.get_property("regwidth"),
+                    bits=bits,
+                    dims=alias.array_dimensions or [],
+                    cfg=cfg,
+                )
+            )
+        return ops
+
     def enter_Addrmap(self, node: AddrmapNode) -> Optional[WalkerAction]:
         return self.enter_addrmap_or_regfile_or_memory(node)
 
@@ -366,6 +567,8 @@ class ContextScanner(RDLListener):
         return self.enter_addrmap_or_regfile_or_memory(node)
 
     def enter_Reg(self, node: RegNode) -> Optional[WalkerAction]:
+        if not self.path_filter.keep(node):
+            return WalkerAction.SkipDescendants
         file = self.get_node_module_file(node)
         if file in self.components:
             # already handled
@@ -376,6 +579,9 @@ class ContextScanner(RDLListener):
 
         reg_reset_val = 0
         fields: list[FieldInst] = []
+        # Writing this value has no side effects, unless a field is overwritten
+        idle_write_val: Optional[int] = 0
+        effect_bits = {"clear": 0, "set": 0, "toggle": 0}
         for field in node.fields():
             if not (
                 field_access := utils.field_access(
@@ -384,6 +590,18 @@ class ContextScanner(RDLListener):
             ):
                 continue
 
+            field_bits = ((1 << field.width) - 1) << field.low
+            write_effect = None
+            if "W" in field_access and self.access_mode == "software":
+                write_effect, idle_bit = utils.field_write_effect(field)
+                if write_effect is None or idle_write_val is None:
+                    # writing any value to this field changes it
+                    idle_write_val = None
+                else:
+                    effect_bits[write_effect] |= field_bits
+                    if idle_bit:
+                        idle_write_val |= field_bits
+
             encoding = field.get_property("encode")
             if encoding is not None:
                 encoding_name = (
@@ -452,6 +670,7 @@ class ContextScanner(RDLListener):
                     is_signed=field.get_property("is_signed"),
                     fracwidth=field.get_property("fracwidth"),
                     intwidth=field.get_property("intwidth"),
+                    write_effect=write_effect,
                 )
             )
 
@@ -463,6 +682,8 @@ class ContextScanner(RDLListener):
             named_type_instances=[],
             named_type_declarations=[],
             use_statements=[],
+            cfg_gates={},
+            dedup_instances=[],
             type_name=utils.rust_type_name(node),
             regwidth=node.get_property("regwidth"),
             accesswidth=node.get_property("accesswidth"),
@@ -472,11 +693,20 @@ class ContextScanner(RDLListener):
             has_sw_readable=node.has_sw_readable,
             byte_endian=self.byte_endian,
             word_endian=self.word_endian,
+            idle_write_val=idle_write_val if any(effect_bits.values()) else None,
+            clear_bits=effect_bits["clear"],
+            set_bits=effect_bits["set"],
+            toggle_bits=effect_bits["toggle"],
+            behavior=(
+                utils.reg_behavior(node) if self.access_mode == "software" else None
+            ),
         )
 
         return WalkerAction.Continue
 
     def enter_Component(self, node: Node) -> Optional[WalkerAction]:
+        if not self.path_filter.keep(node):
+            return WalkerAction.SkipDescendants
         if utils.is_anonymous(node) or isinstance(node, FieldNode):
             return WalkerAction.Continue
 
@@ -486,11 +716,22 @@ class ContextScanner(RDLListener):
         assert parent is not None
         if isinstance(parent, RootNode):
             utils.append_unique(self.top_component_modules, module_name)
+            cfg = self.feature_gates.child_cfg(
+                None, tuple(utils.crate_module_path(node))
+            )
+            if cfg is not None:
+                self.top_component_cfg_gates[module_name] = cfg
             return WalkerAction.Continue
 
         file = self.get_node_module_file(parent)
         assert file in self.components
         utils.append_unique(self.components[file].named_type_declarations, module_name)
+        cfg = self.feature_gates.child_cfg(
+            tuple(utils.crate_module_path(parent)),
+            tuple(utils.crate_module_path(node)),
+        )
+        if cfg is not None:
+            self.components[file].cfg_gates[f"named_types::{module_name}"] = cfg
 
         return WalkerAction.Continue
 
@@ -523,8 +764,16 @@ class ContextScanner(RDLListener):
             # submodule as the name of the field that uses it.
 
             # 1. Add to the declaring parent's named_type_declarations
+            cfg = self.feature_gates.child_cfg(
+                None
+                if isinstance(declaring_parent, RootNode)
+                else tuple(module_names[:-2]),
+                tuple(module_names),
+            )
             if isinstance(declaring_parent, RootNode):
                 utils.append_unique(self.top_component_modules, kw_filter(module_name))
+                if cfg is not None:
+                    self.top_component_cfg_gates[kw_filter(module_name)] = cfg
             else:
                 assert module_names[-2] == "named_types"
                 parent_path = self.file_from_modules(module_names[:-2])
@@ -533,6 +782,10 @@ class ContextScanner(RDLListener):
                     self.components[parent_path].named_type_declarations,
                     kw_filter(module_name),
                 )
+                if cfg is not None:
+                    self.components[parent_path].cfg_gates[
+                        f"named_types::{kw_filter(module_name)}"
+                    ] = cfg
 
             # 2. Add to the instantiating node's named_type_instances
             instantiating_node = field.parent
@@ -561,6 +814,20 @@ class ContextScanner(RDLListener):
                 )
             )
 
+        values = {variant.value: variant.name for variant in variants}
+        min_value = min(values)
+        max_value = max(values)
+        span = max_value - min_value + 1
+        decode: Literal["match", "range", "table"] = "match"
+        decode_table: list[Optional[str]] = []
+        if len(values) < ENUM_DECODE_MIN_VARIANTS:
+            pass
+        elif len(values) == span:
+            decode = "range"
+        elif len(values) >= ENUM_DECODE_MIN_DENSITY * span:
+            decode = "table"
+            decode_table = [values.get(v) for v in range(min_value, max_value + 1)]
+
         self.components[file] = Enum(
             file=file,
             module_comment=f"Field Enum: {node.get_property('name')}",
@@ -569,9 +836,15 @@ class ContextScanner(RDLListener):
             named_type_declarations=[],
             named_type_instances=[],
             use_statements=[],
+            cfg_gates={},
+            dedup_instances=[],
             type_name=pascalcase(encoding.type_name),
             primitive=utils.field_primitive(field, allow_bool=False),
             variants=variants,
+            decode=decode,
+            min_value=min_value,
+            max_value=max_value,
+            decode_table=decode_table,
         )
 
         return WalkerAction.Continue
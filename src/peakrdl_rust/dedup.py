@@ -0,0 +1,128 @@
+import dataclasses
+from pathlib import Path
+from typing import Optional
+
+from .component_context import Addrmap, Component, DedupInstance, Memory, Register
+from .identifier_filter import kw_filter, kw_filter_path
+
+# Fields that differ between instances of otherwise identical components,
+# and aren't referenced by anything else in the component's module
+IDENTITY_FIELDS = {"file", "module_comment", "comment", "type_name"}
+
+
+class Deduplicator:
+    """Find anonymous components that are structurally identical to another
+    component, and replace their modules with re-exports of that component.
+
+    Components are compared by their rendering context (excluding their own
+    names and doc comments) and the contexts of all their submodules, so a
+    duplicate and its whole module tree are removed."""
+
+    def __init__(
+        self,
+        components: dict[Path, Component],
+        top_component_modules: list[str],
+        top_component_cfg_gates: dict[str, str],
+    ) -> None:
+        self.components = components
+        self.top_component_modules = top_component_modules
+        self.top_component_cfg_gates = top_component_cfg_gates
+        self.signatures: dict[Path, str] = {}
+
+    def run(self) -> None:
+        # Compare the original components, before any are replaced
+        for file in self.components:
+            self.signature(file)
+
+        seen: dict[tuple[Optional[str], str], Path] = {}
+        for module in self.top_component_modules:
+            file = module_file(Path("components"), module)
+            self.visit(file, self.top_component_cfg_gates.get(module), seen)
+
+    def signature(self, file: Path) -> str:
+        if file in self.signatures:
+            return self.signatures[file]
+        comp = self.components.get(file)
+        if comp is None:
+            return ""
+
+        parts = [type(comp).__name__]
+        for field in dataclasses.fields(comp):
+            if field.name not in IDENTITY_FIELDS:
+                parts.append(repr(getattr(comp, field.name)))
+        directory = file.with_suffix("")
+        for module in comp.anon_instances:
+            parts.append(self.signature(module_file(directory, module)))
+        for module in comp.named_type_declarations:
+            parts.append(self.signature(module_file(directory / "named_types", module)))
+
+        self.signatures[file] = "\n".join(parts)
+        return self.signatures[file]
+
+    def visit(
+        self,
+        file: Path,
+        cfg: Optional[str],
+        seen: dict[tuple[Optional[str], str], Path],
+    ) -> None:
+        """Deduplicate the anonymous submodules of a component.
+
+        `cfg` is the predicate under which the component is compiled. Components
+        are only replaced by identical ones compiled under the same predicate."""
+        comp = self.components.get(file)
+        if comp is None:
+            return
+        directory = file.with_suffix("")
+
+        for module in list(comp.anon_instances):
+            child = module_file(directory, module)
+            if child not in self.components:
+                continue
+            child_cfg = comp.cfg_gates.get(module, cfg)
+            canonical = seen.setdefault((child_cfg, self.signature(child)), child)
+            if canonical == child:
+                self.visit(child, child_cfg, seen)
+            else:
+                self.replace(comp, module, child, canonical)
+
+        for module in comp.named_type_declarations:
+            child_cfg = comp.cfg_gates.get(f"named_types::{module}", cfg)
+            self.visit(module_file(directory / "named_types", module), child_cfg, seen)
+
+    def replace(
+        self, parent: Component, module: str, duplicate: Path, canonical: Path
+    ) -> None:
+        dup_comp = self.components[duplicate]
+        canonical_comp = self.components[canonical]
+        if isinstance(canonical_comp, (Addrmap, Memory)):
+            generics = "<IO = peakrdl_rust::io::PtrIO>"
+            generic_args = "<IO>"
+        else:
+            generics = generic_args = ""
+
+        parent.anon_instances.remove(module)
+        parent.dedup_instances.append(
+            DedupInstance(
+                inst_name=module,
+                module="::".join(
+                    ["_root"] + [kw_filter(p) for p in canonical.with_suffix("").parts]
+                ),
+                type_name=dup_comp.type_name,
+                canonical_type_name=canonical_comp.type_name,
+                generics=generics,
+                generic_args=generic_args,
+                write_effects=isinstance(canonical_comp, Register)
+                and canonical_comp.idle_write_val is not None,
+            )
+        )
+
+        # Remove the duplicate and everything defined within it
+        directory = duplicate.with_suffix("")
+        for file in list(self.components):
+            if file == duplicate or directory in file.parents:
+                del self.components[file]
+
+
+def module_file(directory: Path, module: str) -> Path:
+    """File defining a submodule of the module in `directory`"""
+    return directory / f"{kw_filter_path(module)}.rs"
@@ -0,0 +1,37 @@
+import os
+from typing import Optional
+
+from systemrdl.compiler import RDLCompiler
+
+
+def rdl_dependencies(
+    rdlc: RDLCompiler,
+    files: list[str],
+    incdirs: Optional[list[str]] = None,
+    defines: Optional[dict[str, str]] = None,
+) -> list[str]:
+    """Absolute paths of the input files, each followed by the files it
+    `include's, without duplicates."""
+    deps: list[str] = []
+    for file in files:
+        paths = [file]
+        if file.endswith(".rdl"):
+            # Other importers (e.g. IP-XACT) don't support includes
+            paths += sorted(rdlc.preprocess_file(file, incdirs, defines).included_files)
+        for path in paths:
+            path = os.path.abspath(path)
+            if path not in deps:
+                deps.append(path)
+    return deps
+
+
+def write_depfile(path: str, targets: list[str], dependencies: list[str]) -> None:
+    """Write a Makefile-style depfile listing the dependencies of `targets`"""
+    lines = [" ".join(escape(target) for target in targets) + ":"]
+    lines += [f"  {escape(dep)}" for dep in dependencies]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(" \\\n".join(lines) + "\n")
+
+
+def escape(path: str) -> str:
+    return path.replace(" ", "\\ ").replace("#", "\\#")
@@ -3,13 +3,19 @@ from typing import Optional
 from systemrdl.node import (
     AddrmapNode,
     FieldNode,
+    Node,
 )
 from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
 
+from .path_filter import PathFilter
+
 
 class DesignScanner(RDLListener):
-    def __init__(self, top_nodes: list[AddrmapNode]) -> None:
+    def __init__(
+        self, top_nodes: list[AddrmapNode], path_filter: Optional[PathFilter] = None
+    ) -> None:
         self.top_nodes = top_nodes
+        self.path_filter = path_filter or PathFilter(top_nodes)
         self.has_fixedpoint = False
 
     def run(self) -> None:
@@ -18,6 +24,11 @@ class DesignScanner(RDLListener):
             if self.has_fixedpoint:
                 break
 
+    def enter_Component(self, node: Node) -> Optional[WalkerAction]:
+        if not self.path_filter.keep(node):
+            return WalkerAction.SkipDescendants
+        return WalkerAction.Continue
+
     def enter_Field(self, node: FieldNode) -> Optional[WalkerAction]:
         if node.get_property("fracwidth") is not None:
             self.has_fixedpoint = True
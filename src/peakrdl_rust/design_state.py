@@ -1,19 +1,35 @@
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, Union
 
 import jinja2 as jj
 from systemrdl.node import AddrmapNode
 
+from .address_table import AddressTable, AddressTableScanner
 from .component_context import ContextScanner
+from .dedup import Deduplicator
 from .design_scanner import DesignScanner
-from .utils import kw_filter
+from .feature_gates import FeatureGates
+from .ir import SCAN_OPTIONS, DesignIR
+from .path_filter import PathFilter
+from .utils import crate_module_path, kw_filter, rust_type_name
 
 if TYPE_CHECKING:
     from peakrdl_rust.component_context import Component
 
+# Attribute placed on accessor methods for each inlining policy
+INLINE_ATTRS = {
+    "always": "#[inline(always)]",
+    "hint": "#[inline]",
+    "outlined": "#[inline(never)]",
+}
+
 
 class DesignState:
-    def __init__(self, top_nodes: list[AddrmapNode], path: str, kwargs: Any) -> None:
+    def __init__(
+        self, design: Union[list[AddrmapNode], DesignIR], path: str, kwargs: Any
+    ) -> None:
+        """Scan the top-level nodes of a design, or load an already scanned
+        design (in which case the scanning options in `kwargs` are ignored)"""
         loader = jj.FileSystemLoader(Path(__file__).resolve().parent / "templates")
         self.jj_env = jj.Environment(
             loader=loader,
@@ -23,7 +39,6 @@ class DesignState:
         )
         self.jj_env.filters["kw_filter"] = kw_filter
 
-        self.top_nodes = top_nodes
         output_dir = Path(path).resolve()
         self.template_dir = Path(__file__).resolve().parent / "templates"
 
@@ -38,40 +53,138 @@ class DesignState:
         self.fmt: bool
         self.fmt = kwargs.pop("fmt", False)
 
-        if self.top_nodes[0].get_property("bigendian", default=False):
-            default_endian = "big"
-        else:
-            default_endian = "little"
-        byte_endian = kwargs.pop("byte_endian", None) or default_endian
-        word_endian = kwargs.pop("word_endian", None) or default_endian
-        self.byte_endian: Literal["Big", "Little"] = byte_endian.capitalize()  # type: ignore
-        self.word_endian: Literal["Big", "Little"] = word_endian.capitalize()  # type: ignore
-
-        self.access_mode: str
-        self.access_mode = kwargs.pop("access_mode", "software")
-        if self.access_mode not in ("software", "hardware"):
+        self.incremental: bool
+        self.incremental = kwargs.pop("incremental", False)
+
+        scan_options = {name: kwargs.pop(name, None) for name in SCAN_OPTIONS}
+
+        self.inline: str
+        self.inline = kwargs.pop("inline", "always")
+        if self.inline not in INLINE_ATTRS:
             raise ValueError(
-                f"Invalid access_mode '{self.access_mode}'. "
-                "Must be one of: 'software', 'hardware'"
+                f"Invalid inline policy '{self.inline}'. "
+                "Must be one of: 'always', 'hint', 'outlined'"
             )
+        self.jj_env.globals["inline_attr"] = INLINE_ATTRS[self.inline]
 
-        self.read_only: bool
-        self.read_only = kwargs.pop("read_only", False)
+        self.debug_impls: str
+        self.debug_impls = kwargs.pop("debug_impls", "fields")
+        if self.debug_impls not in ("fields", "table", "none"):
+            raise ValueError(
+                f"Invalid debug_impls '{self.debug_impls}'. "
+                "Must be one of: 'fields', 'table', 'none'"
+            )
+        self.jj_env.globals["debug_impls"] = self.debug_impls
 
-        # ------------------------
-        # Collect info for export
-        # ------------------------
-        scanner = DesignScanner(self.top_nodes)
-        scanner.run()
-        self.has_fixedpoint: bool = scanner.has_fixedpoint
-
-        component_context = ContextScanner(
-            self.top_nodes,
-            self.byte_endian,
-            self.word_endian,
-            self.access_mode,
-            self.read_only,
+        # Options applied to every file rather than through its template context
+        self.render_options = (self.fmt, self.inline, self.debug_impls)
+
+        if isinstance(design, DesignIR):
+            self.ir = design
+        else:
+            self.ir = scan(design, scan_options)
+
+        options = self.ir.options
+        self.byte_endian: Literal["Big", "Little"] = options["byte_endian"]
+        self.word_endian: Literal["Big", "Little"] = options["word_endian"]
+        self.access_mode: str = options["access_mode"]
+        self.read_only: bool = options["read_only"]
+        self.address_table: bool = options["address_table"]
+        self.include: list[str] = options["include"]
+        self.exclude: list[str] = options["exclude"]
+        self.feature_gates: bool = options["feature_gates"]
+        self.dedup: bool = options["dedup"]
+
+        # Rust type path of each top-level addrmap
+        self.top_modules: list[str] = self.ir.top_modules
+        # Cargo features gating the top-level blocks
+        self.features: list[str] = self.ir.features
+        self.has_fixedpoint: bool = self.ir.has_fixedpoint
+        self.top_component_modules: list[str] = self.ir.top_component_modules
+        self.top_component_cfg_gates: dict[str, str] = self.ir.top_component_cfg_gates
+        self.components: dict[Path, Component] = self.ir.components
+        self.address_tables: list[AddressTable] = self.ir.address_tables
+
+
+def scan(top_nodes: list[AddrmapNode], kwargs: dict[str, Any]) -> DesignIR:
+    """Collect everything needed to render the generated code for the
+    top-level nodes, using the scanning options in `kwargs` (None for the
+    default)"""
+    if top_nodes[0].get_property("bigendian", default=False):
+        default_endian = "big"
+    else:
+        default_endian = "little"
+    byte_endian = (kwargs["byte_endian"] or default_endian).capitalize()
+    word_endian = (kwargs["word_endian"] or default_endian).capitalize()
+
+    access_mode = kwargs["access_mode"] or "software"
+    if access_mode not in ("software", "hardware"):
+        raise ValueError(
+            f"Invalid access_mode '{access_mode}'. "
+            "Must be one of: 'software', 'hardware'"
+        )
+
+    options: dict[str, Any] = {
+        "byte_endian": byte_endian,
+        "word_endian": word_endian,
+        "access_mode": access_mode,
+        "read_only": bool(kwargs["read_only"]),
+        "address_table": bool(kwargs["address_table"]),
+        "include": list(kwargs["include"] or []),
+        "exclude": list(kwargs["exclude"] or []),
+        "feature_gates": bool(kwargs["feature_gates"]),
+        "dedup": bool(kwargs["dedup"]),
+    }
+
+    path_filter = PathFilter(top_nodes, options["include"], options["exclude"])
+    path_filter.run()
+
+    feature_gates = FeatureGates(top_nodes, options["feature_gates"], path_filter)
+    feature_gates.run()
+
+    scanner = DesignScanner(top_nodes, path_filter)
+    scanner.run()
+
+    component_context = ContextScanner(
+        top_nodes,
+        byte_endian,  # type: ignore[arg-type]
+        word_endian,  # type: ignore[arg-type]
+        access_mode,
+        options["read_only"],
+        path_filter,
+        feature_gates,
+    )
+    component_context.run()
+
+    if options["dedup"]:
+        Deduplicator(
+            component_context.components,
+            component_context.top_component_modules,
+            component_context.top_component_cfg_gates,
+        ).run()
+
+    address_tables: list[AddressTable] = []
+    if options["address_table"]:
+        address_scanner = AddressTableScanner(
+            top_nodes, access_mode, options["read_only"], path_filter
         )
-        component_context.run()
-        self.top_component_modules: list[str] = component_context.top_component_modules
-        self.components: dict[Path, Component] = component_context.components
+        address_scanner.run()
+        address_tables = address_scanner.tables
+
+    return DesignIR(
+        options=options,
+        top_modules=[
+            "::".join(
+                ["components"]
+                + crate_module_path(node, escaped=True)
+                + [rust_type_name(node)]
+            )
+            for node in top_nodes
+        ],
+        features=feature_gates.features,
+        has_fixedpoint=scanner.has_fixedpoint,
+        top_component_modules=component_context.top_component_modules,
+        top_component_cfg_gates=component_context.top_component_cfg_gates,
+        components=component_context.components,
+        address_tables=address_tables,
+    )
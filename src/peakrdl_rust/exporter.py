@@ -1,25 +1,37 @@
 import shutil
 import subprocess
-from typing import Any, Union
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 
 from systemrdl.node import AddrmapNode, RootNode
 
 from .design_state import DesignState
-from .generator import write_module
+from .generator import render_module, write_module
+from .ir import SCAN_OPTIONS, DesignIR
+
+# Top-level SystemRDL node(s) to export, or an already scanned design
+Design = Union[RootNode, AddrmapNode, list[AddrmapNode], DesignIR]
 
 
 class RustExporter:
+    def __init__(self) -> None:
+        # Rendering options and template contexts of the files written by the
+        # previous export to each output directory, for incremental exports
+        self._exports: dict[Path, tuple[Any, dict[Path, Any]]] = {}
+
     def export(
         self,
-        node: Union[RootNode, AddrmapNode, list[AddrmapNode]],
+        node: Design,
         path: str,
         **kwargs: Any,
     ) -> None:
         """
         Parameters
         ----------
-        node: AddrmapNode
-            Top-level SystemRDL node(s) to export.
+        node: Union[RootNode, AddrmapNode, list[AddrmapNode], DesignIR]
+            Top-level SystemRDL node(s) to export, or a design already scanned
+            by `scan`, in which case the scanning options (`byte_endian`
+            through `dedup`) are ignored.
         path: str
             Output directory for generated crate. A subfolder with the name of
             the crate is generated in this directory.
@@ -27,6 +39,12 @@ class RustExporter:
             Overwrite the contents of the output directory if it already exists.
         fmt: bool
             Attempt to format the generated rust code using `rustfmt`.
+        incremental: bool
+            If this exporter has already exported to `path`, only rewrite (and
+            format) the files whose contents changed since then, and remove the
+            files that are no longer generated. If `fmt`, `inline`, or
+            `debug_impls` changed, every file is generated again. Files modified
+            by anything else in the meantime aren't detected.
         byte_endian: Optional[Literal["big", "little"]]
             Ordering of bytes within `accesswidth`-sized accesses to the register
             file. Overrides the `littleendian` and `bigendian` addrmap properties.
@@ -40,47 +58,171 @@ class RustExporter:
         read_only: bool
             Treat all registers and fields as read-only. Write-only registers and
             fields are not exposed.
+        address_table: bool
+            Generate an `address_table` module with a static, sorted table of
+            every register and memory address, for reverse lookups.
+        include: Optional[list[str]]
+            Only export the registers, regfiles, addrmaps, and memories whose
+            hierarchical path (without array indices) matches one of these glob
+            patterns, along with their descendants and the blocks containing them.
+        exclude: Optional[list[str]]
+            Do not export anything whose hierarchical path (without array indices)
+            matches one of these glob patterns, nor any of its descendants.
+        feature_gates: bool
+            Gate each block instantiated in a top-level addrmap, and the types only
+            it uses, behind a Cargo feature named after the instance. The feature
+            list is written to `features.toml` for copying into `Cargo.toml`.
+        dedup: bool
+            Generate structurally identical anonymous registers, regfiles,
+            memories, and enums only once. Other instances re-export the generated
+            module, with a type alias preserving their type name.
+        inline: str
+            Inlining policy for field getters/setters and block accessors. One of:
+            - `always` (default): `#[inline(always)]`
+            - `hint`: `#[inline]`, leaving the decision to the compiler
+            - `outlined`: `#[inline(never)]`, to minimize code size
+        debug_impls: str
+            How registers implement `Debug`. One of:
+            - `fields` (default): Call every readable field's getter
+            - `table`: Print the raw value of each readable field using a
+              static table and a function shared by all registers
+            - `none`: Don't implement `Debug` for registers
         """
-        # If it is the root node, skip to top addrmap
-        if isinstance(node, RootNode):
-            top_nodes = [node.top]
-        elif isinstance(node, AddrmapNode):
-            top_nodes = [node]
-        else:
-            top_nodes = node
+        ds = design_state(node, path, kwargs)
 
-        ds = DesignState(top_nodes, path, kwargs)
+        previous = None
+        regenerate = ds.incremental and ds.output_dir in self._exports
+        if regenerate:
+            render_options, contexts = self._exports[ds.output_dir]
+            # The rendering options affect every file, so only compare the
+            # contexts if they didn't change
+            if render_options == ds.render_options:
+                previous = contexts
+        if previous is None:
+            # Check if the output already exists (and wasn't generated by an
+            # earlier incremental export)
+            if (
+                ds.output_dir.exists()
+                and (not ds.output_dir.is_dir() or any(ds.output_dir.iterdir()))
+                and not ds.force
+                and not regenerate
+            ):
+                raise FileExistsError(
+                    f"'{ds.output_dir}' already exists (use --force to overwrite)"
+                )
 
-        # Check for stray kwargs
-        if kwargs:
-            raise TypeError(
-                f"got an unexpected keyword argument '{list(kwargs.keys())[0]}'"
-            )
+            if ds.output_dir.exists() and (
+                not ds.output_dir.is_dir() or any(ds.output_dir.iterdir())
+            ):
+                # Remove the existing output directory
+                if ds.output_dir.is_dir():
+                    shutil.rmtree(ds.output_dir)
+                else:
+                    ds.output_dir.unlink()
 
-        # Check if the output already exists
-        if (
-            ds.output_dir.exists()
-            and (not ds.output_dir.is_dir() or any(ds.output_dir.iterdir()))
-            and not ds.force
-        ):
-            raise FileExistsError(
-                f"'{ds.output_dir}' already exists (use --force to overwrite)"
+        # Write module files
+        contexts, written_files = write_module(ds, previous)
+        self._exports[ds.output_dir] = (ds.render_options, contexts)
+
+        if previous is None:
+            print(f"Generated Rust module at {ds.output_dir / 'mod.rs'}")
+        else:
+            for removed in previous.keys() - contexts.keys():
+                (ds.output_dir / removed).unlink(missing_ok=True)
+            print(
+                f"Updated {len(written_files)} of {len(contexts)} files in "
+                f"{ds.output_dir}"
             )
 
-        if ds.output_dir.exists() and (
-            not ds.output_dir.is_dir() or any(ds.output_dir.iterdir())
-        ):
-            # Remove the existing output directory
-            if ds.output_dir.is_dir():
-                shutil.rmtree(ds.output_dir)
+        rust_files = [file for file in written_files if file.suffix == ".rs"]
+        if ds.fmt and rust_files:
+            cmd = ["rustfmt"] + list(map(str, rust_files))
+            subprocess.check_call(cmd)
+
+    def scan(self, node: Design, **kwargs: Any) -> DesignIR:
+        """
+        Scan the design without rendering it, for exporting later without the
+        elaborated SystemRDL tree (see `DesignIR.save` and `DesignIR.load`).
+
+        Parameters
+        ----------
+        node: Union[RootNode, AddrmapNode, list[AddrmapNode], DesignIR]
+            Top-level SystemRDL node(s) to scan.
+        **kwargs:
+            The scanning parameters of `export`, `byte_endian` through `dedup`.
+        """
+        for name in kwargs:
+            if name not in SCAN_OPTIONS:
+                raise TypeError(f"got an unexpected keyword argument '{name}'")
+        return design_state(node, ".", kwargs).ir
+
+    def render(
+        self,
+        node: Design,
+        output: Optional[Callable[[str, str], None]] = None,
+        **kwargs: Any,
+    ) -> dict[str, str]:
+        """
+        Render the generated files in memory, without reading or writing the
+        output directory.
+
+        Parameters
+        ----------
+        node: Union[RootNode, AddrmapNode, list[AddrmapNode], DesignIR]
+            Top-level SystemRDL node(s) to export, or a design already scanned
+            by `scan`, in which case the scanning options (`byte_endian`
+            through `dedup`) are ignored.
+        output: Optional[Callable[[str, str], None]]
+            If given, each file is passed to `output` as soon as it is rendered
+            (and formatted), with its path relative to the output directory
+            (using `/` separators) and its text, instead of being collected in
+            the returned dictionary.
+        **kwargs:
+            The same parameters as `export`, except `force` and `incremental`.
+            With `fmt`, each Rust file is piped through `rustfmt`.
+
+        Returns
+        -------
+        dict[str, str]
+            Text of every generated file, keyed by its path relative to the
+            output directory (empty if `output` is given).
+        """
+        for name in ("force", "incremental"):
+            if name in kwargs:
+                raise TypeError(f"got an unexpected keyword argument '{name}'")
+        ds = design_state(node, ".", kwargs)
+        files: dict[str, str] = {}
+
+        def collect(path: Path, text: str) -> None:
+            if ds.fmt and path.suffix == ".rs":
+                text = subprocess.run(
+                    ["rustfmt"], input=text, capture_output=True, text=True, check=True
+                ).stdout
+            if output is None:
+                files[path.as_posix()] = text
             else:
-                ds.output_dir.unlink()
+                output(path.as_posix(), text)
 
-        # Write module files
-        generated_files = write_module(ds)
+        render_module(ds, collect)
+        return files
 
-        print(f"Generated Rust module at {ds.output_dir / 'mod.rs'}")
 
-        if ds.fmt:
-            cmd = ["rustfmt"] + list(map(str, generated_files))
-            subprocess.check_call(cmd)
+def design_state(node: Design, path: str, kwargs: Any) -> DesignState:
+    """Scan the design for export, consuming the export parameters in `kwargs`"""
+    # If it is the root node, skip to top addrmap
+    design: Union[list[AddrmapNode], DesignIR]
+    if isinstance(node, RootNode):
+        design = [node.top]
+    elif isinstance(node, AddrmapNode):
+        design = [node]
+    else:
+        design = node
+
+    ds = DesignState(design, path, kwargs)
+
+    # Check for stray kwargs
+    if kwargs:
+        raise TypeError(
+            f"got an unexpected keyword argument '{list(kwargs.keys())[0]}'"
+        )
+    return ds
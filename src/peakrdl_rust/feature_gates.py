@@ -0,0 +1,111 @@
+from typing import Optional
+
+from systemrdl.node import (
+    AddressableNode,
+    AddrmapNode,
+    FieldNode,
+    Node,
+    RegNode,
+    RootNode,
+)
+from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
+
+from . import utils
+from .path_filter import PathFilter
+
+
+class FeatureGates(RDLListener):
+    """Assign a Cargo feature to each block instantiated directly in a top-level
+    addrmap, and find which generated modules are only used by gated blocks.
+
+    Modules are identified by their module path under ``components``, as
+    returned by `utils.crate_module_path` and `utils.crate_enum_module_path`.
+    """
+
+    def __init__(
+        self,
+        top_nodes: list[AddrmapNode],
+        enabled: bool = False,
+        path_filter: Optional[PathFilter] = None,
+    ) -> None:
+        self.top_nodes = top_nodes
+        self.enabled = enabled
+        self.path_filter = path_filter or PathFilter(top_nodes)
+
+        # Feature names, in order of appearance
+        self.features: list[str] = []
+        # Features of the blocks using each module. None if the module is used
+        # outside of a gated block.
+        self.uses: dict[tuple[str, ...], set[Optional[str]]] = {}
+
+    def run(self) -> None:
+        if not self.enabled:
+            return
+        for node in self.top_nodes:
+            RDLWalker(unroll=False).walk(node, self)
+
+    @staticmethod
+    def feature(node: Node) -> Optional[str]:
+        """Name of the feature gating a node, or None if it isn't gated"""
+        while node.parent is not None and not isinstance(node.parent, RootNode):
+            if isinstance(node.parent.parent, RootNode):
+                if isinstance(node, RegNode):
+                    # registers in the top-level addrmap are not gated
+                    return None
+                return node.inst_name
+            node = node.parent
+        return None
+
+    def enter_Component(self, node: Node) -> Optional[WalkerAction]:
+        if not self.path_filter.keep(node):
+            return WalkerAction.SkipDescendants
+
+        if isinstance(node, AddressableNode):
+            key = tuple(utils.crate_module_path(node))
+        elif isinstance(node, FieldNode):
+            encoding = node.get_property("encode")
+            if encoding is None:
+                return WalkerAction.Continue
+            key = tuple(utils.crate_enum_module_path(node, encoding))
+        else:
+            return WalkerAction.Continue
+
+        feature = self.feature(node)
+        if feature is not None:
+            utils.append_unique(self.features, feature)
+        self.uses.setdefault(key, set()).add(feature)
+        return WalkerAction.Continue
+
+    def cfg(self, key: Optional[tuple[str, ...]]) -> Optional[str]:
+        """`cfg` predicate for a module, or None if it is always compiled"""
+        if key is None or not self.enabled:
+            return None
+        features = self.uses.get(key, {None})
+        if None in features:
+            return None
+        predicates = [
+            f'feature = "{feature}"' for feature in self.features if feature in features
+        ]
+        if len(predicates) == 1:
+            return predicates[0]
+        return f"any({', '.join(predicates)})"
+
+    def instance_cfg(self, parent: tuple[str, ...], child: Node) -> Optional[str]:
+        """`cfg` predicate for the accessor of a child instance, or None"""
+        if self.cfg(parent) is not None or not self.enabled:
+            return None
+        feature = self.feature(child)
+        if feature is None:
+            return None
+        return f'feature = "{feature}"'
+
+    def child_cfg(
+        self, parent: Optional[tuple[str, ...]], child: tuple[str, ...]
+    ) -> Optional[str]:
+        """`cfg` predicate to add where a module is declared, or None.
+
+        Only needed if the enclosing module is always compiled, since everything
+        within a gated module is already gated."""
+        if self.cfg(parent) is not None:
+            return None
+        return self.cfg(child)
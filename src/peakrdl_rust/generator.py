@@ -1,51 +1,89 @@
 from importlib.metadata import version
 from pathlib import Path
+from typing import Any, Callable, Optional
 
-from . import PEAKRDL_RUST_CRATE_MIN_VERSION, utils
+from . import PEAKRDL_RUST_CRATE_MIN_VERSION
 from .design_state import DesignState
 
 
-def write_module(ds: DesignState) -> list[Path]:
-    generated_files = []
+def write_module(
+    ds: DesignState, previous: Optional[dict[Path, Any]] = None
+) -> tuple[dict[Path, Any], list[Path]]:
+    """Render the generated files into the output directory.
+
+    Returns the template context of every generated file, keyed by its path
+    relative to the output directory, and the list of files that were written.
+    Files whose context is equal to the one in `previous` (the contexts
+    returned by an earlier call) are left as they are.
+    """
+    written: list[Path] = []
+
+    def write(path: Path, text: str) -> None:
+        out_file = ds.output_dir / path
+        out_file.parent.mkdir(parents=True, exist_ok=True)
+        out_file.write_text(text)
+        written.append(out_file)
+
+    contexts = render_module(ds, write, previous)
+    return contexts, written
+
+
+def render_module(
+    ds: DesignState,
+    output: Callable[[Path, str], None],
+    previous: Optional[dict[Path, Any]] = None,
+) -> dict[Path, Any]:
+    """Render the generated files, passing the path of each one (relative to
+    the output directory) and its text to `output`.
+
+    Returns the template context of every generated file, keyed by its path.
+    Files whose context is equal to the one in `previous` are not rendered.
+    """
+    contexts: dict[Path, Any] = {}
+
+    def render(path: Path, template_name: str, **context: Any) -> None:
+        contexts[path] = context
+        if previous is not None and previous.get(path) == context:
+            return
+        output(path, ds.jj_env.get_template(template_name).render(**context))
 
     # mod.rs
-    mod_rs_path = ds.output_dir / "mod.rs"
-    mod_rs_path.parent.mkdir(parents=True, exist_ok=True)
     if PEAKRDL_RUST_CRATE_MIN_VERSION[0] == 0:
         crate_max_version = (0, PEAKRDL_RUST_CRATE_MIN_VERSION[1] + 1, 0)
     else:
         crate_max_version = (PEAKRDL_RUST_CRATE_MIN_VERSION[0] + 1, 0, 0)
     context = {
-        "top_nodes": [
-            "::".join(
-                ["components"]
-                + utils.crate_module_path(node, escaped=True)
-                + [utils.rust_type_name(node)]
-            )
-            for node in ds.top_nodes
-        ],
+        "top_nodes": ds.top_modules,
         "peakrdl_rust_version": version("peakrdl-rust"),
         "crate_min_version": PEAKRDL_RUST_CRATE_MIN_VERSION,
         "crate_max_version": crate_max_version,
+        "address_table": ds.address_table,
+        "feature_gates": ds.feature_gates,
     }
-    with mod_rs_path.open("w") as f:
-        template = ds.jj_env.get_template("mod.rs")
-        template.stream(ctx=context).dump(f)  # type: ignore # jinja incorrectly typed
-    generated_files.append(mod_rs_path)
+    render(Path("mod.rs"), "mod.rs", ctx=context)
 
     # components.rs
-    components_rs_path = ds.output_dir / "components.rs"
-    components_rs_path.parent.mkdir(parents=True, exist_ok=True)
     context = {
         "components": ds.top_component_modules,
+        "cfg_gates": ds.top_component_cfg_gates,
     }
-    with components_rs_path.open("w") as f:
-        template = ds.jj_env.get_template("components.rs")
-        template.stream(ctx=context).dump(f)  # type: ignore # jinja incorrectly typed
-    generated_files.append(components_rs_path)
+    render(Path("components.rs"), "components.rs", ctx=context)
+
+    # address_table.rs
+    if ds.address_table:
+        context = {
+            "tables": ds.address_tables,
+        }
+        render(Path("address_table.rs"), "address_table.rs", ctx=context)
+
+    # features.toml
+    if ds.feature_gates:
+        render(Path("features.toml"), "features.toml", features=ds.features)
 
     for path, comp in ds.components.items():
-        comp.render(ds.output_dir, ds.jj_env)
-        generated_files.append(ds.output_dir / path)
+        contexts[path] = comp
+        if previous is not None and previous.get(path) == comp:
+            continue
+        output(path, comp.render(ds.jj_env))
 
-    return generated_files
+    return contexts
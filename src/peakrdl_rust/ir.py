@@ -0,0 +1,137 @@
+import dataclasses
+import hashlib
+import json
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from . import address_table, component_context
+from .address_table import AddressTable
+from .component_context import Component
+
+# Incremented whenever the layout of the IR or of the component contexts
+# changes incompatibly
+IR_VERSION = 4
+
+# Export options that affect the scanned design (all others only affect how it
+# is rendered)
+SCAN_OPTIONS = (
+    "byte_endian",
+    "word_endian",
+    "access_mode",
+    "read_only",
+    "address_table",
+    "include",
+    "exclude",
+    "feature_gates",
+    "dedup",
+)
+
+# Dataclasses that can be stored in the IR, by name
+IR_CLASSES = {
+    name: cls
+    for module in (component_context, address_table)
+    for name, cls in vars(module).items()
+    if dataclasses.is_dataclass(cls) and isinstance(cls, type)
+}
+
+
+@dataclasses.dataclass
+class DesignIR:
+    """Scanned design, everything needed to render the generated code without
+    the elaborated SystemRDL tree"""
+
+    options: dict[str, Any]  # values of the SCAN_OPTIONS used to scan the design
+    top_modules: list[str]  # Rust type path of each top-level addrmap
+    features: list[str]  # Cargo features gating the top-level blocks
+    has_fixedpoint: bool
+    top_component_modules: list[str]
+    top_component_cfg_gates: dict[str, str]
+    components: dict[Path, Component]  # keyed by their module file path
+    address_tables: list[AddressTable]
+
+    def save(self, file: Path) -> None:
+        """Write the IR to a JSON file"""
+        data = {
+            "ir_version": IR_VERSION,
+            "peakrdl_rust_version": version("peakrdl-rust"),
+            **{
+                field.name: encode(getattr(self, field.name))
+                for field in dataclasses.fields(self)
+                if field.name != "components"
+            },
+            "components": [encode(comp) for comp in self.components.values()],
+        }
+        file.write_text(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, file: Path) -> "DesignIR":
+        """Read an IR written by `save`.
+
+        Raises ValueError if it was written with a different IR version.
+        """
+        data = json.loads(file.read_text())
+        if data.get("ir_version") != IR_VERSION:
+            raise ValueError(
+                f"'{file}' has IR version {data.get('ir_version')}, "
+                f"expected {IR_VERSION}"
+            )
+        components = [decode(comp) for comp in data["components"]]
+        return cls(
+            **{
+                field.name: decode(data[field.name])
+                for field in dataclasses.fields(cls)
+                if field.name != "components"
+            },
+            components={comp.file: comp for comp in components},
+        )
+
+
+def encode(value: Any) -> Any:
+    """Convert a value of the IR to JSON-compatible types, tagging the types
+    that JSON can't represent"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__class__": type(value).__name__,
+            **{
+                field.name: encode(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            },
+        }
+    if isinstance(value, Path):
+        return {"__path__": value.as_posix()}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode(item) for item in value]}
+    if isinstance(value, list):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    return value
+
+
+def decode(value: Any) -> Any:
+    """Inverse of `encode`"""
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__tuple__" in value:
+        return tuple(decode(item) for item in value["__tuple__"])
+    fields = {key: decode(item) for key, item in value.items() if key != "__class__"}
+    if "__class__" in value:
+        return IR_CLASSES[value["__class__"]](**fields)
+    return fields
+
+
+def cache_key(files: list[str], options: dict[str, Any]) -> str:
+    """Hash of the input files, the options used to compile and scan them, and
+    the version of the exporter"""
+    h = hashlib.sha256()
+    h.update(f"{IR_VERSION} {version('peakrdl-rust')}\n".encode())
+    h.update(json.dumps(options, sort_keys=True, default=str).encode())
+    for file in files:
+        h.update(f"\n{file}\n".encode())
+        h.update(Path(file).read_bytes())
+    return h.hexdigest()
@@ -0,0 +1,97 @@
+import fnmatch
+from typing import Optional
+
+from systemrdl.node import (
+    AddressableNode,
+    AddrmapNode,
+    MemNode,
+    Node,
+    RegfileNode,
+    RootNode,
+)
+
+from . import utils
+
+
+class PathFilter:
+    """Decide which registers, regfiles, addrmaps, and memories are exported,
+    based on include/exclude globs matched against their hierarchical paths.
+
+    Paths are matched without array suffixes (e.g. ``top.blocks.ctrl`` for
+    ``top.blocks[3].ctrl``). A node is exported if it is not excluded and either
+    it or one of its ancestors matches an include pattern, or it has a
+    descendant that does. Excluding a node prunes its entire subtree.
+
+    Generated component types are shared by all instances of the same RDL type,
+    so a child is kept in a type if it is kept in any instance of that type.
+    """
+
+    def __init__(
+        self,
+        top_nodes: list[AddrmapNode],
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> None:
+        self.top_nodes = top_nodes
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.enabled = bool(self.include or self.exclude)
+        self.msg = top_nodes[0].env.msg
+
+        # Names of the children kept in each component type, keyed by
+        # the module path of the type
+        self.kept_children: dict[tuple[str, ...], set[str]] = {}
+        self.matched_patterns: set[str] = set()
+
+    def run(self) -> None:
+        if not self.enabled:
+            return
+        for node in self.top_nodes:
+            self.visit(node, included=not self.include)
+        for pattern in self.include + self.exclude:
+            if pattern not in self.matched_patterns:
+                self.msg.warning(f"Path filter '{pattern}' did not match anything")
+
+    def matches(self, path: str, patterns: list[str]) -> bool:
+        matched = False
+        for pattern in patterns:
+            if fnmatch.fnmatchcase(path, pattern):
+                self.matched_patterns.add(pattern)
+                matched = True
+        return matched
+
+    def visit(self, node: AddressableNode, included: bool) -> bool:
+        """Record the kept children of a node. Returns whether the node is kept."""
+        path = node.get_path(array_suffix="", empty_array_suffix="")
+        if self.matches(path, self.exclude):
+            return False
+        if self.matches(path, self.include):
+            included = True
+
+        if not isinstance(node, (AddrmapNode, RegfileNode)):
+            # Registers and memories are kept or pruned as a whole
+            return included
+
+        kept = self.kept_children.setdefault(type_key(node), set())
+        any_kept = False
+        for child in node.children():
+            if isinstance(child, AddressableNode) and self.visit(child, included):
+                kept.add(child.inst_name)
+                any_kept = True
+        return included or any_kept
+
+    def keep(self, node: Node) -> bool:
+        """Whether a node is exported"""
+        if not self.enabled or not isinstance(node, AddressableNode):
+            return True
+        parent = node.parent
+        if parent is None or isinstance(parent, RootNode):
+            return True
+        if isinstance(parent, MemNode):
+            # Memories are kept or pruned as a whole, with their virtual registers
+            return True
+        return node.inst_name in self.kept_children.get(type_key(parent), ())
+
+
+def type_key(node: Node) -> tuple[str, ...]:
+    return tuple(utils.crate_module_path(node))
@@ -0,0 +1,105 @@
+//! Static address-to-register lookup tables
+//!
+//! Each top-level addrmap has a sorted table covering every register,
+//! register array, and memory, with addresses relative to the base address
+//! of the addrmap. Register arrays with other registers between their
+//! elements are listed element by element. Lookups are a binary search and do
+//! not allocate.
+
+/// Kind of component described by an [`Entry`]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum EntryKind {
+    Register,
+    Memory,
+}
+
+/// Register, register array, or memory in an [`AddressTable`]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Entry {
+    /// Offset of the first element from the base address of the top-level addrmap
+    pub address: usize,
+    /// Size of each element in bytes
+    pub size: usize,
+    /// Number of elements (1 if not an array)
+    pub count: usize,
+    /// Address stride between elements
+    pub stride: usize,
+    /// Hierarchical RDL path (`[]` marks array dimensions)
+    pub path: &'static str,
+    /// Rust type path, relative to the root of the generated code
+    pub type_name: &'static str,
+    pub kind: EntryKind,
+}
+
+impl Entry {
+    /// Offset of the end of the last element
+    #[must_use]
+    pub const fn end(&self) -> usize {
+        self.address + (self.count - 1) * self.stride + self.size
+    }
+}
+
+/// Result of an [`AddressTable::lookup`]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Location {
+    pub entry: &'static Entry,
+    /// Array element index, flattened in row-major order (0 if not an array)
+    pub index: usize,
+    /// Byte offset within the element
+    pub offset: usize,
+}
+
+/// Sorted table of all addresses in a top-level addrmap
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct AddressTable {
+    entries: &'static [Entry],
+}
+
+impl AddressTable {
+    /// All entries, sorted by address
+    #[must_use]
+    pub const fn entries(&self) -> &'static [Entry] {
+        self.entries
+    }
+
+    /// Find the register or memory containing an address (relative to the
+    /// base address of the top-level addrmap).
+    ///
+    /// If several registers overlap at the address, the last one in the
+    /// table is returned.
+    #[must_use]
+    pub fn lookup(&self, address: usize) -> Option<Location> {
+        let idx = self
+            .entries
+            .partition_point(|entry| entry.address <= address)
+            .checked_sub(1)?;
+        let entry = &self.entries[idx];
+        let rel = address - entry.address;
+        let index = rel / entry.stride;
+        let offset = rel % entry.stride;
+        (index < entry.count && offset < entry.size).then_some(Location {
+            entry,
+            index,
+            offset,
+        })
+    }
+}
+{% for table in ctx.tables %}
+
+/// Address table of [`{{table.top_type}}`](super::{{table.top_type}})
+pub static {{table.name}}: AddressTable = AddressTable {
+    entries: &[
+{% for entry in table.entries %}
+        Entry {
+            address: {{"0x{:X}".format(entry.address)}},
+            size: {{"0x{:X}".format(entry.size)}},
+            count: {{entry.count}},
+            stride: {{"0x{:X}".format(entry.stride)}},
+            path: "{{entry.path}}",
+            type_name: "{{entry.type_name}}",
+            kind: EntryKind::{{entry.kind}},
+        },
+{% endfor %}
+    ],
+};
+{% endfor %}
@@ -4,5 +4,8 @@
 use super::_root; // alias to root module of generated code
 
 {% for component in ctx.components %}
+{% if component in ctx.cfg_gates %}
+#[cfg({{ctx.cfg_gates[component]}})]
+{% endif %}
 pub mod {{component|kw_filter}};
 {% endfor %}
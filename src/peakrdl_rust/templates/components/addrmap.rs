@@ -4,43 +4,65 @@
 {{macros.includes(ctx)}}
 
 {{ctx.comment}}
-#[derive(Eq, PartialEq)]
+#[derive(Clone, Copy, Eq, PartialEq)]
 {% set struct_name = ctx.type_name|kw_filter %}
-pub struct {{struct_name}}<'io, IO = peakrdl_rust::io::PtrIO> {
+pub struct {{struct_name}}<IO = peakrdl_rust::io::PtrIO> {
     ptr: *mut u8,
-    io: &'io IO,
+    io: IO,
 }
 
-unsafe impl<IO: Sync> Send for {{struct_name}}<'_, IO> {}
-unsafe impl<IO: Sync> Sync for {{struct_name}}<'_, IO> {}
+unsafe impl<IO: Send> Send for {{struct_name}}<IO> {}
+unsafe impl<IO: Sync> Sync for {{struct_name}}<IO> {}
 
-// manually implement Copy to ease generic bounds
-// (IO does not need to be Copy)
-impl<IO> Copy for {{struct_name}}<'_, IO> {}
-
-// manually implement Clone to ease generic bounds
-// (IO does not need to be Clone)
-impl<IO> Clone for {{struct_name}}<'_, IO> {
-    fn clone(&self) -> Self {
-        *self
+impl {{struct_name}} {
+    /// # Safety
+    ///
+    /// The caller must guarantee that the provided address points to a
+    /// hardware register block implementing this interface.
+    #[inline(always)]
+    #[must_use]
+    pub const unsafe fn from_ptr(ptr: *mut ()) -> Self {
+        Self { ptr: ptr.cast::<u8>(), io: peakrdl_rust::io::PtrIO }
     }
-}
 
-impl {{struct_name}}<'static> {
+    /// Instance at a fixed address.
+    ///
+    /// Assign it to a `const` so that every register access through it
+    /// compiles to an access to a constant address, without loading a base
+    /// address first.
+    ///
     /// # Safety
     ///
     /// The caller must guarantee that the provided address points to a
     /// hardware register block implementing this interface.
     #[inline(always)]
     #[must_use]
-    pub const unsafe fn from_ptr(ptr: *mut ()) -> Self {
-        Self { ptr: ptr.cast::<u8>(), io: &peakrdl_rust::io::PtrIO }
+    pub const unsafe fn from_addr(addr: usize) -> Self {
+        unsafe { Self::from_ptr(addr as *mut ()) }
     }
 }
 
-impl<'io, IO> {{struct_name}}<'io, IO> {
+impl<IO> {{struct_name}}<IO> {
     /// Size in bytes of the underlying memory
     pub const SIZE: usize = {{"0x{:_X}".format(ctx.size)}};
+{% for inst in ctx.registers + ctx.submaps + ctx.memories %}
+    {% set const_name = inst.inst_name|upper %}
+    {% if inst.cfg is not none %}
+    #[cfg({{inst.cfg}})]
+    {% endif %}
+    {% if inst.array is none %}
+    /// Offset of `{{inst.inst_name}}` from the start of this block
+    pub const {{const_name}}_OFFSET: usize = {{"0x{:_X}".format(inst.addr_offset)}};
+    {% else %}
+    /// Offset of the first element of `{{inst.inst_name}}` from the start of this block
+    pub const {{const_name}}_OFFSET: usize = {{"0x{:_X}".format(inst.array.offset)}};
+    {% if inst.cfg is not none %}
+    #[cfg({{inst.cfg}})]
+    {% endif %}
+    /// Address stride between the elements of `{{inst.inst_name}}`
+    pub const {{const_name}}_STRIDE: usize = {{"0x{:_X}".format(inst.array.stride)}};
+    {% endif %}
+{% endfor %}
 
     /// # Safety
     ///
@@ -48,7 +70,7 @@ impl<'io, IO> {{struct_name}}<'io, IO> {
     /// hardware register block implementing this interface.
     #[inline(always)]
     #[must_use]
-    pub const unsafe fn from_ptr_with(ptr: *mut (), io: &'io IO) -> Self {
+    pub const unsafe fn from_ptr_with(ptr: *mut (), io: IO) -> Self {
         Self { ptr: ptr.cast::<u8>(), io }
     }
 
@@ -59,26 +81,30 @@ impl<'io, IO> {{struct_name}}<'io, IO> {
     }
 }
 
-impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
+impl<IO: peakrdl_rust::io::RegisterIO + Copy> {{struct_name}}<IO> {
 {% for reg in ctx.registers %}
     {% set reg_type_name = reg.type_name|kw_filter %}
     {{reg.comment | indent()}}
-    #[inline(always)]
+    {% if reg.cfg is not none %}
+    #[cfg({{reg.cfg}})]
+    {% endif %}
+    {{inline_attr}}
     #[must_use]
     {% if reg.array is none %}
-    pub const fn {{reg.inst_name|kw_filter}}(&self) -> peakrdl_rust::reg::Reg<'io, {{reg_type_name}}, IO> {
+    pub const fn {{reg.inst_name|kw_filter}}(&self) -> peakrdl_rust::reg::Reg<{{reg_type_name}}, IO> {
         unsafe { peakrdl_rust::reg::Reg::from_ptr_with(self.ptr.wrapping_byte_add({{"0x{:_X}".format(reg.addr_offset)}}).cast(), self.io) }
     }
     {% else %}
-    pub const fn {{reg.inst_name|kw_filter}}(&self) -> {{reg.array.type.format("peakrdl_rust::reg::Reg<'io, " ~ reg_type_name ~ ", IO>")}} {
+    pub const fn {{reg.inst_name|kw_filter}}(&self) -> {{reg.array.type.format("peakrdl_rust::reg::Reg<" ~ reg_type_name ~ ", IO>")}} {
         // SAFETY: We will initialize every element before using the array
         let mut array = {{reg.array.type.format("core::mem::MaybeUninit::uninit()")}};
 
-        {% set expr = "unsafe { peakrdl_rust::reg::Reg::<'io, " ~ reg_type_name ~ ", IO>::from_ptr_with(self.ptr.wrapping_byte_add(" ~ reg.array.addr_offset ~ ").cast(), self.io) }"  %}
+        {% set expr = "unsafe { peakrdl_rust::reg::Reg::<" ~ reg_type_name ~ ", IO>::from_ptr_with(self.ptr.wrapping_byte_add(" ~ reg.array.addr_offset ~ ").cast(), self.io) }"  %}
         {{ macros.loop(0, reg.array.dims, expr) | indent(8) }}
 
-        // SAFETY: All elements have been initialized above
-        unsafe { core::mem::transmute(array) }
+        // SAFETY: All elements have been initialized above. `transmute` can't
+        // be used since the size of the array depends on the IO type.
+        unsafe { core::mem::transmute_copy(&array) }
     }
     {% endif %}
 
@@ -86,9 +112,12 @@ impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
 
 {% for node in ctx.submaps %}
     {% set node_type_name = node.type_name|kw_filter %}
-    {% set node_type_name_generics = node_type_name ~ "<'io, IO>" %}
+    {% set node_type_name_generics = node_type_name ~ "<IO>" %}
     {{node.comment | indent()}}
-    #[inline(always)]
+    {% if node.cfg is not none %}
+    #[cfg({{node.cfg}})]
+    {% endif %}
+    {{inline_attr}}
     #[must_use]
     {% if node.array is none %}
     pub const fn {{node.inst_name|kw_filter}}(&self) -> {{node_type_name_generics}} {
@@ -102,8 +131,9 @@ impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
         {% set expr = "unsafe { " ~ node_type_name ~ "::<IO>::from_ptr_with(self.ptr.wrapping_byte_add(" ~ node.array.addr_offset ~ ").cast(), self.io) }"  %}
         {{ macros.loop(0, node.array.dims, expr) | indent(8) }}
 
-        // SAFETY: All elements have been initialized above
-        unsafe { core::mem::transmute(array) }
+        // SAFETY: All elements have been initialized above. `transmute` can't
+        // be used since the size of the array depends on the IO type.
+        unsafe { core::mem::transmute_copy(&array) }
     }
     {% endif %}
 
@@ -111,9 +141,12 @@ impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
 
 {% for mem in ctx.memories %}
     {% set mem_type_name = mem.type_name|kw_filter %}
-    {% set mem_type_name_generics = mem_type_name ~ "<'io, IO>" %}
+    {% set mem_type_name_generics = mem_type_name ~ "<IO>" %}
     {{mem.comment | indent()}}
-    #[inline(always)]
+    {% if mem.cfg is not none %}
+    #[cfg({{mem.cfg}})]
+    {% endif %}
+    {{inline_attr}}
     #[must_use]
     {% if mem.array is none %}
     pub const fn {{mem.inst_name|kw_filter}}(&self) -> {{mem_type_name_generics}} {
@@ -127,10 +160,69 @@ impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
         {% set expr = "unsafe { " ~ mem_type_name ~ "::from_ptr_with(self.ptr.wrapping_byte_add(" ~ mem.array.addr_offset ~ ").cast(), self.io) }"  %}
         {{ macros.loop(0, mem.array.dims, expr) | indent(8) }}
 
-        // SAFETY: All elements have been initialized above
-        unsafe { core::mem::transmute(array) }
+        // SAFETY: All elements have been initialized above. `transmute` can't
+        // be used since the size of the array depends on the IO type.
+        unsafe { core::mem::transmute_copy(&array) }
     }
     {% endif %}
 
+{% endfor %}
+
+{% for op in ctx.alias_bit_ops %}
+    {% set primitive = "u" ~ op.regwidth %}
+    {% set index_params = namespace(decl="", expr="") %}
+    {% for dim in op.dims %}
+    {% set index_params.decl = index_params.decl ~ "i" ~ loop.index0 ~ ": usize, " %}
+    {% set index_params.expr = index_params.expr ~ "[i" ~ loop.index0 ~ "]" %}
+    {% endfor %}
+    {% set verb = "Set" if op.op == "set" else "Clear" %}
+    /// {{verb}} the bits of `{{op.primary}}{{index_params.expr}}` that are 1 in `mask` with a
+    /// single write to its write-1-to-{{op.op}} alias `{{op.alias}}{{index_params.expr}}`.
+    ///
+    /// Bits outside of the alias's write-1-to-{{op.op}} fields (`{{"0x{:_X}".format(op.bits)}}`) are
+    /// ignored. The register is not read.
+    {% if op.dims %}
+    ///
+    /// # Panics
+    ///
+    /// Panics if an index is out of bounds.
+    {% endif %}
+    {% if op.cfg is not none %}
+    #[cfg({{op.cfg}})]
+    {% endif %}
+    {{inline_attr}}
+    #[allow(clippy::missing_errors_doc)]
+    pub fn try_{{op.primary}}_{{op.op}}_bits(&self, {{index_params.decl}}mask: {{primitive}}) -> Result<(), IO::Error> {
+        // SAFETY: only bits of the alias's fields are set, and writing them has no
+        // effect other than the one documented above
+        let val = unsafe { <{{op.alias_type}} as peakrdl_rust::reg::Register>::from_raw(mask & {{"0x{:_X}".format(op.bits)}}) };
+        self.{{op.alias|kw_filter}}(){{index_params.expr}}.try_write_value(val)
+    }
+
+    /// {{verb}} the bits of `{{op.primary}}{{index_params.expr}}` that are 1 in `mask` with a
+    /// single write to its write-1-to-{{op.op}} alias `{{op.alias}}{{index_params.expr}}`.
+    ///
+    /// Bits outside of the alias's write-1-to-{{op.op}} fields (`{{"0x{:_X}".format(op.bits)}}`) are
+    /// ignored. The register is not read.
+    {% if op.dims %}
+    ///
+    /// # Panics
+    ///
+    /// Panics if an index is out of bounds.
+    {% endif %}
+    {% if op.cfg is not none %}
+    #[cfg({{op.cfg}})]
+    {% endif %}
+    {{inline_attr}}
+    pub fn {{op.primary}}_{{op.op}}_bits(&self, {{index_params.decl}}mask: {{primitive}})
+    where
+        IO: peakrdl_rust::io::RegisterIO<Error = core::convert::Infallible>,
+    {
+        // SAFETY: only bits of the alias's fields are set, and writing them has no
+        // effect other than the one documented above
+        let val = unsafe { <{{op.alias_type}} as peakrdl_rust::reg::Register>::from_raw(mask & {{"0x{:_X}".format(op.bits)}}) };
+        self.{{op.alias|kw_filter}}(){{index_params.expr}}.write_value(val);
+    }
+
 {% endfor %}
 }
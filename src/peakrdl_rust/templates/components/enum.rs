@@ -20,13 +20,44 @@ impl {{ctx.type_name|kw_filter}} {
     ///
     /// # Errors
     /// Returns an error if the bit pattern does not match any encoded variants.
+    {% if ctx.decode == "table" %}
+    #[allow(clippy::cast_possible_truncation)]
+    {% endif %}
     pub const fn from_bits(bits: {{ctx.primitive}}) -> Result<Self, peakrdl_rust::encode::UnknownVariant<{{ctx.primitive}}>> {
+        {% if ctx.decode == "match" %}
         match bits {
             {% for variant in ctx.variants %}
             {{variant.value}} => Ok(Self::{{variant.name|kw_filter}}),
             {% endfor %}
             bits => Err(peakrdl_rust::encode::UnknownVariant::new(bits)),
         }
+        {% elif ctx.decode == "range" and ctx.min_value == 0 and ctx.max_value == 2 ** (ctx.primitive[1:]|int) - 1 %}
+        // SAFETY: `Self` is `repr({{ctx.primitive}})` and every value is a variant
+        Ok(unsafe { core::mem::transmute::<{{ctx.primitive}}, Self>(bits) })
+        {% elif ctx.decode == "range" %}
+        match bits {
+            // SAFETY: `Self` is `repr({{ctx.primitive}})` and every value in the range is a variant
+            {{ctx.min_value}}..={{ctx.max_value}} => Ok(unsafe { core::mem::transmute::<{{ctx.primitive}}, Self>(bits) }),
+            bits => Err(peakrdl_rust::encode::UnknownVariant::new(bits)),
+        }
+        {% else %}
+        const TABLE: [Option<{{ctx.type_name|kw_filter}}>; {{ctx.decode_table|length}}] = [
+            {% for name in ctx.decode_table %}
+            {% if name is none %}
+            None,
+            {% else %}
+            Some({{ctx.type_name|kw_filter}}::{{name|kw_filter}}),
+            {% endif %}
+            {% endfor %}
+        ];
+        match bits {
+            {{ctx.min_value}}..={{ctx.max_value}} => match TABLE[{% if ctx.min_value == 0 %}bits{% else %}(bits - {{ctx.min_value}}){% endif %} as usize] {
+                Some(variant) => Ok(variant),
+                None => Err(peakrdl_rust::encode::UnknownVariant::new(bits)),
+            },
+            bits => Err(peakrdl_rust::encode::UnknownVariant::new(bits)),
+        }
+        {% endif %}
     }
 
     /// The bit pattern of the variant
@@ -4,29 +4,17 @@
 {{macros.includes(ctx)}}
 
 {{ctx.comment}}
-#[derive(Eq, PartialEq)]
+#[derive(Clone, Copy, Eq, PartialEq)]
 {% set struct_name = ctx.type_name|kw_filter %}
-pub struct {{struct_name}}<'io, IO = peakrdl_rust::io::PtrIO> {
+pub struct {{struct_name}}<IO = peakrdl_rust::io::PtrIO> {
     ptr: *mut {{ctx.primitive}},
-    io: &'io IO,
+    io: IO,
 }
 
-unsafe impl<IO: Sync> Send for {{struct_name}}<'_, IO> {}
-unsafe impl<IO: Sync> Sync for {{struct_name}}<'_, IO> {}
+unsafe impl<IO: Send> Send for {{struct_name}}<IO> {}
+unsafe impl<IO: Sync> Sync for {{struct_name}}<IO> {}
 
-// manually implement Copy to ease generic bounds
-// (IO does not need to be Copy)
-impl<IO> Copy for {{struct_name}}<'_, IO> {}
-
-// manually implement Clone to ease generic bounds
-// (IO does not need to be Clone)
-impl<IO> Clone for {{struct_name}}<'_, IO> {
-    fn clone(&self) -> Self {
-        *self
-    }
-}
-
-impl<IO> peakrdl_rust::mem::Memory for {{struct_name}}<'_, IO> {
+impl<IO> peakrdl_rust::mem::Memory for {{struct_name}}<IO> {
     type Memwidth = {{ctx.primitive}};
     type Access = peakrdl_rust::access::{{ctx.access}};
     type Endian = peakrdl_rust::endian::{{ctx.endian}}Endian;
@@ -44,7 +32,42 @@ impl<IO> peakrdl_rust::mem::Memory for {{struct_name}}<'_, IO> {
     }
 }
 
-impl {{struct_name}}<'static> {
+{% if ctx.element is not none %}
+{% set element = ctx.element %}
+impl<IO> peakrdl_rust::mem::TypedMemory for {{struct_name}}<IO> {
+    type Element = {{element.type_name}};
+
+    #[inline(always)]
+    #[allow(clippy::cast_possible_truncation)]
+    fn decode(bits: {{ctx.primitive}}) -> Self::Element {
+        let val = {% if element.bit_offset %}(bits >> {{element.bit_offset}}){% else %}bits{% endif %} & {{"0x{:_X}".format(element.mask)}};
+        {% set num_extra_bits = element.primitive[1:]|int - element.width %}
+        {% if element.is_signed and num_extra_bits > 0 %}
+        // sign extend
+        let val = (val as {{element.primitive}}).wrapping_shl({{num_extra_bits}}).wrapping_shr({{num_extra_bits}});
+        {% else %}
+        let val = val as {{element.primitive}};
+        {% endif %}
+        {% if element.fracwidth is not none %}
+        peakrdl_rust::fixedpoint::FixedPoint::from_bits(val)
+        {% else %}
+        val
+        {% endif %}
+    }
+
+    #[inline(always)]
+    fn encode(value: Self::Element) -> {{ctx.primitive}} {
+        let val = value{% if element.fracwidth is not none %}.to_bits(){% endif %} as {{ctx.primitive}};
+        {% if element.bit_offset %}
+        (val & {{"0x{:_X}".format(element.mask)}}) << {{element.bit_offset}}
+        {% else %}
+        val & {{"0x{:_X}".format(element.mask)}}
+        {% endif %}
+    }
+}
+{% endif %}
+
+impl {{struct_name}} {
     /// # Safety
     ///
     /// The caller must guarantee that the provided address points to a
@@ -52,11 +75,11 @@ impl {{struct_name}}<'static> {
     #[inline(always)]
     #[must_use]
     pub const unsafe fn from_ptr(ptr: *mut {{ctx.primitive}}) -> Self {
-        Self { ptr, io: &peakrdl_rust::io::PtrIO }
+        Self { ptr, io: peakrdl_rust::io::PtrIO }
     }
 }
 
-impl<'io, IO> {{struct_name}}<'io, IO> {
+impl<IO> {{struct_name}}<IO> {
     /// Size in bytes of the memory
     pub const SIZE: usize = {{"0x{:_X}".format(ctx.size)}};
 
@@ -66,7 +89,7 @@ impl<'io, IO> {{struct_name}}<'io, IO> {
     /// hardware memory implementing this interface.
     #[inline(always)]
     #[must_use]
-    pub const unsafe fn from_ptr_with(ptr: *mut {{ctx.primitive}}, io: &'io IO) -> Self {
+    pub const unsafe fn from_ptr_with(ptr: *mut {{ctx.primitive}}, io: IO) -> Self {
         Self { ptr, io }
     }
 
@@ -79,26 +102,27 @@ impl<'io, IO> {{struct_name}}<'io, IO> {
 
 {% if ctx.registers|length > 0 %}
 // Virtual registers
-impl<'io, IO: peakrdl_rust::io::RegisterIO> {{struct_name}}<'io, IO> {
+impl<IO: peakrdl_rust::io::RegisterIO + Copy> {{struct_name}}<IO> {
 {% for reg in ctx.registers %}
     {% set reg_type_name = reg.type_name|kw_filter %}
     {{reg.comment | indent()}}
-    #[inline(always)]
+    {{inline_attr}}
     #[must_use]
     {% if reg.array is none %}
-    pub const fn {{reg.inst_name|kw_filter}}(&self) -> peakrdl_rust::reg::Reg<'io, {{reg_type_name}}, IO> {
+    pub const fn {{reg.inst_name|kw_filter}}(&self) -> peakrdl_rust::reg::Reg<{{reg_type_name}}, IO> {
         unsafe { peakrdl_rust::reg::Reg::from_ptr_with(self.ptr.wrapping_byte_add({{"0x{:_X}".format(reg.addr_offset)}}).cast(), self.io) }
     }
     {% else %}
-    pub const fn {{reg.inst_name|kw_filter}}(&self) -> {{reg.array.type.format("peakrdl_rust::reg::Reg<'io, " ~ reg_type_name ~ ", IO>")}} {
+    pub const fn {{reg.inst_name|kw_filter}}(&self) -> {{reg.array.type.format("peakrdl_rust::reg::Reg<" ~ reg_type_name ~ ", IO>")}} {
         // SAFETY: We will initialize every element before using the array
         let mut array = {{reg.array.type.format("core::mem::MaybeUninit::uninit()")}};
 
-        {% set expr = "unsafe { peakrdl_rust::reg::Reg::<'io, " ~ reg_type_name ~ ", IO>::from_ptr_with(self.ptr.wrapping_byte_add(" ~ reg.array.addr_offset ~ ").cast(), self.io) }"  %}
+        {% set expr = "unsafe { peakrdl_rust::reg::Reg::<" ~ reg_type_name ~ ", IO>::from_ptr_with(self.ptr.wrapping_byte_add(" ~ reg.array.addr_offset ~ ").cast(), self.io) }"  %}
         {{ macros.loop(0, reg.array.dims, expr) | indent(8) }}
 
-        // SAFETY: All elements have been initialized above
-        unsafe { core::mem::transmute(array) }
+        // SAFETY: All elements have been initialized above. `transmute` can't
+        // be used since the size of the array depends on the IO type.
+        unsafe { core::mem::transmute_copy(&array) }
     }
     {% endif %}
 
@@ -29,6 +29,14 @@ impl peakrdl_rust::reg::Register for {{ctx.type_name|kw_filter}} {
     type Access = peakrdl_rust::access::{{ctx.access}};
     type ByteEndian = peakrdl_rust::endian::{{ctx.byte_endian}}Endian;
     type WordEndian = peakrdl_rust::endian::{{ctx.word_endian}}Endian;
+{% if ctx.behavior is not none %}
+    const BEHAVIOR: peakrdl_rust::model::Behavior = peakrdl_rust::model::Behavior {
+    {% for name, bits in ctx.behavior.items() %}
+        {{name}}: {{"0x{:_X}".format(bits)}},
+    {% endfor %}
+        ..peakrdl_rust::model::Behavior::NONE
+    };
+{% endif %}
 
     unsafe fn from_raw(val: Self::Regwidth) -> Self {
         Self(val)
@@ -57,7 +65,7 @@ impl {{ctx.type_name|kw_filter}} {
     {{field.comment | indent()}}
     {% set return_type = field.encoding if field.encoding else field.primitive %}
     {% set return_type = "Result<" ~ return_type ~ ", peakrdl_rust::encode::UnknownVariant<" ~ field.primitive ~">>" if not field.exhaustive else return_type %}
-    #[inline(always)]
+    {{inline_attr}}
     {% if return_type.startswith("Result<") %}
     #[allow(clippy::missing_errors_doc)]
     {% else %}
@@ -94,7 +102,7 @@ impl {{ctx.type_name|kw_filter}} {
     {# Field Fixed-Point Getter #}
     {% if field.fracwidth is not none %}
     {{field.comment | indent()}}
-    #[inline(always)]
+    {{inline_attr}}
     #[must_use]
     pub fn {{field.inst_name|kw_filter}}(&self) -> {{field.type_name}}FixedPoint {
         {{field.type_name}}FixedPoint::from_bits(self.{{field.inst_name}}_raw_())
@@ -105,7 +113,7 @@ impl {{ctx.type_name|kw_filter}} {
     {# Field Setter #}
     {% if "W" in field.access %}
     {{field.comment | indent()}}
-    #[inline(always)]
+    {{inline_attr}}
     {% set input_type = field.encoding if field.encoding else field.primitive %}
     {% if field.fracwidth is none %}
     pub {% endif -%}
@@ -123,7 +131,7 @@ impl {{ctx.type_name|kw_filter}} {
     {# Field Fixed-Point Setter #}
     {% if field.fracwidth is not none %}
     {{field.comment | indent()}}
-    #[inline(always)]
+    {{inline_attr}}
     pub fn set_{{field.inst_name}}(&mut self, val: {{field.type_name}}FixedPoint) {
         self.set_{{field.inst_name}}_raw_(val.to_bits());
     }
@@ -133,6 +141,7 @@ impl {{ctx.type_name|kw_filter}} {
 {% endfor %}
 }
 
+{% if debug_impls == "fields" %}
 impl core::fmt::Debug for {{ctx.type_name|kw_filter}} {
     fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
         f.debug_struct("{{ctx.type_name|kw_filter}}")
@@ -144,7 +153,109 @@ impl core::fmt::Debug for {{ctx.type_name|kw_filter}} {
             .finish()
     }
 }
+{% elif debug_impls == "table" %}
+impl core::fmt::Debug for {{ctx.type_name|kw_filter}} {
+    fn fmt(&self, f: &mut core::fmt::Formatter<'_>) -> core::fmt::Result {
+        const FIELDS: &[peakrdl_rust::reg::FieldInfo<u{{ctx.regwidth}}>] = &[
+            {% for field in ctx.fields %}
+            {% if "R" in field.access %}
+            peakrdl_rust::reg::FieldInfo {
+                name: "{{field.inst_name|kw_filter}}",
+                offset: {{ctx.type_name|kw_filter}}::{{field.inst_name|upper}}_OFFSET,
+                mask: {{ctx.type_name|kw_filter}}::{{field.inst_name|upper}}_MASK,
+            },
+            {% endif %}
+            {% endfor %}
+        ];
+        peakrdl_rust::reg::debug_fields(f, "{{ctx.type_name|kw_filter}}", self.0, FIELDS)
+    }
+}
+{% endif %}
+
+{% if ctx.idle_write_val is not none %}
+{% set reg_type = ctx.type_name|kw_filter %}
+{% set trait_name = ctx.type_name ~ "WriteEffects" %}
+{# the per-field method of a field named `mask` has the name of the bulk method #}
+{% set mask_effects = ctx.fields|selectattr("inst_name", "eq", "mask")|map(attribute="write_effect")|list %}
+/// Register methods for fields with write side effects (e.g., write-one-to-clear).
+///
+/// Each method performs a single write, without reading the register first.
+/// All other fields are written with a value that has no effect on them.
+pub trait {{trait_name}} {
+    type Error;
+
+{% for effect in ["clear", "set", "toggle"] %}
+{% if ctx[effect ~ "_bits"] and effect not in mask_effects %}
+    /// Try to {{effect}} the given bits of all fields which are {{effect}}ed on write.
+    ///
+    /// The mask uses the register's bit positions. Bits of other fields are ignored.
+    #[allow(clippy::missing_errors_doc)]
+    fn try_{{effect}}_mask(&self, mask: u{{ctx.regwidth}}) -> Result<(), Self::Error>;
+
+    /// {{effect|capitalize}} the given bits of all fields which are {{effect}}ed on write.
+    ///
+    /// The mask uses the register's bit positions. Bits of other fields are ignored.
+    {{inline_attr}}
+    fn {{effect}}_mask(&self, mask: u{{ctx.regwidth}})
+    where
+        Self: {{trait_name}}<Error = core::convert::Infallible>,
+    {
+        match self.try_{{effect}}_mask(mask) {
+            Ok(()) => {}
+            Err(e) => match e {},
+        }
+    }
+
+{% endif %}
+{% endfor %}
+{% for field in ctx.fields %}
+{% if field.write_effect is not none %}
+    /// Try to {{field.write_effect}} all bits of the `{{field.inst_name}}` field.
+    #[allow(clippy::missing_errors_doc)]
+    fn try_{{field.write_effect}}_{{field.inst_name}}(&self) -> Result<(), Self::Error>;
 
+    /// {{field.write_effect|capitalize}} all bits of the `{{field.inst_name}}` field.
+    {{inline_attr}}
+    fn {{field.write_effect}}_{{field.inst_name}}(&self)
+    where
+        Self: {{trait_name}}<Error = core::convert::Infallible>,
+    {
+        match self.try_{{field.write_effect}}_{{field.inst_name}}() {
+            Ok(()) => {}
+            Err(e) => match e {},
+        }
+    }
+
+{% endif %}
+{% endfor %}
+}
+
+impl<IO: peakrdl_rust::io::RegisterIO> {{trait_name}} for peakrdl_rust::reg::Reg<{{reg_type}}, IO> {
+    type Error = IO::Error;
+
+{% for effect in ["clear", "set", "toggle"] %}
+{% if ctx[effect ~ "_bits"] and effect not in mask_effects %}
+    {{inline_attr}}
+    fn try_{{effect}}_mask(&self, mask: u{{ctx.regwidth}}) -> Result<(), Self::Error> {
+        let val = {{"0x{:_X}".format(ctx.idle_write_val)}} ^ (mask & {{"0x{:_X}".format(ctx[effect ~ "_bits"])}});
+        self.try_write_value({{reg_type}}(val))
+    }
+
+{% endif %}
+{% endfor %}
+{% for field in ctx.fields %}
+{% if field.write_effect is not none %}
+    {{inline_attr}}
+    fn try_{{field.write_effect}}_{{field.inst_name}}(&self) -> Result<(), Self::Error> {
+        let val = {{"0x{:_X}".format(ctx.idle_write_val)}} ^ ({{reg_type}}::{{field.inst_name|upper}}_MASK << {{reg_type}}::{{field.inst_name|upper}}_OFFSET);
+        self.try_write_value({{reg_type}}(val))
+    }
+
+{% endif %}
+{% endfor %}
+}
+
+{% endif %}
 {% if ctx.has_sw_readable %}
 #[cfg(test)]
 mod tests {
@@ -3,6 +3,9 @@
 #[allow(clippy::cast_sign_loss)]
 #[allow(clippy::derivable_impls)]
 #[allow(clippy::doc_markdown)]
+{% if ctx.feature_gates %}
+#[allow(clippy::elidable_lifetime_names)] // accessors may all be disabled by features
+{% endif %}
 #[allow(clippy::identity_op)]
 #[allow(clippy::inline_always)]
 #[allow(clippy::let_and_return)]
@@ -11,6 +14,11 @@
 #[cfg(not(doctest))]
 pub mod components;
 
+{% if ctx.address_table %}
+#[cfg(not(doctest))]
+pub mod address_table;
+
+{% endif %}
 {% for top_node in ctx.top_nodes %}
 #[cfg(not(doctest))]
 pub use {{top_node}};
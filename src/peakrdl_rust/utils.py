@@ -9,11 +9,33 @@ from systemrdl.node import (
     RootNode,
     SignalNode,
 )
+from systemrdl.rdltypes import OnReadType, OnWriteType
 from systemrdl.rdltypes.references import PropertyReference
 from systemrdl.rdltypes.user_enum import UserEnum
 
 from peakrdl_rust.identifier_filter import kw_filter
 
+# Members of `peakrdl_rust::model::Behavior`, in declaration order
+BEHAVIOR_MASKS = (
+    "reset",
+    "read",
+    "rclr",
+    "rset",
+    "write",
+    "woclr",
+    "woset",
+    "wot",
+    "wzc",
+    "wzs",
+    "wzt",
+    "wclr",
+    "wset",
+    "singlepulse",
+    "sticky",
+    "incrsaturate",
+    "decrsaturate",
+)
+
 
 def doc_comment(node: Union[Node, UserEnum]) -> str:
     if isinstance(node, Node):
@@ -243,6 +265,55 @@ def mem_access(
             return None
 
 
+def field_write_effect(node: FieldNode) -> tuple[Union[str, None], bool]:
+    """Get the software write side effect of a field ("clear", "set", or
+    "toggle"), and the bit value that can be written without any effect.
+
+    Returns (None, False) if every write changes the field."""
+    onwrite = node.get_property("onwrite")
+    if onwrite is None:
+        return (None, False)
+    return {
+        OnWriteType.woclr: ("clear", False),
+        OnWriteType.woset: ("set", False),
+        OnWriteType.wot: ("toggle", False),
+        OnWriteType.wzc: ("clear", True),
+        OnWriteType.wzs: ("set", True),
+        OnWriteType.wzt: ("toggle", True),
+    }.get(onwrite, (None, False))
+
+
+def reg_behavior(node: RegNode) -> dict[str, int]:
+    """Software-visible behavior of the bits of a register, as the nonzero
+    members of a `peakrdl_rust::model::Behavior` (masks of the bits of all
+    fields with each property, and the reset value)"""
+    behavior = dict.fromkeys(BEHAVIOR_MASKS, 0)
+    for field in node.fields():
+        bits = ((1 << field.width) - 1) << field.low
+        behavior["reset"] |= field_reset_value(field) << field.low
+        if field.is_sw_readable:
+            behavior["read"] |= bits
+            onread = field.get_property("onread")
+            if onread in (OnReadType.rclr, OnReadType.rset):
+                behavior[onread.name] |= bits
+        if field.is_sw_writable:
+            onwrite = field.get_property("onwrite")
+            if onwrite is None or onwrite == OnWriteType.wuser:
+                behavior["write"] |= bits
+            else:
+                behavior[onwrite.name] |= bits
+        if field.get_property("singlepulse"):
+            behavior["singlepulse"] |= bits
+        if field.get_property("sticky") or field.get_property("stickybit"):
+            behavior["sticky"] |= bits
+        if field.get_property("counter"):
+            # Numeric (or referenced) limits are modeled as the field's range
+            for saturate in ("incrsaturate", "decrsaturate"):
+                if field.get_property(saturate) not in (None, False):
+                    behavior[saturate] |= bits
+    return {name: bits for name, bits in behavior.items() if bits}
+
+
 def field_primitive(node: FieldNode, allow_bool: bool = True) -> str:
     is_signed = node.get_property("is_signed")
     if node.width == 1 and is_signed is None and allow_bool:
@@ -0,0 +1,22 @@
+import os
+import time
+from typing import Optional
+
+
+def modification_times(paths: list[str]) -> dict[str, Optional[int]]:
+    """Modification time of each path, or None if it doesn't exist"""
+    mtimes: dict[str, Optional[int]] = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def wait_for_change(mtimes: dict[str, Optional[int]], interval: float = 0.25) -> None:
+    """Block until any of the files in `mtimes` is modified, created, or
+    removed, compared to the modification times from `modification_times`"""
+    paths = list(mtimes)
+    while modification_times(paths) == mtimes:
+        time.sleep(interval)
@@ -0,0 +1,35 @@
+use address_constants::AddressConstants;
+use address_constants::components::uart_t::UartT;
+
+#[test]
+fn test_offsets() {
+    assert_eq!(<AddressConstants>::CTRL_OFFSET, 0x0);
+    assert_eq!(<AddressConstants>::UART0_OFFSET, 0x4000_1000);
+    assert_eq!(<AddressConstants>::UART_OFFSET, 0x4000_2000);
+    assert_eq!(<AddressConstants>::UART_STRIDE, 0x1000);
+    assert_eq!(<AddressConstants>::SRAM_OFFSET, 0x8000_0000);
+    assert_eq!(<UartT>::CTRL_OFFSET, 0x4);
+    assert_eq!(<UartT>::BAUD_OFFSET, 0x10);
+    assert_eq!(<UartT>::BAUD_STRIDE, 0x8);
+}
+
+#[test]
+fn test_offsets_match_accessors() {
+    let mut memory = [0_u8; 0x100];
+    let base = memory.as_mut_ptr().cast::<()>();
+    let uart = unsafe { UartT::from_ptr(base) };
+    assert_eq!(uart.ctrl().as_ptr().addr(), base.addr() + <UartT>::CTRL_OFFSET);
+    assert_eq!(
+        uart.baud()[1][2].as_ptr().addr(),
+        base.addr() + <UartT>::BAUD_OFFSET + (3 + 2) * <UartT>::BAUD_STRIDE
+    );
+}
+
+#[test]
+fn test_from_addr() {
+    // Fixed instances are built in const context, and never dereferenced here
+    const TOP: AddressConstants = unsafe { AddressConstants::from_addr(0x1_0000) };
+    const UART0: UartT = unsafe { UartT::from_addr(0x1_0000 + <AddressConstants>::UART0_OFFSET) };
+    assert_eq!(TOP.uart0().as_ptr(), UART0.as_ptr());
+    assert_eq!(UART0.ctrl().as_ptr().addr(), 0x4001_1004);
+}
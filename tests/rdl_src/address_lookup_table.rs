@@ -0,0 +1,61 @@
+use address_lookup_table::address_table::{ADDRESS_LOOKUP, EntryKind};
+
+#[test]
+fn test_lookup() {
+    let loc = ADDRESS_LOOKUP.lookup(0x0).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.ctrl");
+    assert_eq!(loc.entry.kind, EntryKind::Register);
+    assert_eq!((loc.index, loc.offset), (0, 0));
+
+    let loc = ADDRESS_LOOKUP.lookup(0x1A).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.status[]");
+    assert_eq!((loc.index, loc.offset), (2, 2));
+
+    // gaps between and after registers
+    assert!(ADDRESS_LOOKUP.lookup(0x4).is_none());
+    assert!(ADDRESS_LOOKUP.lookup(0x20).is_none());
+
+    // multidimensional array with gaps between elements
+    let loc = ADDRESS_LOOKUP.lookup(0x50).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.strided[][]");
+    assert_eq!((loc.index, loc.offset), (2, 0));
+    assert!(ADDRESS_LOOKUP.lookup(0x4C).is_none());
+
+    // interleaved arrays are listed element by element
+    let loc = ADDRESS_LOOKUP.lookup(0x88).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.events[1]");
+    assert_eq!((loc.index, loc.offset), (0, 0));
+    let loc = ADDRESS_LOOKUP.lookup(0x86).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.x");
+    let loc = ADDRESS_LOOKUP.lookup(0x95).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.odd[1]");
+    assert_eq!(loc.offset, 1);
+    let loc = ADDRESS_LOOKUP.lookup(0x9B).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.events[3]");
+    assert!(ADDRESS_LOOKUP.lookup(0xA0).is_none());
+
+    // overlapping registers
+    let loc = ADDRESS_LOOKUP.lookup(0x60).unwrap();
+    assert!(["address_lookup.rx", "address_lookup.tx"].contains(&loc.entry.path));
+
+    // register arrays within block arrays
+    let loc = ADDRESS_LOOKUP.lookup(0x124).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.channels[2].b");
+    assert_eq!(loc.entry.address, 0x124);
+
+    let loc = ADDRESS_LOOKUP.lookup(0x40C).unwrap();
+    assert_eq!(loc.entry.path, "address_lookup.buffer");
+    assert_eq!(loc.entry.kind, EntryKind::Memory);
+    assert_eq!((loc.index, loc.offset), (0, 0xC));
+    assert!(ADDRESS_LOOKUP.lookup(0x440).is_none());
+}
+
+#[test]
+fn test_entries_sorted() {
+    let entries = ADDRESS_LOOKUP.entries();
+    assert!(entries.windows(2).all(|w| w[0].address <= w[1].address));
+    for entry in entries.iter().filter(|e| e.address != 0x60) {
+        assert_eq!(ADDRESS_LOOKUP.lookup(entry.address).unwrap().entry, entry);
+        assert_eq!(ADDRESS_LOOKUP.lookup(entry.end() - 1).unwrap().entry, entry);
+    }
+}
@@ -0,0 +1,36 @@
+use alias_set_clear::AliasSetClear;
+use peakrdl_rust::io::MockIO;
+use peakrdl_rust::profile::ProfileIO;
+use peakrdl_rust::reg::Register;
+
+const SIZE: usize = AliasSetClear::<()>::SIZE;
+
+#[test]
+fn test_set_clear_bits() {
+    let io: ProfileIO<MockIO<SIZE>> = ProfileIO::new(MockIO::new_zeroed());
+    let top = unsafe { AliasSetClear::from_ptr_with(io.inner().base_ptr(), &io) };
+
+    // one write to the alias, bits outside of its fields are dropped
+    top.irq_set_bits(0xFFFF_FFFF);
+    assert_eq!(top.irq_set().read().to_raw(), 0x0001_00FF);
+    top.irq_clear_bits(0x0001_0003);
+    assert_eq!(top.irq_clr().read().to_raw(), 0x0000_0003);
+    assert!(top.try_irq_set_bits(0x10).is_ok());
+
+    let total_reads: usize = io.counts().map(|c| c.total_reads()).sum();
+    let total_writes: usize = io.counts().map(|c| c.total_writes()).sum();
+    assert_eq!((total_reads, total_writes), (2, 3));
+}
+
+#[test]
+fn test_set_clear_bits_array() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { AliasSetClear::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.chan_set_bits(1, 0, 0x0001_0080);
+    assert_eq!(top.chan_set()[1][0].read().to_raw(), 0x0001_0080);
+    top.chan_clear_bits(0, 1, 0x40);
+    assert_eq!(top.chan_clr()[0][1].read().to_raw(), 0x40);
+    // the primary registers are not written
+    assert_eq!(top.chan()[1][0].read().to_raw(), 0);
+}
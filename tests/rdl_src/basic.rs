@@ -1,5 +1,7 @@
 use basic::Basic;
+use basic::components::basic::basicreg_e::BasicregE;
 use peakrdl_rust::io::MockIO;
+use peakrdl_rust::wait::{Spin, SpinBackoff, Timeout};
 
 const SIZE: usize = Basic::<()>::SIZE;
 
@@ -45,3 +47,38 @@ fn test_basic_access() {
         assert_eq!(top.basicreg_g().read().basicfield_s(), val);
     }
 }
+
+#[test]
+fn test_basic_wait() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { Basic::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.basicreg_e().write(|reg| {
+        reg.set_basicfield_h(1);
+        reg.set_basicfield_i(0x55);
+    });
+
+    const MASK: u32 = (BasicregE::BASICFIELD_H_MASK << BasicregE::BASICFIELD_H_OFFSET)
+        | (BasicregE::BASICFIELD_I_MASK << BasicregE::BASICFIELD_I_OFFSET);
+    const VALUE: u32 =
+        (1 << BasicregE::BASICFIELD_H_OFFSET) | (0x55 << BasicregE::BASICFIELD_I_OFFSET);
+    let reg = top.basicreg_e().wait_for_bits(MASK, VALUE, Spin).unwrap();
+    assert_eq!(reg.basicfield_i(), 0x55);
+
+    let backoff = SpinBackoff::new(1, 4).with_max_polls(3);
+    assert_eq!(
+        top.basicreg_e().wait_for_bits(MASK, 0, backoff),
+        Err(Timeout)
+    );
+
+    let mut polls = 0;
+    let result = top.basicreg_e().wait_until(
+        |reg| reg.basicfield_h() == 2,
+        || {
+            polls += 1;
+            polls < 10
+        },
+    );
+    assert_eq!(result, Err(Timeout));
+    assert_eq!(polls, 10);
+}
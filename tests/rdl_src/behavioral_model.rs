@@ -0,0 +1,140 @@
+use core::cell::Cell;
+
+use behavioral_model::BehavioralModel;
+use behavioral_model::components::behavioral_model::{
+    ctrl::Ctrl, events::Events, status::Status,
+};
+use peakrdl_rust::model::{Hardware, ModelIO};
+use peakrdl_rust::reg::Register;
+
+const SIZE: usize = BehavioralModel::<()>::SIZE;
+
+type Top<'a, H> = BehavioralModel<&'a ModelIO<SIZE, H>>;
+
+fn top<H: Hardware<SIZE>>(model: &ModelIO<SIZE, H>) -> Top<'_, H> {
+    unsafe { BehavioralModel::from_ptr_with(model.base_ptr(), model) }
+}
+
+#[test]
+fn test_reset_and_access() {
+    let model: ModelIO<SIZE> = ModelIO::new();
+    let top = top(&model);
+
+    let ctrl = top.ctrl().read();
+    assert_eq!((ctrl.mode(), ctrl.version()), (2, 0x12));
+    // the write-only field is only visible to the hardware
+    assert_eq!(ctrl.to_raw(), 0x1204);
+    assert_eq!(model.hw_read(&top.ctrl()), 0x1254);
+
+    // singlepulse fields clear themselves, read-only fields ignore writes
+    top.ctrl().write_value(unsafe { Ctrl::from_raw(0xFFFF) });
+    assert_eq!(top.ctrl().read().to_raw(), 0x120E);
+    assert_eq!(model.hw_read(&top.ctrl()), 0x12FE);
+
+    // wide registers are toggled and written as a whole
+    top.wide().write(|r| {
+        r.set_toggles(0xF0);
+        r.set_value(0xABCD);
+    });
+    top.wide().modify(|r| r.set_toggles(0x3C));
+    let wide = top.wide().read();
+    assert_eq!((wide.toggles(), wide.value()), (0xCC, 0xABCD));
+
+    model.reset();
+    let wide = top.wide().read();
+    assert_eq!((wide.toggles(), wide.value()), (0, 0x1234_5678));
+}
+
+#[test]
+fn test_hardware_side() {
+    let model: ModelIO<SIZE> = ModelIO::new();
+    let top = top(&model);
+
+    // read-clear and write-one-to-clear fields
+    const ERROR_DONE: u32 =
+        (Status::ERROR_MASK << Status::ERROR_OFFSET) | (Status::DONE_MASK << Status::DONE_OFFSET);
+    model.hw_write(&top.status(), ERROR_DONE, ERROR_DONE);
+    let status = top.status().read();
+    assert!(status.error() && status.done());
+    let status = top.status().read();
+    assert!(!status.error() && status.done());
+    // the interrupt is sticky, so the hardware can't clear it
+    model.hw_write(&top.status(), ERROR_DONE, 0);
+    assert!(top.status().read().done());
+    top.status().write(|r| r.set_done(true));
+    assert!(!top.status().read().done());
+
+    // saturating and wrapping counters
+    for _ in 0..3 {
+        model.hw_increment(&top.events(), Events::TRANSFERS_OFFSET, 8, 100);
+        model.hw_increment(&top.events(), Events::CYCLES_OFFSET, 8, 100);
+    }
+    let events = top.events().read();
+    assert_eq!((events.transfers(), events.cycles()), (255, 44));
+
+    // counters only saturate in the direction given by their property
+    model.hw_increment(&top.events(), Events::TRANSFERS_OFFSET, 8, 1);
+    model.hw_decrement(&top.events(), Events::TRANSFERS_OFFSET, 8, 1);
+    assert_eq!(top.events().read().transfers(), 254);
+    model.hw_decrement(&top.events(), Events::TRANSFERS_OFFSET, 8, 255);
+    model.hw_decrement(&top.events(), Events::CREDITS_OFFSET, 8, 1);
+    assert_eq!(top.events().read().transfers(), 255);
+    assert_eq!(top.events().read().credits(), 0);
+    model.hw_increment(&top.events(), Events::CREDITS_OFFSET, 8, 257);
+    assert_eq!(top.events().read().credits(), 1);
+}
+
+/// Minimal DMA engine: starting a transfer sets `busy`, which clears after
+/// `status` is polled `LATENCY` times, completing the transfer
+#[derive(Default)]
+struct Dma {
+    polls: Cell<u32>,
+}
+
+impl Dma {
+    const LATENCY: u32 = 3;
+}
+
+impl Hardware<SIZE> for Dma {
+    fn before_read(&self, model: &ModelIO<SIZE, Self>, addr: usize) {
+        let top = top(model);
+        if addr != Top::<Self>::STATUS_OFFSET || model.hw_read(&top.status()) & 1 == 0 {
+            return;
+        }
+        self.polls.set(self.polls.get() + 1);
+        if self.polls.get() == Self::LATENCY {
+            model.hw_write(&top.status(), 0b11, 0b10);
+            model.hw_increment(&top.events(), Events::TRANSFERS_OFFSET, 8, 1);
+        }
+    }
+
+    fn after_write(&self, model: &ModelIO<SIZE, Self>, addr: usize, value: u128) {
+        let top = top(model);
+        if addr == Top::<Self>::CTRL_OFFSET && value & 1 != 0 {
+            // the start pulse is still visible to the hardware
+            assert!(model.hw_read(&top.ctrl()) & 1 != 0);
+            self.polls.set(0);
+            model.hw_write(&top.status(), 1, 1);
+        }
+    }
+}
+
+#[test]
+fn test_hooks() {
+    let model = ModelIO::<SIZE, _>::with_hardware(Dma::default());
+    let top = top(&model);
+
+    for transfer in 1..=2 {
+        top.ctrl().modify(|r| r.set_start(true));
+        assert!(!top.ctrl().read().start());
+        let mut polls = 0;
+        while top.status().read().busy() {
+            polls += 1;
+        }
+        assert_eq!(polls, Dma::LATENCY - 1);
+        assert!(top.status().read().done());
+        top.status().write(|r| r.set_done(true));
+        assert_eq!(top.events().read().transfers(), transfer);
+    }
+    assert_eq!(model.hardware().polls.get(), Dma::LATENCY);
+}
@@ -0,0 +1,64 @@
+use enum_decode::{
+    components::enum_decode::named_types::{err_code::ErrCode, opcode::Opcode, state::State},
+    EnumDecode,
+};
+use peakrdl_rust::{encode::UnknownVariant, io::MockIO};
+
+const SIZE: usize = EnumDecode::<()>::SIZE;
+
+#[test]
+fn test_full_range_decode() {
+    for bits in 0..=u8::MAX {
+        assert_eq!(Opcode::from_bits(bits).map(|op| op.bits()), Ok(bits));
+    }
+    assert_eq!(Opcode::from_bits(0), Ok(Opcode::Op0));
+    assert_eq!(Opcode::from_bits(255), Ok(Opcode::Op255));
+}
+
+#[test]
+fn test_contiguous_decode() {
+    for bits in 0..=u8::MAX {
+        if (16..48).contains(&bits) {
+            assert_eq!(State::from_bits(bits).map(|s| s.bits()), Ok(bits));
+        } else {
+            assert_eq!(State::from_bits(bits), Err(UnknownVariant(bits)));
+        }
+    }
+    assert_eq!(State::from_bits(16), Ok(State::S16));
+    assert_eq!(State::from_bits(47), Ok(State::S47));
+}
+
+#[test]
+fn test_table_decode() {
+    for bits in 0..=u8::MAX {
+        if (1..=40).contains(&bits) && bits % 4 != 0 {
+            assert_eq!(ErrCode::from_bits(bits).map(|e| e.bits()), Ok(bits));
+        } else {
+            assert_eq!(ErrCode::from_bits(bits), Err(UnknownVariant(bits)));
+        }
+    }
+    assert_eq!(ErrCode::from_bits(1), Ok(ErrCode::E1));
+    assert_eq!(ErrCode::from_bits(39), Ok(ErrCode::E39));
+}
+
+#[test]
+fn test_field_decode() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { EnumDecode::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.status().write(|_| {});
+    let status = top.status().read();
+    assert_eq!(status.op(), Opcode::Op0);
+    assert_eq!(status.st(), Ok(State::S16));
+    assert_eq!(status.err(), Ok(ErrCode::E1));
+
+    top.status().write(|r| {
+        r.set_op(Opcode::Op200);
+        r.set_st(State::S33);
+        r.set_err(ErrCode::E22);
+    });
+    let status = top.status().read();
+    assert_eq!(status.op(), Opcode::Op200);
+    assert_eq!(status.st(), Ok(State::S33));
+    assert_eq!(status.err(), Ok(ErrCode::E22));
+}
@@ -0,0 +1,46 @@
+use feature_gates_enabled::FeatureGates;
+use peakrdl_rust::io::MockIO;
+
+const SIZE: usize = FeatureGates::<()>::SIZE;
+
+#[test]
+fn test_ungated() {
+    let io: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { FeatureGates::from_ptr_with(io.base_ptr(), &io) };
+    top.id().write(|r| r.set_data(0x1234));
+    assert_eq!(top.id().read().data(), 0x1234);
+}
+
+#[cfg(feature = "uart")]
+#[test]
+fn test_uart() {
+    use feature_gates_enabled::components::mode_e::ModeE;
+
+    let io: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { FeatureGates::from_ptr_with(io.base_ptr(), &io) };
+    top.uart()[1].ctrl().write(|r| r.set_mode(ModeE::On));
+    assert_eq!(top.uart()[1].ctrl().read().mode(), Ok(ModeE::On));
+    assert_eq!(top.uart()[0].ctrl().read().mode(), Ok(ModeE::Off));
+}
+
+#[cfg(feature = "timer")]
+#[test]
+fn test_timer() {
+    let io: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { FeatureGates::from_ptr_with(io.base_ptr(), &io) };
+    top.timer().count().write(|r| r.set_data(7));
+    assert_eq!(top.timer().count().read().data(), 7);
+}
+
+#[cfg(all(feature = "spare_uart", feature = "misc", feature = "buffer"))]
+#[test]
+fn test_all_blocks() {
+    use peakrdl_rust::mem::Memory;
+
+    let io: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { FeatureGates::from_ptr_with(io.base_ptr(), &io) };
+    top.spare_uart().baud().write(|r| r.set_data(9600));
+    top.misc().scratch().write(|r| r.set_data(1));
+    assert_eq!(top.spare_uart().baud().read().data(), 9600);
+    assert_eq!(top.buffer().num_entries(), 4);
+}
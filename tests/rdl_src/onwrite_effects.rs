@@ -0,0 +1,70 @@
+use onwrite_effects::OnwriteEffects;
+use onwrite_effects::components::onwrite_effects::int_status::{IntStatus, IntStatusWriteEffects};
+use onwrite_effects::components::onwrite_effects::int_mask::IntMaskWriteEffects;
+use onwrite_effects::components::onwrite_effects::int_trigger::IntTriggerWriteEffects;
+use peakrdl_rust::io::MockIO;
+use peakrdl_rust::profile::ProfileIO;
+
+const SIZE: usize = OnwriteEffects::<()>::SIZE;
+
+fn raw<R: peakrdl_rust::reg::Register>(reg: R) -> R::Regwidth {
+    reg.to_raw()
+}
+
+#[test]
+fn test_clear_without_read() {
+    let io: ProfileIO<MockIO<SIZE>> = ProfileIO::new(MockIO::new_zeroed());
+    let top = unsafe { OnwriteEffects::from_ptr_with(io.inner().base_ptr(), &io) };
+
+    // woclr fields are written with 1, everything else with its no-effect value
+    top.int_status().clear_overflow();
+    assert_eq!(raw(top.int_status().read()), 0x0001_0001);
+    top.int_status().clear_errors();
+    assert_eq!(raw(top.int_status().read()), 0x0001_00F0);
+    // wzc fields are written with 0
+    top.int_status().clear_done();
+    assert_eq!(raw(top.int_status().read()), 0x0000_0000);
+
+    // only the masked bits of clearable fields are affected
+    top.int_status()
+        .clear_mask(((IntStatus::ERRORS_MASK << IntStatus::ERRORS_OFFSET) & !0x20) | 0xFF00);
+    assert_eq!(raw(top.int_status().read()), 0x0001_00D0);
+
+    // 4 reads above, none by the clear methods
+    let total_reads: usize = io.counts().map(|c| c.total_reads()).sum();
+    let total_writes: usize = io.counts().map(|c| c.total_writes()).sum();
+    assert_eq!((total_reads, total_writes), (4, 4));
+}
+
+#[test]
+fn test_set_toggle() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { OnwriteEffects::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.int_trigger().set_start();
+    assert_eq!(raw(top.int_trigger().read()), 0b1011);
+    top.int_trigger().set_arm();
+    assert_eq!(raw(top.int_trigger().read()), 0b1000);
+    top.int_trigger().toggle_led();
+    assert_eq!(raw(top.int_trigger().read()), 0b1110);
+    top.int_trigger().toggle_mode();
+    assert_eq!(raw(top.int_trigger().read()), 0b0010);
+    top.int_trigger().set_mask(0b11);
+    assert_eq!(raw(top.int_trigger().read()), 0b1001);
+    top.int_trigger().toggle_mask(0b1100);
+    assert_eq!(raw(top.int_trigger().read()), 0b0110);
+}
+
+#[test]
+fn test_field_named_mask() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { OnwriteEffects::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.int_mask().clear_mask();
+    assert_eq!(raw(top.int_mask().read()), 0b001);
+    top.int_mask().clear_other();
+    assert_eq!(raw(top.int_mask().read()), 0b010);
+    // the bulk method of the set effect is still generated
+    top.int_mask().set_mask(0b111);
+    assert_eq!(raw(top.int_mask().read()), 0b100);
+}
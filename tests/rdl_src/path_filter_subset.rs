@@ -0,0 +1,35 @@
+use path_filter_subset::PathFilter;
+use path_filter_subset::address_table::PATH_FILTER;
+use peakrdl_rust::io::MockIO;
+
+const SIZE: usize = PathFilter::<()>::SIZE;
+
+#[test]
+fn test_retained_offsets() {
+    let io: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { PathFilter::from_ptr_with(io.base_ptr(), &io) };
+
+    top.periph().uart()[1].baud().write(|r| r.set_data(0x1234));
+    top.periph().gpio().write(|r| r.set_data(0x5678));
+    top.spare_uart().ctrl().write(|r| r.set_data(0x9ABC));
+    assert_eq!(top.periph().uart()[1].baud().read().data(), 0x1234);
+
+    let entries: Vec<_> = PATH_FILTER
+        .entries()
+        .iter()
+        .map(|e| (e.path, e.address))
+        .collect();
+    assert_eq!(
+        entries,
+        [
+            ("path_filter.periph.uart[0].ctrl", 0x100),
+            ("path_filter.periph.uart[0].baud", 0x104),
+            ("path_filter.periph.uart[1].ctrl", 0x110),
+            ("path_filter.periph.uart[1].baud", 0x114),
+            ("path_filter.periph.gpio", 0x140),
+            // kept because it is included in periph.uart[], which has the same type
+            ("path_filter.spare_uart.ctrl", 0x200),
+            ("path_filter.spare_uart.baud", 0x204),
+        ]
+    );
+}
@@ -0,0 +1,75 @@
+use peakrdl_rust::{
+    fixedpoint::FixedPoint,
+    mem::{FixedPointMemory, Memory, TypedMemory},
+};
+use typed_memories::{TypedMemories, components::typed_memories::levels::Levels};
+
+/// A block of memory used for simulating hardware registers.
+///
+/// A forced alignment of 16 bytes allows access to internal registers as
+/// primitive types.
+#[repr(align(16))]
+pub(crate) struct MockMemory<const N: usize>([u8; N]);
+
+impl<const N: usize> MockMemory<N> {
+    pub const fn new_zeroed() -> Self {
+        MockMemory([0; N])
+    }
+
+    pub const fn as_mut_ptr(&mut self) -> *mut u8 {
+        self.0.as_mut_ptr()
+    }
+}
+
+const SIZE: usize = TypedMemories::<()>::SIZE;
+static mut MOCK_MEM: MockMemory<SIZE> = MockMemory::new_zeroed();
+#[allow(static_mut_refs)]
+const TOP: TypedMemories = unsafe { TypedMemories::from_ptr(MOCK_MEM.as_mut_ptr() as _) };
+
+#[test]
+fn test_signed_memory() {
+    let mem = TOP.samples();
+    mem.write_slice(0, &[-524_288, -1, 0, 524_287]);
+    assert_eq!(mem.index(0).read(), 0x0080_0000);
+    assert_eq!(mem.index(1).read(), 0x00FF_FFF0);
+    assert_eq!(mem.index(3).read(), 0x007F_FFF0);
+
+    // bits outside of the field are ignored
+    mem.index(2).write(0xFF00_002F);
+    let mut out = [0; 4];
+    mem.read_slice(0, &mut out);
+    assert_eq!(out, [-524_288, -1, 2, 524_287]);
+}
+
+#[test]
+#[allow(clippy::float_cmp)]
+fn test_fixedpoint_memory() {
+    let mem = TOP.coefs();
+    let coefs: [f64; 64] =
+        core::array::from_fn(|i| f64::from(u8::try_from(i).unwrap()) / 32.0 - 1.0);
+    mem.write_f64(0, &coefs);
+    assert_eq!(mem.index(0).read(), 0x8000);
+    assert_eq!(mem.index(32).read(), 0);
+
+    let mut out = [0.0; 64];
+    mem.read_f64(0, &mut out);
+    assert_eq!(out, coefs);
+
+    let mut out = [FixedPoint::zero(); 2];
+    mem.read_slice(31, &mut out);
+    assert_eq!(out[0].to_bits(), -1024);
+    assert_eq!(out[1].to_bits(), 0);
+}
+
+#[test]
+#[allow(clippy::float_cmp)]
+fn test_unsigned_fixedpoint_memory() {
+    let mem = TOP.levels();
+    let element: <Levels as TypedMemory>::Element = FixedPoint::<u16, 4, 8>::from_f32(1.5);
+    assert_eq!(Levels::<()>::encode(element), 0x180);
+    assert_eq!(Levels::<()>::decode(0xFFFF_F180).to_f32(), 1.5);
+
+    let mut out = [1.0f32; 4];
+    mem.read_f32(0, &mut out);
+    assert_eq!(out, [0.0; 4]);
+}
@@ -0,0 +1,122 @@
+use core::cell::Cell;
+use core::convert::Infallible;
+
+use peakrdl_rust::io::{MockIO, RawRegisterIO};
+use peakrdl_rust::reg::RegInt;
+use wide_regs::Top;
+
+const SIZE: usize = Top::<()>::SIZE;
+
+/// Mocked tunneled transport that counts its bus transactions.
+///
+/// If `BLOCK` is true, multi-word accesses are performed as a single block
+/// transaction. Otherwise the default one-transaction-per-word fallback is used.
+struct CountingIO<const BLOCK: bool> {
+    mem: MockIO<SIZE>,
+    transactions: Cell<usize>,
+}
+
+impl<const BLOCK: bool> CountingIO<BLOCK> {
+    fn new() -> Self {
+        Self {
+            mem: MockIO::new_zeroed(),
+            transactions: Cell::new(0),
+        }
+    }
+
+    fn take_transactions(&self) -> usize {
+        self.transactions.replace(0)
+    }
+}
+
+impl<const BLOCK: bool> RawRegisterIO for CountingIO<BLOCK> {
+    type Error = Infallible;
+
+    unsafe fn try_read<T: RegInt>(&self, ptr: *const T) -> Result<T, Self::Error> {
+        self.transactions.set(self.transactions.get() + 1);
+        unsafe { self.mem.try_read(ptr) }
+    }
+
+    unsafe fn try_write<T: RegInt>(&self, ptr: *mut T, value: T) -> Result<(), Self::Error> {
+        self.transactions.set(self.transactions.get() + 1);
+        unsafe { self.mem.try_write(ptr, value) }
+    }
+
+    unsafe fn try_read_block<T: RegInt>(
+        &self,
+        ptr: *const T,
+        buf: &mut [T],
+    ) -> Result<(), Self::Error> {
+        if !BLOCK {
+            // same as the default implementation
+            for (i, word) in buf.iter_mut().enumerate() {
+                *word = unsafe { self.try_read(ptr.wrapping_add(i))? };
+            }
+            return Ok(());
+        }
+        self.transactions.set(self.transactions.get() + 1);
+        unsafe { self.mem.try_read_block(ptr, buf) }
+    }
+
+    unsafe fn try_write_block<T: RegInt>(&self, ptr: *mut T, buf: &[T]) -> Result<(), Self::Error> {
+        if !BLOCK {
+            // same as the default implementation
+            for (i, word) in buf.iter().enumerate() {
+                unsafe { self.try_write(ptr.wrapping_add(i), *word)? };
+            }
+            return Ok(());
+        }
+        self.transactions.set(self.transactions.get() + 1);
+        unsafe { self.mem.try_write_block(ptr, buf) }
+    }
+}
+
+#[test]
+fn test_wide_reg_access() {
+    let memory: MockIO<SIZE> = MockIO::new_zeroed();
+    let top = unsafe { Top::from_ptr_with(memory.base_ptr(), &memory) };
+
+    top.r4().write(|r| {
+        r.set_f1(0x0123_4567);
+        r.set_f2(0x89AB_CDEF);
+        r.set_f3(0xDEAD_BEEF);
+        r.set_f4(0xCAFE_F00D);
+    });
+    let r4 = top.r4().read();
+    assert_eq!(r4.f1(), 0x0123_4567);
+    assert_eq!(r4.f2(), 0x89AB_CDEF);
+    assert_eq!(r4.f3(), 0xDEAD_BEEF);
+    assert_eq!(r4.f4(), 0xCAFE_F00D);
+
+    top.r4().modify(|r| r.set_f3(0));
+    let r4 = top.r4().read();
+    assert_eq!(r4.f1(), 0x0123_4567);
+    assert_eq!(r4.f3(), 0);
+}
+
+#[test]
+fn test_wide_reg_transactions() {
+    // fallback: one transaction per 32-bit subword
+    let io = CountingIO::<false>::new();
+    let top = unsafe { Top::from_ptr_with(io.mem.base_ptr(), &io) };
+    top.r4().write(|r| r.set_f4(0xCAFE_F00D));
+    assert_eq!(io.take_transactions(), 4);
+    assert_eq!(top.r4().read().f4(), 0xCAFE_F00D);
+    assert_eq!(io.take_transactions(), 4);
+    top.r4().modify(|r| r.set_f1(1));
+    assert_eq!(io.take_transactions(), 8);
+
+    // block transfer: one transaction per register access
+    let io = CountingIO::<true>::new();
+    let top = unsafe { Top::from_ptr_with(io.mem.base_ptr(), &io) };
+    top.r4().write(|r| r.set_f4(0xCAFE_F00D));
+    assert_eq!(io.take_transactions(), 1);
+    assert_eq!(top.r4().read().f4(), 0xCAFE_F00D);
+    assert_eq!(io.take_transactions(), 1);
+    top.r4().modify(|r| r.set_f1(1));
+    assert_eq!(io.take_transactions(), 2);
+
+    // single-word registers never use the block transfer
+    top.r1().write(|r| r.set_f1(1));
+    assert_eq!(io.take_transactions(), 1);
+}
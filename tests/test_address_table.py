@@ -0,0 +1,11 @@
+from pathlib import Path
+
+from test_peakrdl_rust import do_cargo_test, do_clippy_check, do_export
+
+
+def test_address_table() -> None:
+    """Test exporter with the generated address lookup table."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "address_lookup.rdl"
+    crate_dir = do_export(rdl_file, "address_lookup_table", address_table=True)
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
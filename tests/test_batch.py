@@ -0,0 +1,98 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_batch() -> None:
+    """Test exporting several top-level designs in one invocation."""
+    output_dir = Path(__file__).parent / "output" / "batch"
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    rdl_file = output_dir / "batch.rdl"
+    rdl_file.write_text(
+        "reg ctrl_t #(longint unsigned WIDTH = 8) {\n"
+        "    field { sw = rw; } data[WIDTH];\n"
+        "};\n"
+        "addrmap uart #(longint unsigned WIDTH = 8) {\n"
+        "    ctrl_t #(.WIDTH(WIDTH)) ctrl;\n"
+        "};\n"
+        "addrmap spi { ctrl_t ctrl; };\n"
+    )
+    batch_file = output_dir / "batch.json"
+    batch_file.write_text(
+        json.dumps(
+            [
+                {"top": "uart", "rename": "uart0", "parameters": {"WIDTH": "16"}},
+                {"top": "uart", "rename": "uart1"},
+                {"top": "spi", "byte_endian": "big"},
+            ]
+        )
+    )
+
+    generated_dir = output_dir / "generated"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "peakrdl",
+            "rust",
+            str(rdl_file),
+            "-o",
+            str(generated_dir),
+            "--force",
+            "--batch",
+            str(batch_file),
+            "--depfile",
+            str(output_dir / "batch.d"),
+        ],
+        check=True,
+    )
+
+    assert sorted(p.name for p in generated_dir.iterdir()) == ["spi", "uart0", "uart1"]
+    # Each design is elaborated with its own parameters and options
+    assert (generated_dir / "uart0" / "components" / "uart_width_10.rs").exists()
+    assert (generated_dir / "uart1" / "components" / "uart.rs").exists()
+    spi_ctrl = (generated_dir / "spi" / "components" / "ctrl_t.rs").read_text()
+    assert "type ByteEndian = peakrdl_rust::endian::BigEndian;" in spi_ctrl
+
+    depfile = (output_dir / "batch.d").read_text()
+    for name in ("spi", "uart0", "uart1"):
+        assert str(generated_dir / name / "mod.rs") in depfile
+    assert str(batch_file.resolve()) in depfile
+
+
+def test_batch_duplicate_names() -> None:
+    """Test that designs exported to the same directory are rejected."""
+    output_dir = Path(__file__).parent / "output" / "batch_duplicate"
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    rdl_file = output_dir / "batch.rdl"
+    rdl_file.write_text(
+        "addrmap uart { reg { field { sw = rw; } data[8]; } ctrl; };\n"
+        "addrmap spi { reg { field { sw = rw; } data[8]; } ctrl; };\n"
+    )
+    batch_file = output_dir / "batch.json"
+    batch_file.write_text(
+        json.dumps([{"top": "uart"}, {"top": "spi"}, {"top": "spi", "rename": "uart"}])
+    )
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "peakrdl",
+            "rust",
+            str(rdl_file),
+            "-o",
+            str(output_dir / "generated"),
+            "--force",
+            "--batch",
+            str(batch_file),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "designs 0 ('uart') and 2 ('spi')" in result.stderr
+    assert not (output_dir / "generated").exists()
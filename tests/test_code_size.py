@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+from test_peakrdl_rust import do_cargo_test, do_clippy_check, do_export
+
+
+def test_outlined_table_debug() -> None:
+    """Test exporter with outlined accessors and table-driven Debug impls."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "turboencabulator.rdl"
+    crate_dir = do_export(
+        rdl_file, "code_size_outlined", inline="outlined", debug_impls="table"
+    )
+
+    components = crate_dir / "src" / "generated" / "components" / "turbo_encab"
+    top = (components.parent / "turbo_encab.rs").read_text()
+    assert "#[inline(never)]" in top
+    ctrl = (components / "ctrl.rs").read_text()
+    assert "peakrdl_rust::reg::debug_fields(" in ctrl
+
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
+
+
+def test_hint_no_debug() -> None:
+    """Test exporter with inline hints and without Debug impls."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "turboencabulator.rdl"
+    crate_dir = do_export(rdl_file, "code_size_hint", inline="hint", debug_impls="none")
+
+    components = crate_dir / "src" / "generated" / "components" / "turbo_encab"
+    ctrl = (components / "ctrl.rs").read_text()
+    assert "#[inline]" in ctrl
+    assert "impl core::fmt::Debug" not in ctrl
+
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
+
+
+def test_invalid_policies() -> None:
+    """Test that invalid inline and debug_impls options raise ValueError."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "turboencabulator.rdl"
+    with pytest.raises(ValueError, match="Invalid inline policy"):
+        do_export(rdl_file, "code_size_invalid", inline="sometimes")
+    with pytest.raises(ValueError, match="Invalid debug_impls"):
+        do_export(rdl_file, "code_size_invalid", debug_impls="verbose")
@@ -0,0 +1,74 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CRATE_DIR = Path(__file__).parent / ".." / "crates" / "codegen-bench"
+OUTPUT_DIR = Path(__file__).parent / "output"
+
+# Expected (volatile loads, volatile stores) for each probe function in
+# crates/codegen-bench/src/lib.rs
+EXPECTED_ACCESSES = {
+    "probe_turbo_ctrl_read": (1, 0),
+    "probe_turbo_ctrl_write": (0, 1),
+    "probe_turbo_ctrl_modify": (1, 1),
+    "probe_turbo_ctrl_modify_fixed": (1, 1),
+    "probe_turbo_grammeter_modify": (1, 1),
+    "probe_wide_r1_read": (1, 0),
+    "probe_wide_r4_read": (4, 0),
+    "probe_wide_r4_write": (0, 4),
+    "probe_wide_r4_modify": (4, 4),
+    "probe_wide_r4_read_wide_io": (1, 0),
+    "probe_wide_r4_modify_wide_io": (1, 1),
+}
+
+
+def emit_llvm_ir() -> str:
+    """Build the codegen-bench crate in release mode and return its LLVM IR."""
+    # Point the build script at the exporter in this environment
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    generator = OUTPUT_DIR / "peakrdl-rust"
+    generator.write_text(f'#!/bin/sh\nexec "{sys.executable}" -m peakrdl rust "$@"\n')
+    generator.chmod(0o755)
+
+    env = os.environ.copy()
+    env["PEAKRDL_RUST_BINARY"] = str(generator.resolve())
+    env["CARGO_TARGET_DIR"] = str(OUTPUT_DIR / "target-codegen")
+    subprocess.run(
+        ["cargo", "rustc", "--release", "--lib", "--", "--emit=llvm-ir"],
+        cwd=CRATE_DIR,
+        check=True,
+        env=env,
+    )
+
+    deps_dir = OUTPUT_DIR / "target-codegen" / "release" / "deps"
+    ir_file = max(deps_dir.glob("codegen_bench-*.ll"), key=lambda p: p.stat().st_mtime)
+    return ir_file.read_text()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="generator wrapper is a shell script")
+def test_codegen_volatile_accesses() -> None:
+    """Check that generated accessors compile to the minimal number of
+    volatile loads and stores, with no out-of-line calls."""
+    ir = emit_llvm_ir()
+
+    functions = {
+        m.group(1): m.group(0)
+        for m in re.finditer(r"^define [^\n]*@(probe_\w+)\(.*?^}", ir, re.M | re.S)
+    }
+    assert set(functions) == set(EXPECTED_ACCESSES)
+
+    for name, (loads, stores) in EXPECTED_ACCESSES.items():
+        body = functions[name]
+        assert body.count("load volatile") == loads, name
+        assert body.count("store volatile") == stores, name
+        calls = re.findall(r"\b(?:call|invoke)\b[^@\n]*@([\w.$]+)", body)
+        assert [c for c in calls if not c.startswith("llvm.")] == [], name
+
+    # Accesses through a `const` instance use the constant address directly (an
+    # integer of the target's pointer width)
+    fixed = functions["probe_turbo_ctrl_modify_fixed"]
+    assert len(re.findall(r"inttoptr \(i(?:32|64) 1073741824 to ptr\)", fixed)) == 2
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from test_peakrdl_rust import do_cargo_test, do_clippy_check, do_export
+
+
+def test_dedup() -> None:
+    """Test exporter with deduplication of identical anonymous components."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "dedup.rdl"
+    crate_dir = do_export(rdl_file, "dedup_enabled", dedup=True)
+
+    # Duplicates of ctrl_a, irq_a, and fifo_a (and their submodules) aren't generated
+    components = crate_dir / "src" / "generated" / "components" / "dedup"
+    modules = {p.relative_to(components).as_posix() for p in components.rglob("*.rs")}
+    assert modules == {
+        "ctrl_a.rs",
+        "ctrl_a/mode.rs",
+        "ctrl_c.rs",
+        "fifo_a.rs",
+        "fifo_a/data.rs",
+        "fifo_a/status.rs",
+        "irq_a.rs",
+    }
+
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from peakrdl_rust.depfile import escape
+
+
+def test_depfile() -> None:
+    """Test that the depfile lists the input, included, and config files."""
+    output_dir = Path(__file__).parent / "output" / "depfile"
+    src_dir = output_dir / "rdl src"
+    src_dir.mkdir(exist_ok=True, parents=True)
+
+    (src_dir / "regs.rdl").write_text(
+        "reg ctrl_t { field { sw = rw; } en; };\n",
+    )
+    (src_dir / "top.rdl").write_text(
+        '`include "regs.rdl"\naddrmap depfile { ctrl_t ctrl; };\n',
+    )
+    cfg_file = src_dir / "peakrdl.toml"
+    cfg_file.write_text("[rust]\nread_only = false\n")
+
+    depfile = output_dir / "depfile.d"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "peakrdl",
+            "rust",
+            str(src_dir / "top.rdl"),
+            "--peakrdl-cfg",
+            str(cfg_file),
+            "-o",
+            str(output_dir / "generated"),
+            "--force",
+            "--depfile",
+            str(depfile),
+        ],
+        check=True,
+    )
+
+    def dep(name: str) -> str:
+        return escape(str((src_dir / name).resolve()))
+
+    assert depfile.read_text().splitlines() == [
+        f"{escape(str(output_dir / 'generated' / 'mod.rs'))}: \\",
+        f"  {dep('top.rdl')} \\",
+        f"  {dep('regs.rdl')} \\",
+        f"  {dep('peakrdl.toml')}",
+    ]
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from test_peakrdl_rust import do_cargo_test, do_clippy_check, do_export
+
+
+def test_feature_gates() -> None:
+    """Test exporter with top-level blocks gated behind Cargo features."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "feature_gates.rdl"
+    crate_dir = do_export(rdl_file, "feature_gates_enabled", feature_gates=True)
+    features = (crate_dir / "src" / "generated" / "features.toml").read_text()
+    for feature in ["uart", "spare_uart", "timer", "misc", "buffer"]:
+        assert f"\n{feature} = []\n" in features
+    assert "\nid = []\n" not in features
+
+    # no blocks, one block, and all blocks enabled
+    for args in [(), ("--features", "timer"), ("--all-features",)]:
+        do_cargo_test(crate_dir, *args)
+        do_clippy_check(crate_dir, *args)
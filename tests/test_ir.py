@@ -0,0 +1,75 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from test_peakrdl_rust import elaborate
+
+from peakrdl_rust.exporter import RustExporter
+from peakrdl_rust.ir import DesignIR
+
+RDL_FILE = Path(__file__).parent / "rdl_src" / "turboencabulator.rdl"
+
+
+def test_ir_round_trip(tmp_path: Path) -> None:
+    """Test that a saved IR loads back unchanged and renders the same files as
+    the elaborated design."""
+    top = elaborate(RDL_FILE)
+    x = RustExporter()
+    ir = x.scan(top, dedup=True, address_table=True)
+    ir_file = tmp_path / "design.json"
+    ir.save(ir_file)
+    loaded = DesignIR.load(ir_file)
+    assert loaded == ir
+
+    for inline in ("always", "outlined"):
+        # The scanning options are taken from the IR
+        assert x.render(loaded, inline=inline, dedup=False) == x.render(
+            top, inline=inline, dedup=True, address_table=True
+        )
+
+    with pytest.raises(TypeError, match="'inline'"):
+        x.scan(top, inline="hint")
+
+
+def test_ir_version_mismatch(tmp_path: Path) -> None:
+    """Test that an IR saved by an incompatible version isn't loaded."""
+    ir_file = tmp_path / "design.json"
+    RustExporter().scan(elaborate(RDL_FILE)).save(ir_file)
+    data = json.loads(ir_file.read_text())
+    data["ir_version"] = 0
+    ir_file.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="IR version 0"):
+        DesignIR.load(ir_file)
+
+
+def test_ir_cache() -> None:
+    """Test that --ir-cache stores the scanned design once per input and
+    scanning options, and exports the same files from the cache."""
+    output_dir = Path(__file__).parent / "output" / "ir_cache"
+    cache_dir = output_dir / "cache"
+    rdl_file = output_dir / "top.rdl"
+    output_dir.mkdir(exist_ok=True, parents=True)
+    rdl_file.write_text("addrmap ir_cache { reg { field { sw = rw; } en; } ctrl; };\n")
+    for path in cache_dir.glob("*.json"):
+        path.unlink()
+
+    def export(name: str, *args: str) -> dict[str, str]:
+        generated_dir = output_dir / name
+        cmd = [sys.executable, "-m", "peakrdl", "rust", str(rdl_file), "--force"]
+        cmd += ["-o", str(generated_dir), *args]
+        subprocess.run(cmd, check=True)
+        return {
+            path.relative_to(generated_dir).as_posix(): path.read_text()
+            for path in generated_dir.rglob("*")
+            if path.is_file()
+        }
+
+    expected = export("uncached", "--inline", "hint")
+    assert export("miss", "--ir-cache", str(cache_dir)) != expected
+    assert export("hit", "--ir-cache", str(cache_dir), "--inline", "hint") == expected
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    export("read_only", "--ir-cache", str(cache_dir), "--read-only")
+    assert len(list(cache_dir.glob("*.json"))) == 2
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from test_peakrdl_rust import do_cargo_test, do_clippy_check, do_export
+
+
+def test_path_filter() -> None:
+    """Test exporter with include/exclude path filters."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "path_filter.rdl"
+    crate_dir = do_export(
+        rdl_file,
+        "path_filter_subset",
+        include=["path_filter.periph", "path_filter.spare_uart.ctrl"],
+        exclude=["*.debug"],
+        address_table=True,
+    )
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
+
+
+def test_path_filter_memory() -> None:
+    """Test that memories kept by a path filter keep their virtual registers."""
+    rdl_file = Path(__file__).parent / "rdl_src" / "memories.rdl"
+    crate_dir = do_export(
+        rdl_file, "path_filter_memories", exclude=["memories.mem_2_32_w"]
+    )
+    components = crate_dir / "src" / "generated" / "components" / "memories"
+    assert not (components / "mem_2_32_w.rs").exists()
+    memory = (components / "mem_virt_registers.rs").read_text()
+    assert "fn virt(" in memory
+    assert "fn virt2(" in memory
+    do_cargo_test(crate_dir)
+    do_clippy_check(crate_dir)
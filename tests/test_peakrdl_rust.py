@@ -14,12 +14,24 @@ from peakrdl_rust.udps import ALL_UDPS
 if TYPE_CHECKING:
     from systemrdl.node import AddrmapNode
 
+UDP_FILE = Path(__file__).parent / ".." / "src" / "peakrdl_rust" / "udps" / "udps.rdl"
+
 
 def get_rdl_files() -> list[Path]:
     rdl_src_dir = Path(__file__).parent / "rdl_src"
     return list(rdl_src_dir.glob("*.rdl"))
 
 
+def elaborate(rdl_file: Path) -> "AddrmapNode":
+    """Elaborate the last top-level addrmap of an RDL file, with the UDPs"""
+    rdlc = RDLCompiler()
+    for udp in ALL_UDPS:
+        rdlc.register_udp(udp)
+    rdlc.compile_file(str(UDP_FILE))
+    rdlc.compile_file(str(rdl_file))
+    return rdlc.elaborate().top
+
+
 def do_export(rdl_file: Path, test_name: Optional[str] = None, **export_kwargs) -> Path:
     if test_name is None:
         test_name = rdl_file.stem.replace("-", "_")
@@ -48,8 +60,7 @@ def do_export(rdl_file: Path, test_name: Optional[str] = None, **export_kwargs)
     for udp in ALL_UDPS:
         rdlc.register_udp(udp)
     # ... including the definition
-    udp_file = Path(__file__).parent / "../src/peakrdl_rust/udps/udps.rdl"
-    rdlc.compile_file(str(udp_file))
+    rdlc.compile_file(str(UDP_FILE))
 
     rdlc.compile_file(str(rdl_file))
 
@@ -93,8 +104,11 @@ def do_export(rdl_file: Path, test_name: Optional[str] = None, **export_kwargs)
         trim_blocks=True,
         lstrip_blocks=True,
     )
+    # Cargo features gating the generated code, if any
+    features_toml = generated_dir / "features.toml"
     context = {
         "test_name": test_name,
+        "features": features_toml.read_text() if features_toml.exists() else "",
     }
     with open(crate_dir / "Cargo.toml", "w") as f:
         jj_env.get_template("Cargo.toml.jinja2").stream(ctx=context).dump(f)  # type: ignore # jinja incorrectly typed
@@ -104,20 +118,20 @@ def do_export(rdl_file: Path, test_name: Optional[str] = None, **export_kwargs)
     return crate_dir
 
 
-def do_cargo_test(crate_dir: Path) -> None:
+def do_cargo_test(crate_dir: Path, *cargo_args: str) -> None:
     # shared target directory to cache compiled dependencies
     env = os.environ.copy()
     env["CARGO_TARGET_DIR"] = str(Path(__file__).parent / "output" / "target")
     env["RUSTFLAGS"] = "-D warnings"
-    subprocess.run(["cargo", "test"], cwd=crate_dir, check=True, env=env)
+    subprocess.run(["cargo", "test", *cargo_args], cwd=crate_dir, check=True, env=env)
 
 
-def do_clippy_check(crate_dir: Path) -> None:
+def do_clippy_check(crate_dir: Path, *cargo_args: str) -> None:
     # shared target directory to cache compiled dependencies
     env = os.environ.copy()
     env["CARGO_TARGET_DIR"] = str(Path(__file__).parent / "output" / "target")
     subprocess.run(
-        ["cargo", "clippy", "--", "-W", "clippy::pedantic", "-Dwarnings"],
+        ["cargo", "clippy", *cargo_args, "--", "-W", "clippy::pedantic", "-Dwarnings"],
         cwd=crate_dir,
         check=True,
         env=env,
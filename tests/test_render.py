@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+from test_peakrdl_rust import elaborate
+
+from peakrdl_rust.exporter import RustExporter
+
+RDL_FILE = Path(__file__).parent / "rdl_src" / "turboencabulator.rdl"
+
+
+@pytest.mark.parametrize("fmt", [False, True])
+def test_render_matches_export(fmt: bool) -> None:
+    """Test that rendering in memory produces the same files as an export."""
+    top = elaborate(RDL_FILE)
+    output_dir = Path(__file__).parent / "output" / f"render_fmt_{fmt}"
+    RustExporter().export(top, str(output_dir), force=True, fmt=fmt, dedup=True)
+    exported = {
+        path.relative_to(output_dir).as_posix(): path.read_text()
+        for path in output_dir.rglob("*")
+        if path.is_file()
+    }
+
+    rendered = RustExporter().render(top, fmt=fmt, dedup=True)
+    assert rendered == exported
+
+
+def test_render_callback() -> None:
+    """Test that rendered files can be streamed to a callback."""
+    top = elaborate(RDL_FILE)
+    streamed: list[str] = []
+    rendered = RustExporter().render(top, lambda path, text: streamed.append(path))
+    assert rendered == {}
+    assert streamed[:2] == ["mod.rs", "components.rs"]
+    assert "components/turbo_encab.rs" in streamed
+
+    with pytest.raises(TypeError, match="'force'"):
+        RustExporter().render(top, force=True)
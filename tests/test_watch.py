@@ -0,0 +1,87 @@
+import threading
+from pathlib import Path
+
+from test_peakrdl_rust import elaborate
+
+from peakrdl_rust.exporter import RustExporter
+from peakrdl_rust.watch import modification_times, wait_for_change
+
+
+def test_incremental_export() -> None:
+    """Test that incremental exports only rewrite the files that changed."""
+    output_dir = Path(__file__).parent / "output" / "watch"
+    output_dir.mkdir(exist_ok=True, parents=True)
+    rdl_file = output_dir / "watch.rdl"
+    rdl_file.write_text(
+        "addrmap watch {\n"
+        "    reg { field { sw = rw; } a; } r0;\n"
+        "    reg { field { sw = rw; } b; } r1;\n"
+        "};\n"
+    )
+    generated_dir = output_dir / "generated"
+
+    x = RustExporter()
+    x.export(elaborate(rdl_file), str(generated_dir), force=True, incremental=True)
+    components = generated_dir / "components" / "watch"
+    generated = sorted(generated_dir.rglob("*.rs"))
+    # Mark every file to tell which ones are rewritten
+    for path in generated:
+        path.write_text(path.read_text() + "// unchanged\n")
+
+    rdl_file.write_text(
+        "addrmap watch {\n"
+        "    reg { field { sw = rw; } a; } r0;\n"
+        "    reg { field { sw = r; } b; } r2;\n"
+        "};\n"
+    )
+    x.export(elaborate(rdl_file), str(generated_dir), incremental=True)
+
+    rewritten = {
+        path.relative_to(generated_dir).as_posix()
+        for path in generated_dir.rglob("*.rs")
+        if not path.read_text().endswith("// unchanged\n")
+    }
+    assert rewritten == {"components/watch.rs", "components/watch/r2.rs"}
+    assert not (components / "r1.rs").exists()
+    assert "// unchanged" in (components / "r0.rs").read_text()
+
+
+def test_incremental_export_options() -> None:
+    """Test that an incremental export with other rendering options rewrites
+    every file."""
+    output_dir = Path(__file__).parent / "output" / "watch_options"
+    output_dir.mkdir(exist_ok=True, parents=True)
+    rdl_file = output_dir / "watch.rdl"
+    rdl_file.write_text("addrmap watch { reg { field { sw = rw; } a; } r0; };\n")
+    generated_dir = output_dir / "generated"
+    top = elaborate(rdl_file)
+
+    x = RustExporter()
+    x.export(top, str(generated_dir), force=True, incremental=True)
+    x.export(
+        top,
+        str(generated_dir),
+        incremental=True,
+        inline="outlined",
+        debug_impls="none",
+    )
+    assert x.render(top, inline="outlined", debug_impls="none") == {
+        path.relative_to(generated_dir).as_posix(): path.read_text()
+        for path in generated_dir.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_wait_for_change(tmp_path: Path) -> None:
+    """Test that wait_for_change returns once a file is modified."""
+    watched = tmp_path / "watched.rdl"
+    watched.write_text("")
+    created = tmp_path / "created.rdl"
+    mtimes = modification_times([str(watched), str(created)])
+    assert mtimes[str(created)] is None
+
+    timer = threading.Timer(0.1, created.write_text, [""])
+    timer.start()
+    wait_for_change(mtimes, interval=0.01)
+    timer.join()
+    assert created.exists()